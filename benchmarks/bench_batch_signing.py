@@ -0,0 +1,60 @@
+"""Ladder signing throughput of `OrderSigner.sign_orders` by worker count.
+
+Worker start-up is excluded: each configuration signs one warm-up ladder first.
+Throughput should scale with worker count up to the number of CPU cores.
+
+Run with: python -m benchmarks.bench_batch_signing
+"""
+
+import argparse
+import os
+import time
+from types import SimpleNamespace
+
+from orbs_orderbook import CreateOrderInput, OrderSigner
+from orbs_orderbook.testing.stub_server import STUB_TOKENS
+
+PRIVATE_KEY = "0xaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa"
+
+
+def _ladder(levels: int):
+    return [
+        CreateOrderInput(
+            price=f"{0.8 + i * 0.0001:.4f}",
+            size="40",
+            symbol="MATIC-USDC",
+            side="buy",
+            client_order_id=str(i),
+        )
+        for i in range(levels)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--levels", type=int, nargs="+", default=[50, 500])
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=sorted({1, 2, os.cpu_count() or 1})
+    )
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPUs")
+    for levels in args.levels:
+        orders = _ladder(levels)
+        for workers in args.workers:
+            signer = OrderSigner(
+                private_key=PRIVATE_KEY,
+                sdk=SimpleNamespace(supported_tokens=STUB_TOKENS),
+            )
+            signer.sign_orders(orders, workers=workers)
+
+            start = time.perf_counter()
+            signer.sign_orders(orders, workers=workers)
+            rate = levels / (time.perf_counter() - start)
+            signer.close()
+
+            print(f"{levels:>6} levels, {workers:>2} workers: {rate:8.0f} orders/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Decoding a 1,000-order `get_orders_for_user` page.
+
+"legacy" is the SDK's previous decoder: `json.loads`, then `_camel_to_snake`
+on every top-level key, leaving `data` as a list of dicts. "legacy, typed"
+also runs it on every order, as callers had to for `OrderResponse`s.
+"compiled" is `_parse_to_class`, which decodes every order into an
+`OrderResponse`, with the stdlib json module and, if installed, orjson.
+
+Run with: python -m benchmarks.bench_decoding
+"""
+
+import argparse
+import json
+import time
+
+from orbs_orderbook import utils
+from orbs_orderbook.types import OrderResponse, OrdersForUserResponse, _parse_to_class
+
+
+def _legacy_camel_to_snake(camel_str: str) -> str:
+    return "".join(["_" + i.lower() if i.isupper() else i for i in camel_str]).lstrip(
+        "_"
+    )
+
+
+def _legacy_parse(cls, data: dict):
+    return cls(**{_legacy_camel_to_snake(k): v for k, v in data.items()})
+
+
+def _legacy_parse_typed(body: bytes) -> OrdersForUserResponse:
+    res = _legacy_parse(OrdersForUserResponse, json.loads(body))
+    res.data = [_legacy_parse(OrderResponse, o) for o in res.data]
+    return res
+
+
+def _page(orders: int) -> bytes:
+    return json.dumps(
+        {
+            "page": 1,
+            "pageSize": orders,
+            "total": orders,
+            "totalPages": 1,
+            "data": [
+                {
+                    "orderId": f"accfae6b-3a9e-4719-85f0-{i:012d}",
+                    "clientOrderId": f"650e8400-e29b-41d4-a716-{i:012d}",
+                    "userId": "00000000-0000-0000-0000-000000000001",
+                    "price": f"{0.8 + i * 0.0001:.4f}",
+                    "symbol": "MATIC-USDC",
+                    "size": "40",
+                    "pendingSize": "0",
+                    "filledSize": "40",
+                    "side": "buy" if i % 2 else "sell",
+                    "timestamp": "2024-05-01T00:00:00Z",
+                    "cancelled": False,
+                }
+                for i in range(orders)
+            ],
+        }
+    ).encode()
+
+
+def _rate(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return iterations / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    body = _page(args.orders)
+    rows = [
+        (
+            "legacy (untyped orders)",
+            lambda: _legacy_parse(OrdersForUserResponse, json.loads(body)),
+        ),
+        ("legacy, typed", lambda: _legacy_parse_typed(body)),
+        (
+            "compiled, json",
+            lambda: _parse_to_class(OrdersForUserResponse, json.loads(body)),
+        ),
+    ]
+    if utils.orjson is not None:
+        rows.append(
+            (
+                "compiled, orjson",
+                lambda: _parse_to_class(
+                    OrdersForUserResponse, utils.orjson.loads(body)
+                ),
+            )
+        )
+
+    for name, fn in rows:
+        print(f"{name:>24}: {_rate(fn, args.iterations):8.1f} pages/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Decoding market depth responses into `MarketDepthResponse` vs `CompactMarketDepth`.
+
+"lists" is `get_market_depth`'s decoding: levels stay a list of two strings
+each. "compact" is `get_market_depth_compact`'s: levels are parsed into
+fixed-point int64 buffers. Both include JSON parsing of the response body.
+"retained" is the memory the decoded snapshot holds on to, "peak" the most
+allocated at once while decoding.
+
+Run with: python -m benchmarks.bench_depth
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from orbs_orderbook.depth import CompactMarketDepth
+from orbs_orderbook.types import MarketDepthResponse, _parse_to_class
+from orbs_orderbook.utils import json_dumps, json_loads
+
+
+def _body(levels: int) -> bytes:
+    def side(start: float, step: float):
+        return [
+            [f"{start + i * step:.4f}", f"{10 + (i * 7919) % 5000}.{i % 100:02d}"]
+            for i in range(levels)
+        ]
+
+    return json_dumps(
+        {
+            "code": "OK",
+            "data": {
+                "symbol": "MATIC-USDC",
+                "time": 1714521600000,
+                "asks": side(0.87, 0.0001),
+                "bids": side(0.86, -0.00001),
+            },
+        }
+    )
+
+
+def _lists(body: bytes):
+    return _parse_to_class(MarketDepthResponse, json_loads(body))
+
+
+def _compact(body: bytes):
+    return CompactMarketDepth.from_response(json_loads(body)["data"])
+
+
+def _memory(decode, body: bytes):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    depth = decode(body)
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del depth
+    return retained - before, peak - before
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--levels", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--rounds", type=int, default=200_000)
+    args = parser.parse_args()
+
+    for levels in args.levels:
+        body = _body(levels)
+        rounds = max(1, args.rounds // levels)
+        print(f"{levels} levels per side:")
+        for name, decode in (("lists", _lists), ("compact", _compact)):
+            start = time.perf_counter()
+            for _ in range(rounds):
+                decode(body)
+            seconds = (time.perf_counter() - start) / rounds
+            retained, peak = _memory(decode, body)
+            print(
+                f"  {name:>8}: {seconds * 1e6:10.1f} us/snapshot"
+                f"  retained {retained / 1024:9.1f} KiB  peak {peak / 1024:9.1f} KiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
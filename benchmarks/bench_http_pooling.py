@@ -0,0 +1,66 @@
+"""Requests/sec against the local stub server, with and without connection pooling.
+
+"pooled" is `OrderBookSDK`, which keeps connections alive in a shared pool.
+"unpooled" issues the same request with the module-level `requests.request`,
+which opens a new connection every time (the SDK's previous behaviour).
+
+Run with: python -m benchmarks.bench_http_pooling
+"""
+
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from orbs_orderbook import OrderBookSDK
+from orbs_orderbook.testing import StubOrderBookServer
+
+
+def _run(fn, *, requests_total: int, threads: int) -> float:
+    start = time.perf_counter()
+    if threads == 1:
+        for _ in range(requests_total):
+            fn()
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(lambda _: fn(), range(requests_total)))
+    return requests_total / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    with StubOrderBookServer(latency=args.latency) as server:
+        client = OrderBookSDK(
+            base_url=server.url, api_key="bench", pool_maxsize=max(args.threads, 10)
+        )
+        url = f"{server.url}/api/v1/symbols"
+
+        def unpooled():
+            requests.request(
+                "GET",
+                url,
+                headers=client.headers,
+                data=json.dumps(None),
+                timeout=client.timeout,
+            ).json()
+
+        results = {}
+        for name, fn in (("unpooled", unpooled), ("pooled", client.get_symbols)):
+            opened = server.connections_opened
+            rps = _run(fn, requests_total=args.requests, threads=args.threads)
+            results[name] = (rps, server.connections_opened - opened)
+        client.close()
+
+    for name, (rps, connections) in results.items():
+        print(f"{name:>9}: {rps:8.0f} req/s  ({connections} connections opened)")
+
+
+if __name__ == "__main__":
+    main()
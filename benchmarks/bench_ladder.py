@@ -0,0 +1,95 @@
+"""Ladder construction: per-order Decimal path vs batch path.
+
+"amounts" compares `_calculate_in_amount`/`_calculate_out_amount` per level
+with `_calculate_ladder_amounts`. "payloads" compares calling
+`_construct_message_data` per level, as `prepare_and_sign_order` does, with
+`construct_ladder_message_data`. Signing is excluded.
+
+Run with: python -m benchmarks.bench_ladder
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+from orbs_orderbook import OrderSigner, Token
+from orbs_orderbook.testing.stub_server import STUB_TOKENS
+
+PRIVATE_KEY = "0xaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa"
+
+
+def _elapsed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--levels", type=int, nargs="+", default=[1000, 10000])
+    args = parser.parse_args()
+
+    signer = OrderSigner(
+        private_key=PRIVATE_KEY, sdk=SimpleNamespace(supported_tokens=STUB_TOKENS)
+    )
+    in_token, out_token = Token(**STUB_TOKENS["USDC"]), Token(**STUB_TOKENS["MATIC"])
+    deadline = datetime.now() + timedelta(days=1)
+
+    for levels in args.levels:
+        prices = [f"{0.8 + i * 0.00000001:.8f}" for i in range(levels)]
+        sizes = [str(40 + i % 100) for i in range(levels)]
+
+        def scalar_amounts():
+            for price, size in zip(prices, sizes):
+                price_dec, size_dec = Decimal(price), Decimal(size)
+                signer._check_decimal_places(price_dec)
+                signer._calculate_in_amount(
+                    size=size_dec, price=price_dec, side="buy", decimals=6
+                )
+                signer._calculate_out_amount(
+                    size=size_dec, price=price_dec, side="buy", decimals=18
+                )
+
+        def batch_amounts():
+            signer._calculate_ladder_amounts(
+                prices=prices, sizes=sizes, side="buy", in_decimals=6, out_decimals=18
+            )
+
+        def scalar_payloads():
+            return [
+                signer._construct_message_data(
+                    in_token=in_token,
+                    out_token=out_token,
+                    size=size,
+                    price=price,
+                    side="buy",
+                    signer_address="0x0000000000000000000000000000000000000001",
+                    deadline=deadline,
+                )
+                for price, size in zip(prices, sizes)
+            ]
+
+        def batch_payloads():
+            return signer.construct_ladder_message_data(
+                symbol="MATIC-USDC",
+                side="buy",
+                prices=prices,
+                sizes=sizes,
+                deadline=deadline,
+            )
+
+        for name, scalar_fn, batch_fn in (
+            ("amounts", scalar_amounts, batch_amounts),
+            ("payloads", scalar_payloads, batch_payloads),
+        ):
+            scalar, batch = _elapsed(scalar_fn), _elapsed(batch_fn)
+            print(
+                f"{levels:>6} levels, {name:>8}: scalar {scalar * 1000:8.1f} ms, "
+                f"batch {batch * 1000:8.1f} ms ({scalar / batch:.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Encoding `create_multiple_orders` request bodies of 10 and 1,000 orders.
+
+"legacy" is the SDK's previous encoder: a dict per order, with the signed
+message data spliced in, passed to `json.dumps`. "pre-encoded, first send"
+encodes every order's JSON fragment and joins them; "pre-encoded, resend"
+joins fragments that are already cached, as for retries, chunks and
+pre-signed orders. The pre-encoded paths use orjson if it is installed.
+
+Run with: python -m benchmarks.bench_request_body
+"""
+
+import argparse
+import json
+import time
+from types import SimpleNamespace
+
+from orbs_orderbook import CreateMultipleOrdersInput, CreateOrderInput, OrderSigner
+from orbs_orderbook.client import _create_multiple_orders_body
+from orbs_orderbook.testing.stub_server import STUB_TOKENS
+from orbs_orderbook.types import EIP712Message, OrderWithSignature
+from orbs_orderbook.utils import dataclass_serializer
+
+PRIVATE_KEY = "0xaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa"
+
+
+def _legacy_body(orders_input: CreateMultipleOrdersInput) -> bytes:
+    body = {
+        "symbol": orders_input.symbol,
+        "orders": [
+            {
+                **o.order.to_camelcase_dict(),
+                "eip712Sig": o.signature,
+                "eip712Msg": o.message.message_data,
+            }
+            for o in orders_input.orders
+        ],
+    }
+    return json.dumps(body, default=dataclass_serializer).encode()
+
+
+def _batch(size: int) -> CreateMultipleOrdersInput:
+    signer = OrderSigner(
+        private_key=PRIVATE_KEY, sdk=SimpleNamespace(supported_tokens=STUB_TOKENS)
+    )
+    messages = signer.construct_ladder_message_data(
+        symbol="MATIC-USDC",
+        side="buy",
+        prices=[f"{0.8 + i * 0.0001:.4f}" for i in range(size)],
+        sizes=["40"] * size,
+    )
+    orders = [
+        OrderWithSignature(
+            order=CreateOrderInput(
+                price=f"{0.8 + i * 0.0001:.4f}",
+                size="40",
+                symbol="MATIC-USDC",
+                side="buy",
+                client_order_id=f"650e8400-e29b-41d4-a716-{i:012d}",
+            ),
+            signature="0x" + "ab" * 65,
+            message=EIP712Message(
+                domain_separator={}, message_types={}, message_data=message
+            ),
+        )
+        for i, message in enumerate(messages)
+    ]
+    return CreateMultipleOrdersInput(symbol="MATIC-USDC", orders=orders)
+
+
+def _uncached(batch: CreateMultipleOrdersInput) -> CreateMultipleOrdersInput:
+    return CreateMultipleOrdersInput(
+        symbol=batch.symbol,
+        orders=[
+            OrderWithSignature(
+                order=o.order,
+                signature=o.signature,
+                message=EIP712Message(
+                    domain_separator=o.message.domain_separator,
+                    message_types=o.message.message_types,
+                    message_data=o.message.message_data,
+                ),
+            )
+            for o in batch.orders
+        ],
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, nargs="+", default=[10, 1000])
+    parser.add_argument("--rounds", type=int, default=20_000)
+    args = parser.parse_args()
+
+    for size in args.orders:
+        batch = _batch(size)
+        assert json.loads(_legacy_body(batch)) == json.loads(
+            _create_multiple_orders_body(batch)
+        )
+        rounds = max(1, args.rounds // size)
+        fresh = [_uncached(batch) for _ in range(rounds)]
+        _create_multiple_orders_body(batch)
+
+        results = {}
+        for name, encode, inputs in (
+            ("legacy", _legacy_body, [batch] * rounds),
+            ("pre-encoded, first send", _create_multiple_orders_body, fresh),
+            ("pre-encoded, resend", _create_multiple_orders_body, [batch] * rounds),
+        ):
+            start = time.perf_counter()
+            for orders_input in inputs:
+                encode(orders_input)
+            results[name] = (time.perf_counter() - start) / rounds
+
+        print(f"{size} orders:")
+        for name, seconds in results.items():
+            print(f"  {name:>24}: {seconds * 1e6:10.1f} us/body")
+
+
+if __name__ == "__main__":
+    main()
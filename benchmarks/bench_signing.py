@@ -0,0 +1,76 @@
+"""Order signatures/sec with the compiled EIP-712 schema vs `encode_typed_data`.
+
+"encode_typed_data" rebuilds the domain and types for every order and lets
+eth_account re-parse and re-hash them, then signs with the raw key bytes
+(the SDK's previous behaviour). "compiled" is `OrderSigner.prepare_and_sign_order`.
+
+Run with: python -m benchmarks.bench_signing
+"""
+
+import argparse
+import time
+from types import SimpleNamespace
+
+from eth_account import Account
+from eth_account.messages import encode_typed_data
+
+from orbs_orderbook import CreateOrderInput, OrderSigner
+from orbs_orderbook.testing.stub_server import STUB_TOKENS
+
+PRIVATE_KEY = "0xaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa"
+
+
+def _rate(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return iterations / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    signer = OrderSigner(
+        private_key=PRIVATE_KEY, sdk=SimpleNamespace(supported_tokens=STUB_TOKENS)
+    )
+    order = CreateOrderInput(
+        price="0.865",
+        size="40",
+        symbol="MATIC-USDC",
+        side="buy",
+        client_order_id="550e8400-e29b-41d4-a716-446655440000",
+    )
+    _, message = signer.prepare_and_sign_order(order)
+    message_data = message.message_data
+
+    def legacy_encode():
+        return signer.encode_typed_data(
+            primary_type="RePermitWitnessTransferFrom",
+            domain_data=signer._construct_domain_data(),
+            message_types=signer._construct_message_types(),
+            message_data=message_data,
+        )
+
+    def legacy_sign():
+        Account.sign_message(legacy_encode(), PRIVATE_KEY)
+
+    rows = [
+        ("encode: encode_typed_data", _rate(legacy_encode, args.iterations)),
+        (
+            "encode: compiled",
+            _rate(lambda: signer._schema.encode(message_data), args.iterations),
+        ),
+        ("sign: encode_typed_data", _rate(legacy_sign, args.iterations)),
+        (
+            "sign: compiled",
+            _rate(lambda: signer.prepare_and_sign_order(order), args.iterations),
+        ),
+    ]
+    for name, rate in rows:
+        print(f"{name:>26}: {rate:9.0f} ops/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Time from a depth change on the server to the updated `LocalOrderBook`.
+
+"stream" publishes level changes on the local stand-in stream server and
+waits for `MarketDataStream.on_depth`. "poll" is `OrderBookPoller`: a change
+is seen at the next poll, on average half an `--interval` later, plus the
+snapshot round trip.
+
+Run with: python -m benchmarks.bench_stream
+"""
+
+import argparse
+import asyncio
+import time
+
+from orbs_orderbook import OrderBookSDK
+from orbs_orderbook.instrumentation import Histogram
+from orbs_orderbook.order_book import OrderBookPoller
+from orbs_orderbook.stream import MarketDataStream
+from orbs_orderbook.testing import StubOrderBookServer, StubStreamServer
+
+SYMBOL = "MATIC-USDC"
+
+
+async def _stream_latency(client, ws, updates: int) -> Histogram:
+    latency = Histogram()
+    changed = asyncio.Event()
+    async with MarketDataStream(client, ws.url, on_depth=lambda _: changed.set()) as s:
+        await s.subscribe_depth(SYMBOL)
+        await s.wait_synced(SYMBOL)
+        for i in range(updates):
+            changed.clear()
+            start = time.perf_counter()
+            ws.publish_depth(SYMBOL, asks=[[f"{0.9 + i * 0.0001:.4f}", "1"]])
+            await changed.wait()
+            latency.record(time.perf_counter() - start)
+    return latency
+
+
+def _poll_latency(client, interval: float) -> Histogram:
+    latency = Histogram()
+    poller = OrderBookPoller(client, [SYMBOL], interval=interval)
+    for _ in range(20):
+        start = time.perf_counter()
+        time.sleep(interval / 2)
+        poller.poll_once()
+        latency.record(time.perf_counter() - start)
+    return latency
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--updates", type=int, default=1000)
+    parser.add_argument("--interval", type=float, default=0.5)
+    args = parser.parse_args()
+
+    with StubOrderBookServer(api_key="bench") as http:
+        http.depth[SYMBOL] = {"asks": {"0.87": "40"}, "bids": {"0.86": "30"}}
+        with StubStreamServer(api_key="bench", book_server=http) as ws:
+            with OrderBookSDK(base_url=http.url, api_key="bench") as client:
+                results = {
+                    "stream": asyncio.run(_stream_latency(client, ws, args.updates)),
+                    "poll": _poll_latency(client, args.interval),
+                }
+
+    for name, latency in results.items():
+        p50, p99 = latency.percentile(50), latency.percentile(99)
+        print(f"{name:>7}: p50 {p50 * 1e3:8.3f} ms  p99 {p99 * 1e3:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
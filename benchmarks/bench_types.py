@@ -0,0 +1,78 @@
+"""Memory and throughput of 100k `OrderResponse` objects.
+
+"legacy" is a plain `@dataclass` with the same fields, serialised through
+`dataclasses.asdict` (the SDK's previous types). "slotted" is `OrderResponse`
+and its `to_camelcase_dict`.
+
+Run with: python -m benchmarks.bench_types
+"""
+
+import argparse
+import dataclasses
+import time
+import tracemalloc
+
+from orbs_orderbook.types import OrderResponse, _snake_to_camel
+
+LegacyOrderResponse = dataclasses.make_dataclass(
+    "LegacyOrderResponse",
+    [(f.name, f.type) for f in dataclasses.fields(OrderResponse)],
+)
+
+
+def _legacy_to_camelcase_dict(obj) -> dict:
+    return {_snake_to_camel(k): v for k, v in dataclasses.asdict(obj).items()}
+
+
+def _build(cls, count: int):
+    return [
+        cls(
+            order_id=f"accfae6b-3a9e-4719-85f0-{i:012d}",
+            client_order_id=f"650e8400-e29b-41d4-a716-{i:012d}",
+            user_id="00000000-0000-0000-0000-000000000001",
+            price="0.865",
+            symbol="MATIC-USDC",
+            size="40",
+            pending_size="0",
+            filled_size="40",
+            side="buy",
+            timestamp="2024-05-01T00:00:00Z",
+            cancelled=False,
+        )
+        for i in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=100_000)
+    args = parser.parse_args()
+
+    for name, cls, to_dict in (
+        ("legacy", LegacyOrderResponse, _legacy_to_camelcase_dict),
+        ("slotted", OrderResponse, OrderResponse.to_camelcase_dict),
+    ):
+        _build(cls, 1)
+        tracemalloc.start()
+        start = time.perf_counter()
+        objects = _build(cls, args.count)
+        build_time = time.perf_counter() - start
+        # Field values are identical for both types, so the difference is per-object overhead
+        memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        for obj in objects:
+            to_dict(obj)
+        serialise_time = time.perf_counter() - start
+
+        print(
+            f"{name:>8}: {memory / 2**20:6.1f} MiB, "
+            f"build {args.count / build_time:9.0f}/s, "
+            f"to_camelcase_dict {args.count / serialise_time:9.0f}/s"
+        )
+        del objects
+
+
+if __name__ == "__main__":
+    main()
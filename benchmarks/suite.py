@@ -0,0 +1,276 @@
+"""Benchmark suite for the SDK's hot paths, with results recorded for comparison.
+
+Everything runs offline: network benchmarks talk to an in-process
+`StubOrderBookServer`, with `--latency` seconds added to every response.
+
+  sign_order       `OrderSigner.prepare_and_sign_order`, per order
+  sign_orders      `OrderSigner.sign_orders` of 100 orders, in-process
+  create_orders    `create_multiple_orders` round trip of a 10-order batch
+  cancel_orders    `cancel_orders` of 10 orders by client order id, concurrently
+  depth_decode     JSON parsing and decoding of a 100-level `MarketDepthResponse`
+  depth_compact    the same response decoded into a `CompactMarketDepth`
+  pagination       `iter_filled_orders_for_user` over 5,000 fills, 100 per page
+  requote          `OrderManager.requote` of a 10-level ladder, moving 2 levels
+
+Each benchmark reports latency percentiles per iteration and items per second.
+`--output` saves the results as JSON, and `--compare` prints the change from
+an earlier results file, flagging median latencies that got slower by more
+than `--threshold`.
+
+Run with: python -m benchmarks.suite --output results.json [--compare baseline.json]
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from importlib import metadata
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Tuple
+
+from orbs_orderbook import (
+    CreateMultipleOrdersInput,
+    CreateOrderInput,
+    OrderBookSDK,
+    OrderSigner,
+)
+from orbs_orderbook.depth import CompactMarketDepth
+from orbs_orderbook.instrumentation import Histogram
+from orbs_orderbook.order_manager import OrderManager
+from orbs_orderbook.testing import StubOrderBookServer
+from orbs_orderbook.types import MarketDepthResponse, Quote, _parse_to_class
+from orbs_orderbook.utils import json_loads
+
+PRIVATE_KEY = "0xaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa"
+
+# A benchmark returns a function running one iteration, and the number of
+# items (orders, levels, fills) each iteration handles
+Setup = Callable[[SimpleNamespace], Tuple[Callable[[], Any], int]]
+
+BENCHMARKS: Dict[str, Setup] = {}
+
+
+def benchmark(setup: Setup) -> Setup:
+    BENCHMARKS[setup.__name__] = setup
+    return setup
+
+
+def _order(i: int) -> CreateOrderInput:
+    return CreateOrderInput(
+        price=f"{0.8 + i * 0.0001:.4f}",
+        size="40",
+        symbol="MATIC-USDC",
+        side="buy",
+        client_order_id=f"650e8400-e29b-41d4-a716-{i:012d}",
+    )
+
+
+@benchmark
+def sign_order(env: SimpleNamespace):
+    order = _order(0)
+    return lambda: env.signer.prepare_and_sign_order(order), 1
+
+
+@benchmark
+def sign_orders(env: SimpleNamespace):
+    orders = [_order(i) for i in range(100)]
+    return lambda: env.signer.sign_orders(orders, workers=1), len(orders)
+
+
+@benchmark
+def create_orders(env: SimpleNamespace):
+    batch = CreateMultipleOrdersInput(
+        symbol="MATIC-USDC",
+        orders=env.signer.sign_orders([_order(i) for i in range(10)], workers=1),
+    )
+    return lambda: env.client.create_multiple_orders(batch), len(batch.orders)
+
+
+@benchmark
+def cancel_orders(env: SimpleNamespace):
+    batch = CreateMultipleOrdersInput(
+        symbol="MATIC-USDC",
+        orders=env.signer.sign_orders([_order(i) for i in range(10)], workers=1),
+    )
+    client_ids = [
+        o.client_order_id for o in env.client.create_multiple_orders(batch).created
+    ]
+    # The stub server acknowledges cancels of orders that are already cancelled
+    return lambda: env.client.cancel_orders(client_ids=client_ids), len(client_ids)
+
+
+@benchmark
+def depth_decode(env: SimpleNamespace):
+    levels = 100
+    body = json.dumps(env.server._market_depth("MATIC-USDC", levels)).encode()
+    return lambda: _parse_to_class(MarketDepthResponse, json_loads(body)), 2 * levels
+
+
+@benchmark
+def depth_compact(env: SimpleNamespace):
+    levels = 100
+    body = json.dumps(env.server._market_depth("MATIC-USDC", levels)).encode()
+    return (
+        lambda: CompactMarketDepth.from_response(json_loads(body)["data"]),
+        2 * levels,
+    )
+
+
+@benchmark
+def pagination(env: SimpleNamespace):
+    fills = 5000
+    env.server.fills = []
+    env.server.add_fills(fills)
+
+    def iterate() -> None:
+        with env.client.iter_filled_orders_for_user(page_size=100) as pages:
+            for _ in pages:
+                pass
+
+    return iterate, fills
+
+
+@benchmark
+def requote(env: SimpleNamespace):
+    manager = OrderManager(env.client, env.signer)
+    ladders = [
+        [Quote(side="buy", price=f"{0.80 + i * 0.001:.3f}", size="40") for i in rng]
+        for rng in (range(10), range(2, 12))
+    ]
+    manager.requote("MATIC-USDC", ladders[0])
+    alternate = itertools.cycle(ladders[::-1])
+    return lambda: manager.requote("MATIC-USDC", next(alternate)), 10
+
+
+def run(
+    setup: Setup, env: SimpleNamespace, *, iterations: int, warmup: int
+) -> Dict[str, Any]:
+    step, items = setup(env)
+    for _ in range(warmup):
+        step()
+
+    latency = Histogram()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        t = time.perf_counter()
+        step()
+        latency.record(time.perf_counter() - t)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "iterations": iterations,
+        "items_per_iteration": items,
+        "items_per_second": iterations * items / elapsed,
+        "latency": latency.snapshot(),
+    }
+
+
+def _environment(args: argparse.Namespace) -> Dict[str, Any]:
+    try:
+        version = metadata.version("orbs-orderbook-sdk")
+    except metadata.PackageNotFoundError:
+        version = None
+    return {
+        "sdk_version": version,
+        "label": args.label,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "latency": args.latency,
+        "iterations": args.iterations,
+    }
+
+
+def compare(
+    results: Dict[str, Any], baseline: Dict[str, Any], threshold: float
+) -> List[str]:
+    """Print the change in median latency and throughput from `baseline`.
+
+    Returns:
+        Names of the benchmarks whose median latency regressed by more than `threshold`
+    """
+    regressed = []
+    for name, result in results["benchmarks"].items():
+        before = baseline.get("benchmarks", {}).get(name)
+        if before is None:
+            print(f"{name:>14}: not in baseline")
+            continue
+        p50, old_p50 = result["latency"]["p50"], before["latency"]["p50"]
+        change = p50 / old_p50 - 1
+        throughput = result["items_per_second"] / before["items_per_second"] - 1
+        flag = ""
+        if change > threshold:
+            regressed.append(name)
+            flag = "  REGRESSION"
+        print(
+            f"{name:>14}: p50 {old_p50 * 1e3:9.3f} -> {p50 * 1e3:9.3f} ms "
+            f"({change:+7.1%}), throughput {throughput:+7.1%}{flag}"
+        )
+    return regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "benchmarks",
+        nargs="*",
+        metavar="benchmark",
+        help=f"Benchmarks to run ({', '.join(BENCHMARKS)}). Runs all when omitted.",
+    )
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--label", help="Stored with the results, e.g. a git ref")
+    parser.add_argument("--output", help="Save results to this JSON file")
+    parser.add_argument("--compare", help="Results JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args()
+    unknown = sorted(set(args.benchmarks) - set(BENCHMARKS))
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+
+    results: Dict[str, Any] = {"environment": _environment(args), "benchmarks": {}}
+    with StubOrderBookServer(latency=args.latency, api_key="bench") as server:
+        with OrderBookSDK(base_url=server.url, api_key="bench") as client:
+            env = SimpleNamespace(
+                server=server,
+                client=client,
+                signer=OrderSigner(PRIVATE_KEY, client),
+            )
+            for name in args.benchmarks or BENCHMARKS:
+                result = run(
+                    BENCHMARKS[name],
+                    env,
+                    iterations=args.iterations,
+                    warmup=args.warmup,
+                )
+                results["benchmarks"][name] = result
+                latency = result["latency"]
+                print(
+                    f"{name:>14}: p50 {latency['p50'] * 1e3:9.3f} ms  "
+                    f"p99 {latency['p99'] * 1e3:9.3f} ms  "
+                    f"{result['items_per_second']:10.0f} items/s"
+                )
+            env.signer.close()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"\nCompared with {args.compare}:")
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
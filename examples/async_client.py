@@ -0,0 +1,46 @@
+"""Overlap requests with the asyncio client"""
+
+import asyncio
+import os
+
+from orbs_orderbook import AsyncOrderBookSDK, CreateOrderInput, OrderSigner
+
+BASE_URL = os.environ.get("BASE_URL", "http://localhost")
+API_KEY = os.environ.get("API_KEY", "38052ba1012aa665458cf2d28b9d057d")
+PRVIATE_KEY = os.environ.get(
+    "PRVIATE_KEY", "0xaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa"
+)
+
+
+async def main():
+    async with AsyncOrderBookSDK(base_url=BASE_URL, api_key=API_KEY) as client:
+        signer = OrderSigner(private_key=PRVIATE_KEY, sdk=client)
+
+        order_input = CreateOrderInput(
+            price="0.86500000",
+            size="40",
+            symbol="MATIC-USDC",
+            side="sell",
+            client_order_id="550e8400-e29b-41d4-a716-446655440000",
+        )
+        signature, message = signer.prepare_and_sign_order(order_input)
+
+        # Cancel, fetch market depth and create an order concurrently
+        cancel_res, depth_res, create_res = await asyncio.gather(
+            client.cancel_order_by_client_id(
+                client_order_id="650e8400-e29b-41d4-a716-446655440001"
+            ),
+            client.get_market_depth(symbol="MATIC-USDC", limit=20),
+            client.create_order(
+                order_input=order_input, signature=signature, message=message
+            ),
+            return_exceptions=True,
+        )
+
+        print(f"Cancel order response: {cancel_res}")
+        print(f"Market depth response: {depth_res}")
+        print(f"Create order response: {create_res}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
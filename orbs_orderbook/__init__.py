@@ -1,3 +1,16 @@
 from orbs_orderbook.client import *
+from orbs_orderbook.cache import *
+from orbs_orderbook.async_client import *
 from orbs_orderbook.order_signer import *
 from orbs_orderbook.types import *
+from orbs_orderbook.order_book import *
+from orbs_orderbook.depth import *
+from orbs_orderbook.pagination import *
+from orbs_orderbook.fill_sync import *
+from orbs_orderbook.rate_limit import *
+from orbs_orderbook.retry import *
+from orbs_orderbook.instrumentation import *
+from orbs_orderbook.order_manager import *
+from orbs_orderbook.presign import *
+from orbs_orderbook.nonce import *
+from orbs_orderbook.stream import *
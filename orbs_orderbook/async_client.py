@@ -0,0 +1,546 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+import aiohttp
+
+from orbs_orderbook.client import (
+    MAX_ORDERS_PER_BATCH,
+    _all_have_client_ids,
+    _api_error,
+    _check_cancel_targets,
+    _chunk_orders,
+    _create_multiple_orders_body,
+    _create_order_body,
+    _created_response,
+    _decode,
+    _merge_cancel_results,
+    _merge_chunk_results,
+    _prepend_created,
+    _symbol_cancelled,
+)
+from orbs_orderbook.cache import (
+    MARKET_DEPTH,
+    ORDER,
+    SUPPORTED_TOKENS,
+    SYMBOLS,
+    CacheKey,
+    ResponseCache,
+)
+from orbs_orderbook.depth import CompactMarketDepth
+from orbs_orderbook.exceptions import ErrApiRequest
+from orbs_orderbook.instrumentation import Observer
+from orbs_orderbook.pagination import AsyncOrderPageIterator
+from orbs_orderbook.rate_limit import RequestScheduler
+from orbs_orderbook.retry import RetryPolicy
+from orbs_orderbook.token_registry import TokenRegistry
+from orbs_orderbook.types import (
+    BulkCancelOrdersResponse,
+    BulkCreateOrdersResponse,
+    CreateMultipleOrdersInput,
+    CreateMultipleOrdersResponse,
+    CancelOrderResponse,
+    CreateOrderInput,
+    CreateOrderResponse,
+    EIP712Message,
+    MarketDepthResponse,
+    OrderResponse,
+    OrdersForUserResponse,
+    OrderWithSignature,
+    PageCheckpoint,
+    RequestEvent,
+    SupportedTokensResponse,
+    SymbolResponse,
+)
+from orbs_orderbook.utils import json_dumps, json_loads
+
+
+class AsyncOrderBookSDK:
+    """asyncio counterpart of `OrderBookSDK`.
+
+    All requests share one pooled `aiohttp` session, so many calls can be in
+    flight at once from a single event loop:
+
+        async with AsyncOrderBookSDK(base_url=BASE_URL, api_key=API_KEY) as client:
+            depth, _ = await asyncio.gather(
+                client.get_market_depth("MATIC-USDC", 20),
+                client.cancel_order_by_client_id(client_order_id),
+            )
+
+    `supported_tokens` is fetched when the client is opened, either by
+    `async with` or by awaiting `open()`.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        *,
+        pool_maxsize: int = 100,
+        pool_maxsize_per_host: int = 0,
+        keepalive_timeout: float = 15,
+        timeout: float = 10,
+        scheduler: Optional[RequestScheduler] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        observer: Optional[Observer] = None,
+        cache: Optional[ResponseCache] = None,
+    ) -> None:
+        """
+        Args:
+            base_url: Order book API base URL.
+            api_key: API key issued by the Orbs team.
+            pool_maxsize (optional): Maximum number of open connections (0 for no limit).
+                Requests wait for a free connection once the limit is reached.
+            pool_maxsize_per_host (optional): Maximum number of open connections per
+                host (0 for no limit).
+            keepalive_timeout (optional): How long idle connections are kept open, in seconds.
+            timeout (optional): Request timeout in seconds.
+            scheduler (optional): Rate limiter to send every request through (see
+                `rate_limit.RequestScheduler`). Requests are sent immediately when None.
+            retry_policy (optional): How failed requests are retried (see
+                `retry.RetryPolicy`). Requests are not retried when None.
+            observer (optional): Receives request, retry and decoding events (see
+                `instrumentation.Observer`).
+            cache (optional): Read-through cache for market depth, symbols, orders
+                and supported tokens (see `cache.ResponseCache`). It can be shared
+                with other clients. Every read is sent when None.
+        """
+        self.base_url = base_url
+        self.headers = {
+            "X-API-KEY": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+        }
+        self.timeout = timeout
+        self.scheduler = scheduler
+        self.retry_policy = retry_policy
+        self.observer = observer
+        self.cache = cache
+        self.supported_tokens = TokenRegistry()
+        self._pool_maxsize = pool_maxsize
+        self._pool_maxsize_per_host = pool_maxsize_per_host
+        self._keepalive_timeout = keepalive_timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self) -> "AsyncOrderBookSDK":
+        return await self.open()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def open(self) -> "AsyncOrderBookSDK":
+        """Create the connection pool and fetch the supported tokens."""
+        self._invalidate((SUPPORTED_TOKENS,))
+        self.supported_tokens.update((await self.get_supported_tokens()).tokens)
+        return self
+
+    async def close(self) -> None:
+        """Close all pooled connections."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self._pool_maxsize,
+                    limit_per_host=self._pool_maxsize_per_host,
+                    keepalive_timeout=self._keepalive_timeout,
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def _cached(self, key: CacheKey, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        if self.cache is None:
+            return await fetch()
+        return await self.cache.get_async(key, fetch)
+
+    def _invalidate(self, *keys: CacheKey) -> None:
+        if self.cache is not None:
+            for key in keys:
+                self.cache.invalidate(*key)
+
+    async def _send_request(
+        self,
+        *,
+        method: str,
+        endpoint: str,
+        data: Optional[Any] = None,
+        custom_headers: Optional[Dict[str, str]] = None,
+        resolve: Optional[Callable[[], Awaitable[Any]]] = None,
+    ) -> Any:
+        if self.retry_policy is None:
+            return await self._send_attempt(method, endpoint, data, custom_headers)
+        return await self.retry_policy.call_async(
+            lambda: self._send_attempt(method, endpoint, data, custom_headers),
+            method=method,
+            endpoint=endpoint,
+            resolve=resolve,
+            observer=self.observer,
+        )
+
+    async def _send_attempt(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Any],
+        custom_headers: Optional[Dict[str, str]],
+    ) -> Any:
+        if self.scheduler is None:
+            return await self._send(method, endpoint, data, custom_headers)
+        async with self.scheduler.async_slot(method, endpoint):
+            return await self._send(method, endpoint, data, custom_headers)
+
+    async def _send(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Any],
+        custom_headers: Optional[Dict[str, str]],
+    ) -> Any:
+        url = f"{self.base_url}/{endpoint}"
+        headers = self.headers.copy()
+
+        if custom_headers:
+            headers.update(custom_headers)
+        # Order bodies are pre-encoded
+        if not isinstance(data, bytes):
+            data = json_dumps(data)
+        observer = self.observer
+        if observer is not None:
+            start = time.perf_counter()
+            time_to_headers = body = error = None
+
+        try:
+            async with self._get_session().request(
+                method, url, headers=headers, data=data
+            ) as response:
+                if observer is not None:
+                    time_to_headers = time.perf_counter() - start
+                body = await response.read()
+
+            if response.status >= 400:
+                error = _api_error(
+                    status_code=response.status,
+                    body=body,
+                    reason=response.reason or "",
+                )
+                raise error
+            return json_loads(body)
+        except Exception as err:
+            error = err
+            raise
+        finally:
+            if observer is not None:
+                observer.on_request(
+                    RequestEvent(
+                        method=method,
+                        endpoint=endpoint,
+                        status_code=None if body is None else response.status,
+                        latency=time.perf_counter() - start,
+                        time_to_headers=time_to_headers,
+                        request_bytes=len(data),
+                        response_bytes=None if body is None else len(body),
+                        error=error,
+                    )
+                )
+
+    async def create_order(
+        self,
+        *,
+        order_input: CreateOrderInput,
+        signature: str,
+        message: EIP712Message,
+    ) -> CreateOrderResponse:
+        resolve = None
+        if self.retry_policy is not None and order_input.client_order_id:
+
+            async def resolve() -> Optional[Dict[str, Any]]:
+                order = await self._find_order_by_client_id(order_input.client_order_id)
+                return None if order is None else {"orderId": order.order_id}
+
+        try:
+            res = await self._send_request(
+                method="POST",
+                endpoint="api/v1/order",
+                data=_create_order_body(order_input, signature, message),
+                resolve=resolve,
+            )
+        finally:
+            self._invalidate((MARKET_DEPTH, order_input.symbol))
+        return _decode(self.observer, CreateOrderResponse, res)
+
+    async def create_multiple_orders(
+        self, orders_input: CreateMultipleOrdersInput
+    ) -> CreateMultipleOrdersResponse:
+        try:
+            res = await self._create_multiple_orders(orders_input)
+        finally:
+            self._invalidate((MARKET_DEPTH, orders_input.symbol))
+
+        return _decode(self.observer, CreateMultipleOrdersResponse, res)
+
+    async def _create_multiple_orders(
+        self, orders_input: CreateMultipleOrdersInput
+    ) -> Dict[str, Any]:
+        resolve = None
+        if self.retry_policy is not None and _all_have_client_ids(orders_input):
+
+            async def resolve() -> Optional[Dict[str, Any]]:
+                found, missing = await self._find_orders(orders_input.orders)
+                if not found:
+                    return None
+                if missing:
+                    res = await self._create_multiple_orders(
+                        CreateMultipleOrdersInput(
+                            symbol=orders_input.symbol, orders=missing
+                        )
+                    )
+                else:
+                    res = _created_response(orders_input.symbol)
+                return _prepend_created(res, found)
+
+        return await self._send_request(
+            method="POST",
+            endpoint="api/v1/orders",
+            data=_create_multiple_orders_body(orders_input),
+            resolve=resolve,
+        )
+
+    async def _find_order_by_client_id(
+        self, client_order_id: str
+    ) -> Optional[OrderResponse]:
+        try:
+            return await self.get_order_by_client_id(client_order_id)
+        except ErrApiRequest as err:
+            if err.status_code == 404:
+                return None
+            raise
+
+    async def _find_orders(
+        self, orders: Sequence[OrderWithSignature]
+    ) -> Tuple[List[OrderResponse], List[OrderWithSignature]]:
+        results = await asyncio.gather(
+            *(self._find_order_by_client_id(o.order.client_order_id) for o in orders)
+        )
+        found = [order for order in results if order is not None]
+        missing = [o for o, order in zip(orders, results) if order is None]
+        return found, missing
+
+    async def create_orders_bulk(
+        self,
+        orders: Sequence[OrderWithSignature],
+        *,
+        chunk_size: int = MAX_ORDERS_PER_BATCH,
+        max_in_flight: int = 8,
+    ) -> BulkCreateOrdersResponse:
+        """Create any number of signed orders, across any number of symbols.
+
+        See `OrderBookSDK.create_orders_bulk`.
+        """
+        chunks = _chunk_orders(orders, chunk_size)
+        semaphore = asyncio.Semaphore(max(1, max_in_flight))
+
+        async def submit(chunk: CreateMultipleOrdersInput) -> Any:
+            async with semaphore:
+                return await self.create_multiple_orders(chunk)
+
+        results = await asyncio.gather(
+            *(submit(chunk) for chunk in chunks), return_exceptions=True
+        )
+
+        return _merge_chunk_results(chunks, results)
+
+    async def cancel_orders(
+        self,
+        ids: Sequence[str] = (),
+        client_ids: Sequence[str] = (),
+        *,
+        symbol: Optional[str] = None,
+        max_in_flight: int = 8,
+    ) -> BulkCancelOrdersResponse:
+        """Cancel any number of orders, by order id and by client order id.
+
+        See `OrderBookSDK.cancel_orders`.
+        """
+        _check_cancel_targets(ids, client_ids, symbol)
+        if symbol is not None:
+            return _symbol_cancelled(await self.cancel_all_orders_by_symbol(symbol))
+
+        ids, client_ids = list(dict.fromkeys(ids)), list(dict.fromkeys(client_ids))
+        cancels = [(i, self.cancel_order_by_id) for i in ids]
+        cancels += [(i, self.cancel_order_by_client_id) for i in client_ids]
+        semaphore = asyncio.Semaphore(max(1, max_in_flight))
+
+        async def submit(
+            cancel: Tuple[str, Callable[[str], Awaitable[CancelOrderResponse]]],
+        ) -> Any:
+            key, send = cancel
+            async with semaphore:
+                return await send(key)
+
+        results = await asyncio.gather(
+            *(submit(cancel) for cancel in cancels), return_exceptions=True
+        )
+
+        return _merge_cancel_results(ids, client_ids, results)
+
+    async def cancel_order_by_id(self, order_id: str) -> CancelOrderResponse:
+        # The order's symbol is unknown, so every symbol's depth is invalidated
+        try:
+            res = await self._send_request(
+                method="DELETE", endpoint=f"api/v1/order/{order_id}"
+            )
+        finally:
+            self._invalidate((ORDER, order_id), (MARKET_DEPTH,))
+        return _decode(self.observer, CancelOrderResponse, res)
+
+    async def cancel_order_by_client_id(
+        self, client_order_id: str
+    ) -> CancelOrderResponse:
+        try:
+            res = await self._send_request(
+                method="DELETE",
+                endpoint=f"api/v1/order/client-order/{client_order_id}",
+            )
+        finally:
+            self._invalidate((MARKET_DEPTH,))
+        response = _decode(self.observer, CancelOrderResponse, res)
+        self._invalidate((ORDER, response.order_id))
+        return response
+
+    async def cancel_all_orders(self) -> Dict[str, Any]:
+        try:
+            return await self._send_request(method="DELETE", endpoint="api/v1/orders")
+        finally:
+            self._invalidate((ORDER,), (MARKET_DEPTH,))
+
+    async def cancel_all_orders_by_symbol(self, symbol: str) -> Dict[str, Any]:
+        try:
+            return await self._send_request(
+                method="DELETE", endpoint=f"api/v1/orders?symbol={symbol}"
+            )
+        finally:
+            self._invalidate((ORDER,), (MARKET_DEPTH, symbol))
+
+    async def get_symbols(self) -> List[SymbolResponse]:
+        return await self._cached(
+            (SYMBOLS,),
+            lambda: self._send_request(method="GET", endpoint="api/v1/symbols"),
+        )
+
+    async def get_supported_tokens(self) -> SupportedTokensResponse:
+        async def fetch() -> SupportedTokensResponse:
+            res = await self._send_request(
+                method="GET", endpoint="api/v1/supported-tokens"
+            )
+            return _decode(self.observer, SupportedTokensResponse, res)
+
+        return await self._cached((SUPPORTED_TOKENS,), fetch)
+
+    async def get_order_by_id(self, order_id: str) -> OrderResponse:
+        async def fetch() -> OrderResponse:
+            res = await self._send_request(
+                method="GET", endpoint=f"api/v1/order/{order_id}"
+            )
+            return _decode(self.observer, OrderResponse, res)
+
+        return await self._cached((ORDER, order_id), fetch)
+
+    async def get_order_by_client_id(self, client_order_id: str) -> OrderResponse:
+        res = await self._send_request(
+            method="GET", endpoint=f"api/v1/order/client-order/{client_order_id}"
+        )
+        return _decode(self.observer, OrderResponse, res)
+
+    async def get_market_depth(self, symbol: str, limit: int) -> MarketDepthResponse:
+        async def fetch() -> MarketDepthResponse:
+            res = await self._send_request(
+                method="GET",
+                endpoint=f"api/v1/orderbook/{symbol}",
+                data={"limit": limit},
+            )
+            return _decode(self.observer, MarketDepthResponse, res)
+
+        return await self._cached((MARKET_DEPTH, symbol, limit), fetch)
+
+    async def get_market_depth_compact(
+        self,
+        symbol: str,
+        limit: int,
+        *,
+        price_scale: Optional[int] = None,
+        size_scale: Optional[int] = None,
+    ) -> CompactMarketDepth:
+        """See `OrderBookSDK.get_market_depth_compact`."""
+
+        async def fetch() -> CompactMarketDepth:
+            res = await self._send_request(
+                method="GET",
+                endpoint=f"api/v1/orderbook/{symbol}",
+                data={"limit": limit},
+            )
+            return CompactMarketDepth.from_response(
+                res["data"], price_scale=price_scale, size_scale=size_scale
+            )
+
+        return await self._cached(
+            (MARKET_DEPTH, symbol, limit, price_scale, size_scale), fetch
+        )
+
+    async def get_orders_for_user(
+        self, page: int, page_size: int
+    ) -> OrdersForUserResponse:
+        res = await self._send_request(
+            method="GET",
+            endpoint="api/v1/orders",
+            data={"page": page, "pageSize": page_size},
+        )
+        return _decode(self.observer, OrdersForUserResponse, res)
+
+    async def get_filled_orders_for_user(
+        self, page: int, page_size: int
+    ) -> OrdersForUserResponse:
+        res = await self._send_request(
+            method="GET",
+            endpoint="api/v1/fills",
+            data={"page": page, "pageSize": page_size},
+        )
+        return _decode(self.observer, OrdersForUserResponse, res)
+
+    def iter_orders_for_user(
+        self,
+        page_size: int = 100,
+        *,
+        prefetch: int = 2,
+        checkpoint: Optional[PageCheckpoint] = None,
+    ) -> AsyncOrderPageIterator:
+        """Stream all open orders, fetching `prefetch` pages ahead.
+
+        See `OrderPageIterator`.
+        """
+        return AsyncOrderPageIterator(
+            self.get_orders_for_user,
+            page_size=page_size,
+            prefetch=prefetch,
+            checkpoint=checkpoint,
+        )
+
+    def iter_filled_orders_for_user(
+        self,
+        page_size: int = 100,
+        *,
+        prefetch: int = 2,
+        checkpoint: Optional[PageCheckpoint] = None,
+    ) -> AsyncOrderPageIterator:
+        """Stream all filled orders, fetching `prefetch` pages ahead.
+
+        See `OrderPageIterator`.
+        """
+        return AsyncOrderPageIterator(
+            self.get_filled_orders_for_user,
+            page_size=page_size,
+            prefetch=prefetch,
+            checkpoint=checkpoint,
+        )
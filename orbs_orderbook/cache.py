@@ -0,0 +1,166 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+MARKET_DEPTH = "market_depth"
+SYMBOLS = "symbols"
+ORDER = "order"
+SUPPORTED_TOKENS = "supported_tokens"
+CACHED_ENDPOINTS = (MARKET_DEPTH, SYMBOLS, ORDER, SUPPORTED_TOKENS)
+
+DEFAULT_TTLS = {MARKET_DEPTH: 0.1, SYMBOLS: 60.0, ORDER: 0.5, SUPPORTED_TOKENS: 60.0}
+
+CacheKey = Tuple[Hashable, ...]
+
+
+class _Flight:
+    __slots__ = ("future", "stale")
+
+    def __init__(self) -> None:
+        self.future: Future = Future()
+        # Invalidated while in flight: the response is returned, not stored
+        self.stale = False
+
+
+class ResponseCache:
+    """Read-through cache for read endpoints, shared by all requests of an SDK client.
+
+    Responses of `get_market_depth` (and `get_market_depth_compact`),
+    `get_symbols`, `get_order_by_id` and `get_supported_tokens` are kept for a
+    short TTL per endpoint, in an LRU of at most `max_entries` responses. Identical requests made while one is in
+    flight wait for its response instead of sending their own ("single
+    flight"), from any thread or event loop; failures are shared the same way
+    but never cached. An endpoint with a TTL of 0 is coalesced but not cached.
+
+    Writes invalidate what they change: creating orders and cancelling
+    invalidates the symbol's market depth, and cancelling invalidates the
+    cancelled orders.
+
+    Cached responses are shared between callers and must not be modified.
+
+    Usage:
+        client = OrderBookSDK(BASE_URL, API_KEY, cache=ResponseCache())
+    """
+
+    def __init__(
+        self,
+        ttls: Optional[Dict[str, float]] = None,
+        *,
+        max_entries: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            ttls (optional): Seconds responses are fresh per endpoint ("market_depth",
+                "symbols", "order", "supported_tokens"), merged into `DEFAULT_TTLS`.
+            max_entries (optional): Maximum number of cached responses. The least
+                recently used ones are evicted first.
+            clock (optional): Monotonic time source, in seconds.
+        """
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.max_entries = max_entries
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Any]]" = OrderedDict()
+        self._flights: Dict[CacheKey, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: CacheKey, fetch: Callable[[], Any]) -> Any:
+        """The fresh response for `key`, calling `fetch` if there is none.
+
+        Args:
+            key: Endpoint name, followed by the request's arguments.
+            fetch: Sends the request and returns its response.
+        """
+        value, flight, leader = self._lookup(key)
+        if flight is None:
+            return value
+        if not leader:
+            return flight.future.result()
+        try:
+            value = fetch()
+        except BaseException as err:
+            self._fail(key, flight, err)
+            raise
+        self._store(key, flight, value)
+        return value
+
+    async def get_async(
+        self, key: CacheKey, fetch: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """asyncio counterpart of `get`."""
+        value, flight, leader = self._lookup(key)
+        if flight is None:
+            return value
+        if not leader:
+            return await asyncio.wrap_future(flight.future)
+        try:
+            value = await fetch()
+        except BaseException as err:
+            self._fail(key, flight, err)
+            raise
+        self._store(key, flight, value)
+        return value
+
+    def invalidate(self, *key: Hashable) -> int:
+        """Drop cached responses whose key starts with `key`, and stop in-flight
+        requests for them from being cached.
+
+        `invalidate()` drops everything, `invalidate("market_depth", symbol)` drops
+        the symbol's market depth at every limit.
+
+        Returns:
+            Number of cached responses dropped
+        """
+        n = len(key)
+        with self._lock:
+            stale = [k for k in self._entries if k[:n] == key]
+            for k in stale:
+                del self._entries[k]
+            for k in [k for k in self._flights if k[:n] == key]:
+                self._flights.pop(k).stale = True
+        return len(stale)
+
+    def _lookup(self, key: CacheKey) -> Tuple[Any, Optional[_Flight], bool]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > self.clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1], None, False
+                del self._entries[key]
+
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                return None, flight, False
+            self.misses += 1
+            flight = self._flights[key] = _Flight()
+            return None, flight, True
+
+    def _store(self, key: CacheKey, flight: _Flight, value: Any) -> None:
+        with self._lock:
+            if not flight.stale:
+                del self._flights[key]
+                ttl = self.ttls.get(key[0], 0)
+                if ttl > 0:
+                    self._entries[key] = (self.clock() + ttl, value)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+        flight.future.set_result(value)
+
+    def _fail(self, key: CacheKey, flight: _Flight, err: BaseException) -> None:
+        with self._lock:
+            if not flight.stale:
+                del self._flights[key]
+        flight.future.set_exception(err)
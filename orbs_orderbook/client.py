@@ -1,37 +1,351 @@
-import json
-from typing import Any, Dict, List, Optional
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
 
 import dataclasses
 
+from orbs_orderbook.cache import (
+    MARKET_DEPTH,
+    ORDER,
+    SUPPORTED_TOKENS,
+    SYMBOLS,
+    CacheKey,
+    ResponseCache,
+)
+from orbs_orderbook.depth import CompactMarketDepth
 from orbs_orderbook.exceptions import ErrApiRequest, ErrUnauthorized
+from orbs_orderbook.instrumentation import Observer
+from orbs_orderbook.pagination import OrderPageIterator
+from orbs_orderbook.rate_limit import RequestScheduler
+from orbs_orderbook.retry import RetryPolicy
+from orbs_orderbook.token_registry import TokenRegistry
 from orbs_orderbook.types import (
+    BulkCancelOrdersResponse,
+    BulkCreateOrdersResponse,
     CreateMultipleOrdersInput,
     CreateMultipleOrdersResponse,
     CancelOrderResponse,
+    CancelResults,
     CreateOrderInput,
     CreateOrderResponse,
     EIP712Message,
+    FailedOrdersChunk,
     MarketDepthResponse,
     OrderResponse,
     OrdersForUserResponse,
+    OrderWithSignature,
+    PageCheckpoint,
+    RequestEvent,
+    _order_request_json,
     _parse_to_class,
     SupportedTokensResponse,
     SymbolResponse,
 )
 
-from orbs_orderbook.utils import dataclass_serializer
+from orbs_orderbook.utils import json_dumps, json_loads
+
+# Maximum number of orders the server accepts in one `create_multiple_orders` call
+MAX_ORDERS_PER_BATCH = 10
+
+logger = logging.getLogger(__name__)
+
+
+def _api_error(*, status_code: int, body: bytes, reason: str = "") -> Exception:
+    """Map a failed API response to the SDK exception raised for it.
+
+    Error bodies that aren't the API's JSON (e.g. a proxy's 502 page) are used
+    as the message as-is, or the HTTP reason if the body is empty, so they are
+    still raised as `ErrApiRequest` and can be retried.
+    """
+    if status_code == 401:
+        return ErrUnauthorized("Invalid API key")
+
+    try:
+        message = json_loads(body)["msg"]
+    except (ValueError, KeyError, TypeError):
+        message = body.decode("utf-8", "replace").strip() or reason
+    return ErrApiRequest(status_code=status_code, message=message)
+
+
+def _decode(observer: Optional[Observer], cls: Any, data: Any) -> Any:
+    """`_parse_to_class`, timed for `observer`."""
+    if observer is None:
+        return _parse_to_class(cls, data)
+    start = time.perf_counter()
+    result = _parse_to_class(cls, data)
+    observer.on_decode(cls.__name__, time.perf_counter() - start)
+    return result
+
+
+def _request_event(
+    method: str,
+    endpoint: str,
+    body: bytes,
+    start: float,
+    response: Optional[requests.Response],
+    error: Optional[Exception],
+) -> RequestEvent:
+    received = response is not None
+    return RequestEvent(
+        method=method,
+        endpoint=endpoint,
+        status_code=response.status_code if received else None,
+        latency=time.perf_counter() - start,
+        time_to_headers=response.elapsed.total_seconds() if received else None,
+        request_bytes=len(body),
+        response_bytes=len(response.content) if received else None,
+        error=error,
+    )
+
+
+def _create_order_body(
+    order_input: CreateOrderInput, signature: str, message: EIP712Message
+) -> bytes:
+    return _order_request_json(order_input, signature, message)
+
+
+def _create_multiple_orders_body(orders_input: CreateMultipleOrdersInput) -> bytes:
+    # Joined from each order's cached JSON, rather than re-encoding the
+    # signed messages
+    return b"".join(
+        (
+            b'{"symbol":',
+            json_dumps(orders_input.symbol),
+            b',"orders":[',
+            b",".join(o.request_json() for o in orders_input.orders),
+            b"]}",
+        )
+    )
+
+
+def _all_have_client_ids(orders_input: CreateMultipleOrdersInput) -> bool:
+    return all(o.order.client_order_id for o in orders_input.orders)
+
+
+def _created_response(symbol: str) -> Dict[str, Any]:
+    return {"created": [], "msg": "orders created", "status": 201, "symbol": symbol}
+
+
+def _prepend_created(
+    res: Dict[str, Any], found: Sequence[OrderResponse]
+) -> Dict[str, Any]:
+    """Add orders created by an earlier, ambiguous attempt to a `create_multiple_orders` response."""
+    return {
+        **res,
+        "created": [o.to_camelcase_dict() for o in found] + res["created"],
+    }
+
+
+def _chunk_orders(
+    orders: Sequence[OrderWithSignature], chunk_size: int
+) -> List[CreateMultipleOrdersInput]:
+    """Group orders by symbol and split each group into batches of `chunk_size`."""
+    by_symbol: Dict[str, List[OrderWithSignature]] = {}
+    for o in orders:
+        by_symbol.setdefault(o.order.symbol, []).append(o)
+
+    return [
+        CreateMultipleOrdersInput(symbol=symbol, orders=group[i : i + chunk_size])
+        for symbol, group in by_symbol.items()
+        for i in range(0, len(group), chunk_size)
+    ]
+
+
+def _merge_chunk_results(
+    chunks: Sequence[CreateMultipleOrdersInput], results: Sequence[Any]
+) -> BulkCreateOrdersResponse:
+    created: List[OrderResponse] = []
+    failed: List[FailedOrdersChunk] = []
+    for chunk, result in zip(chunks, results):
+        if isinstance(result, Exception):
+            failed.append(
+                FailedOrdersChunk(
+                    symbol=chunk.symbol, orders=chunk.orders, error=result
+                )
+            )
+        else:
+            created.extend(result.created)
+    return BulkCreateOrdersResponse(created=created, failed=failed)
+
+
+def _check_cancel_targets(
+    ids: Sequence[str], client_ids: Sequence[str], symbol: Optional[str]
+) -> None:
+    if symbol is not None and (ids or client_ids):
+        raise ValueError("pass either symbol, or ids and client_ids")
+
+
+def _cancel_results(keys: Sequence[str], results: Sequence[Any]) -> CancelResults:
+    cancelled: Dict[str, CancelOrderResponse] = {}
+    not_found: List[str] = []
+    failed: Dict[str, Exception] = {}
+    for key, result in zip(keys, results):
+        if isinstance(result, ErrApiRequest) and result.status_code == 404:
+            not_found.append(key)
+        elif isinstance(result, Exception):
+            failed[key] = result
+        else:
+            cancelled[key] = result
+    return CancelResults(cancelled=cancelled, not_found=not_found, failed=failed)
+
+
+def _merge_cancel_results(
+    ids: Sequence[str], client_ids: Sequence[str], results: Sequence[Any]
+) -> BulkCancelOrdersResponse:
+    """Split `results`, of the cancels of `ids` and then `client_ids`, by id kind."""
+    return BulkCancelOrdersResponse(
+        by_id=_cancel_results(ids, results[: len(ids)]),
+        by_client_id=_cancel_results(client_ids, results[len(ids) :]),
+        symbol_response=None,
+    )
+
+
+def _symbol_cancelled(res: Dict[str, Any]) -> BulkCancelOrdersResponse:
+    """`cancel_all_orders_by_symbol`'s response, which isn't broken down by order."""
+    return BulkCancelOrdersResponse(
+        by_id=_cancel_results((), ()),
+        by_client_id=_cancel_results((), ()),
+        symbol_response=res,
+    )
 
 
 class OrderBookSDK:
-    def __init__(self, base_url: str, api_key: str) -> None:
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        *,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        timeout: float = 10,
+        scheduler: Optional[RequestScheduler] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        observer: Optional[Observer] = None,
+        cache: Optional[ResponseCache] = None,
+        token_cache_path: Optional[str] = None,
+        token_cache_ttl: float = 3600,
+    ) -> None:
+        """
+        Args:
+            base_url: Order book API base URL.
+            api_key: API key issued by the Orbs team.
+            pool_connections (optional): Number of per-host connection pools to cache.
+            pool_maxsize (optional): Maximum number of keep-alive connections per host.
+            pool_block (optional): When all connections to a host are in use, wait for
+                one to be released (True) or open a throwaway connection (False).
+            timeout (optional): Request timeout in seconds.
+            scheduler (optional): Rate limiter to send every request through (see
+                `rate_limit.RequestScheduler`). Requests are sent immediately when None.
+            retry_policy (optional): How failed requests are retried (see
+                `retry.RetryPolicy`). Requests are not retried when None.
+            observer (optional): Receives request, retry and decoding events (see
+                `instrumentation.Observer`).
+            cache (optional): Read-through cache for market depth, symbols, orders
+                and supported tokens (see `cache.ResponseCache`). Every read is sent
+                when None.
+            token_cache_path (optional): File to cache supported tokens in (see
+                `token_registry.default_cache_path`). If the file is fresh, no request
+                is made on construction. If it is stale, it is used while fresh tokens
+                are fetched in the background.
+            token_cache_ttl (optional): Seconds before the token cache file is stale.
+        """
         self.base_url = base_url
         self.headers = {
             "X-API-KEY": f"Bearer {api_key}",
             "Content-Type": "application/json",
         }
-        self.supported_tokens = self.get_supported_tokens().tokens
+        self.timeout = timeout
+        self.scheduler = scheduler
+        self.retry_policy = retry_policy
+        self.observer = observer
+        self.cache = cache
+        # requests.Session is not thread-safe, so each thread gets its own,
+        # all sharing one connection pool
+        self._adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        self._local = threading.local()
+        self.supported_tokens = TokenRegistry()
+        self._token_cache_path = token_cache_path
+        self._load_supported_tokens(token_cache_ttl)
+
+    def __enter__(self) -> "OrderBookSDK":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self._adapter.close()
+
+    def refresh_supported_tokens(
+        self, *, background: bool = False
+    ) -> Optional[threading.Thread]:
+        """Fetch supported tokens, update `supported_tokens` and the cache file.
+
+        Args:
+            background (optional): Fetch on a background thread and return it.
+                Signers keep using the current tokens until the fetch completes;
+                if it fails, the error is logged and they carry on with them.
+        """
+        if background:
+            thread = threading.Thread(
+                target=self._refresh_supported_tokens_quietly,
+                name="orderbook-token-refresh",
+                daemon=True,
+            )
+            thread.start()
+            return thread
+
+        self.supported_tokens.update(self.get_supported_tokens().tokens)
+        if self._token_cache_path:
+            self.supported_tokens.save(self._token_cache_path)
+        return None
+
+    def _refresh_supported_tokens_quietly(self) -> None:
+        try:
+            self.refresh_supported_tokens()
+        except Exception:
+            logger.exception("Refreshing supported tokens failed")
+
+    def _load_supported_tokens(self, ttl: float) -> None:
+        if self._token_cache_path:
+            cached, age = TokenRegistry.load(self._token_cache_path)
+            if cached is not None:
+                self.supported_tokens.update(cached.tokens)
+                if age > ttl:
+                    self.refresh_supported_tokens(background=True)
+                return
+
+        self.refresh_supported_tokens()
+
+    def _get_session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount("http://", self._adapter)
+            session.mount("https://", self._adapter)
+            self._local.session = session
+        return session
+
+    def _cached(self, key: CacheKey, fetch: Callable[[], Any]) -> Any:
+        if self.cache is None:
+            return fetch()
+        return self.cache.get(key, fetch)
+
+    def _invalidate(self, *keys: CacheKey) -> None:
+        if self.cache is not None:
+            for key in keys:
+                self.cache.invalidate(*key)
 
     def _send_request(
         self,
@@ -40,30 +354,72 @@ class OrderBookSDK:
         endpoint: str,
         data: Optional[Any] = None,
         custom_headers: Optional[Dict[str, str]] = None,
+        resolve: Optional[Callable[[], Any]] = None,
+    ) -> Any:
+        if self.retry_policy is None:
+            return self._send_attempt(method, endpoint, data, custom_headers)
+        return self.retry_policy.call(
+            lambda: self._send_attempt(method, endpoint, data, custom_headers),
+            method=method,
+            endpoint=endpoint,
+            resolve=resolve,
+            observer=self.observer,
+        )
+
+    def _send_attempt(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Any],
+        custom_headers: Optional[Dict[str, str]],
+    ) -> Any:
+        if self.scheduler is None:
+            return self._send(method, endpoint, data, custom_headers)
+        with self.scheduler.slot(method, endpoint):
+            return self._send(method, endpoint, data, custom_headers)
+
+    def _send(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Any],
+        custom_headers: Optional[Dict[str, str]],
     ) -> Any:
         url = f"{self.base_url}/{endpoint}"
         headers = self.headers.copy()
 
         if custom_headers:
             headers.update(custom_headers)
+        # Order bodies are pre-encoded
+        body = data if isinstance(data, bytes) else json_dumps(data)
+        observer = self.observer
+        start = time.perf_counter() if observer is not None else 0.0
+        response = error = None
         try:
-            response = requests.request(
+            response = self._get_session().request(
                 method,
                 url,
                 headers=headers,
-                data=json.dumps(data, default=dataclass_serializer),
-                timeout=10,
+                data=body,
+                timeout=self.timeout,
             )
             response.raise_for_status()
-            return response.json()
+            return json_loads(response.content)
         except requests.exceptions.HTTPError as err:
-            if err.response.status_code == 401:
-                raise ErrUnauthorized("Invalid API key") from err
-
-            raise ErrApiRequest(
+            error = _api_error(
                 status_code=err.response.status_code,
-                message=err.response.json()["msg"],
-            ) from err
+                body=err.response.content,
+                reason=err.response.reason or "",
+            )
+            raise error from err
+        except Exception as err:
+            error = err
+            raise
+        finally:
+            if observer is not None:
+                observer.on_request(
+                    _request_event(method, endpoint, body, start, response, error)
+                )
 
     def create_order(
         self,
@@ -72,78 +428,282 @@ class OrderBookSDK:
         signature: str,
         message: EIP712Message,
     ) -> CreateOrderResponse:
-        res = self._send_request(
-            method="POST",
-            endpoint="api/v1/order",
-            data={
-                **order_input.to_camelcase_dict(),
-                "eip712Sig": signature,
-                "eip712Msg": message.message_data,
-            },
-        )
-        return _parse_to_class(CreateOrderResponse, res)
+        resolve = None
+        if self.retry_policy is not None and order_input.client_order_id:
+
+            def resolve() -> Optional[Dict[str, Any]]:
+                order = self._find_order_by_client_id(order_input.client_order_id)
+                return None if order is None else {"orderId": order.order_id}
+
+        try:
+            res = self._send_request(
+                method="POST",
+                endpoint="api/v1/order",
+                data=_create_order_body(order_input, signature, message),
+                resolve=resolve,
+            )
+        finally:
+            self._invalidate((MARKET_DEPTH, order_input.symbol))
+        return _decode(self.observer, CreateOrderResponse, res)
 
     def create_multiple_orders(
         self, orders_input: CreateMultipleOrdersInput
     ) -> CreateMultipleOrdersResponse:
-        res = self._send_request(
+        try:
+            res = self._create_multiple_orders(orders_input)
+        finally:
+            self._invalidate((MARKET_DEPTH, orders_input.symbol))
+
+        return _decode(self.observer, CreateMultipleOrdersResponse, res)
+
+    def _create_multiple_orders(
+        self, orders_input: CreateMultipleOrdersInput
+    ) -> Dict[str, Any]:
+        resolve = None
+        if self.retry_policy is not None and _all_have_client_ids(orders_input):
+
+            def resolve() -> Optional[Dict[str, Any]]:
+                found, missing = self._find_orders(orders_input.orders)
+                if not found:
+                    return None
+                if missing:
+                    res = self._create_multiple_orders(
+                        CreateMultipleOrdersInput(
+                            symbol=orders_input.symbol, orders=missing
+                        )
+                    )
+                else:
+                    res = _created_response(orders_input.symbol)
+                return _prepend_created(res, found)
+
+        return self._send_request(
             method="POST",
             endpoint="api/v1/orders",
-            data={
-                "symbol": orders_input.symbol,
-                "orders": [
-                    {
-                        **o.order.to_camelcase_dict(),
-                        "eip712Sig": o.signature,
-                        "eip712Msg": o.message.message_data,
-                    }
-                    for o in orders_input.orders
-                ],
-            },
+            data=_create_multiple_orders_body(orders_input),
+            resolve=resolve,
         )
 
-        return _parse_to_class(CreateMultipleOrdersResponse, res)
+    def _find_order_by_client_id(self, client_order_id: str) -> Optional[OrderResponse]:
+        try:
+            return self.get_order_by_client_id(client_order_id)
+        except ErrApiRequest as err:
+            if err.status_code == 404:
+                return None
+            raise
+
+    def _find_orders(
+        self, orders: Sequence[OrderWithSignature]
+    ) -> Tuple[List[OrderResponse], List[OrderWithSignature]]:
+        """Split orders into the ones that exist (looked up by client order id) and the rest."""
+        found, missing = [], []
+        for o in orders:
+            order = self._find_order_by_client_id(o.order.client_order_id)
+            if order is None:
+                missing.append(o)
+            else:
+                found.append(order)
+        return found, missing
+
+    def create_orders_bulk(
+        self,
+        orders: Sequence[OrderWithSignature],
+        *,
+        chunk_size: int = MAX_ORDERS_PER_BATCH,
+        max_in_flight: int = 8,
+    ) -> BulkCreateOrdersResponse:
+        """Create any number of signed orders, across any number of symbols.
+
+        Orders are grouped by symbol and split into `create_multiple_orders`
+        batches of at most `chunk_size`, which are sent concurrently.
+
+        Args:
+            orders: Signed orders to create.
+            chunk_size (optional): Maximum orders per request.
+            max_in_flight (optional): Maximum number of concurrent requests. Keep this
+                at or below `pool_maxsize` so that every request reuses a connection.
+
+        Returns:
+            Created orders from every successful batch, and the batches that failed
+            with the exception each one raised
+        """
+        chunks = _chunk_orders(orders, chunk_size)
+
+        def submit(chunk: CreateMultipleOrdersInput) -> Any:
+            try:
+                return self.create_multiple_orders(chunk)
+            except Exception as err:
+                return err
+
+        with ThreadPoolExecutor(max_workers=max(1, max_in_flight)) as executor:
+            results = list(executor.map(submit, chunks))
+
+        return _merge_chunk_results(chunks, results)
+
+    def cancel_orders(
+        self,
+        ids: Sequence[str] = (),
+        client_ids: Sequence[str] = (),
+        *,
+        symbol: Optional[str] = None,
+        max_in_flight: int = 8,
+    ) -> BulkCancelOrdersResponse:
+        """Cancel any number of orders, by order id and by client order id.
+
+        Cancels are sent concurrently, one request per order. To cancel every
+        open order of a symbol, pass just `symbol`: that takes one request to
+        `cancel_all_orders_by_symbol`, however many orders are open, and its
+        response is returned as is in `symbol_response`.
+
+        Args:
+            ids (optional): Order ids to cancel.
+            client_ids (optional): Client order ids to cancel.
+            symbol (optional): Symbol to cancel every open order of, instead of
+                `ids` and `client_ids`.
+            max_in_flight (optional): Maximum number of concurrent requests. Keep this
+                at or below `pool_maxsize` so that every request reuses a connection.
+
+        Returns:
+            Cancelled orders, orders that were not found (already filled or
+            cancelled) and the cancels that failed with the exception each one
+            raised, by order id and by client order id. Each distinct id is
+            cancelled once.
+
+        Raises:
+            ValueError: If `symbol` is passed along with `ids` or `client_ids`.
+            ErrApiRequest: If the symbol-wide cancel fails.
+        """
+        _check_cancel_targets(ids, client_ids, symbol)
+        if symbol is not None:
+            return _symbol_cancelled(self.cancel_all_orders_by_symbol(symbol))
+
+        ids, client_ids = list(dict.fromkeys(ids)), list(dict.fromkeys(client_ids))
+        cancels = [(i, self.cancel_order_by_id) for i in ids]
+        cancels += [(i, self.cancel_order_by_client_id) for i in client_ids]
+
+        def submit(cancel: Tuple[str, Callable[[str], CancelOrderResponse]]) -> Any:
+            key, send = cancel
+            try:
+                return send(key)
+            except Exception as err:
+                return err
+
+        if len(cancels) > 1 and max_in_flight > 1:
+            with ThreadPoolExecutor(
+                max_workers=min(max_in_flight, len(cancels))
+            ) as executor:
+                results = list(executor.map(submit, cancels))
+        else:
+            results = [submit(cancel) for cancel in cancels]
+
+        return _merge_cancel_results(ids, client_ids, results)
 
     def cancel_order_by_id(self, order_id: str) -> CancelOrderResponse:
-        res = self._send_request(method="DELETE", endpoint=f"api/v1/order/{order_id}")
-        return _parse_to_class(CancelOrderResponse, res)
+        # The order's symbol is unknown, so every symbol's depth is invalidated
+        try:
+            res = self._send_request(
+                method="DELETE", endpoint=f"api/v1/order/{order_id}"
+            )
+        finally:
+            self._invalidate((ORDER, order_id), (MARKET_DEPTH,))
+        return _decode(self.observer, CancelOrderResponse, res)
 
     def cancel_order_by_client_id(self, client_order_id: str) -> CancelOrderResponse:
-        res = self._send_request(
-            method="DELETE", endpoint=f"api/v1/order/client-order/{client_order_id}"
-        )
-        return _parse_to_class(CancelOrderResponse, res)
+        try:
+            res = self._send_request(
+                method="DELETE",
+                endpoint=f"api/v1/order/client-order/{client_order_id}",
+            )
+        finally:
+            self._invalidate((MARKET_DEPTH,))
+        response = _decode(self.observer, CancelOrderResponse, res)
+        self._invalidate((ORDER, response.order_id))
+        return response
 
     def cancel_all_orders(self) -> Dict[str, Any]:
-        return self._send_request(method="DELETE", endpoint="api/v1/orders")
+        try:
+            return self._send_request(method="DELETE", endpoint="api/v1/orders")
+        finally:
+            self._invalidate((ORDER,), (MARKET_DEPTH,))
 
     def cancel_all_orders_by_symbol(self, symbol: str) -> Dict[str, Any]:
-        return self._send_request(
-            method="DELETE", endpoint=f"api/v1/orders?symbol={symbol}"
-        )
+        try:
+            return self._send_request(
+                method="DELETE", endpoint=f"api/v1/orders?symbol={symbol}"
+            )
+        finally:
+            self._invalidate((ORDER,), (MARKET_DEPTH, symbol))
 
     def get_symbols(self) -> List[SymbolResponse]:
-        return self._send_request(method="GET", endpoint="api/v1/symbols")
+        return self._cached(
+            (SYMBOLS,),
+            lambda: self._send_request(method="GET", endpoint="api/v1/symbols"),
+        )
 
     def get_supported_tokens(self) -> SupportedTokensResponse:
-        res = self._send_request(method="GET", endpoint="api/v1/supported-tokens")
-        return _parse_to_class(SupportedTokensResponse, res)
+        def fetch() -> SupportedTokensResponse:
+            res = self._send_request(method="GET", endpoint="api/v1/supported-tokens")
+            return _decode(self.observer, SupportedTokensResponse, res)
+
+        return self._cached((SUPPORTED_TOKENS,), fetch)
 
     def get_order_by_id(self, order_id: str) -> OrderResponse:
-        res = self._send_request(method="GET", endpoint=f"api/v1/order/{order_id}")
-        return _parse_to_class(OrderResponse, res)
+        def fetch() -> OrderResponse:
+            res = self._send_request(method="GET", endpoint=f"api/v1/order/{order_id}")
+            return _decode(self.observer, OrderResponse, res)
+
+        return self._cached((ORDER, order_id), fetch)
 
     def get_order_by_client_id(self, client_order_id: str) -> OrderResponse:
         res = self._send_request(
             method="GET", endpoint=f"api/v1/order/client-order/{client_order_id}"
         )
-        return _parse_to_class(OrderResponse, res)
+        return _decode(self.observer, OrderResponse, res)
 
     def get_market_depth(self, symbol: str, limit: int) -> MarketDepthResponse:
-        res = self._send_request(
-            method="GET", endpoint=f"api/v1/orderbook/{symbol}", data={"limit": limit}
+        def fetch() -> MarketDepthResponse:
+            res = self._send_request(
+                method="GET",
+                endpoint=f"api/v1/orderbook/{symbol}",
+                data={"limit": limit},
+            )
+            return _decode(self.observer, MarketDepthResponse, res)
+
+        return self._cached((MARKET_DEPTH, symbol, limit), fetch)
+
+    def get_market_depth_compact(
+        self,
+        symbol: str,
+        limit: int,
+        *,
+        price_scale: Optional[int] = None,
+        size_scale: Optional[int] = None,
+    ) -> CompactMarketDepth:
+        """`get_market_depth`, with levels parsed into fixed-point integer buffers.
+
+        See `depth.CompactMarketDepth`.
+
+        Args:
+            symbol: Symbol to get the depth of.
+            limit: Maximum number of levels per side.
+            price_scale (optional): Decimal places prices are kept at. By default,
+                as many as the response has, and at least 8.
+            size_scale (optional): Decimal places sizes are kept at. By default,
+                as many as the response has and fit, and at least 8 if they fit.
+        """
+
+        def fetch() -> CompactMarketDepth:
+            res = self._send_request(
+                method="GET",
+                endpoint=f"api/v1/orderbook/{symbol}",
+                data={"limit": limit},
+            )
+            return CompactMarketDepth.from_response(
+                res["data"], price_scale=price_scale, size_scale=size_scale
+            )
+
+        return self._cached(
+            (MARKET_DEPTH, symbol, limit, price_scale, size_scale), fetch
         )
-        return _parse_to_class(MarketDepthResponse, res)
 
     def get_orders_for_user(self, page: int, page_size: int) -> OrdersForUserResponse:
         res = self._send_request(
@@ -151,7 +711,7 @@ class OrderBookSDK:
             endpoint="api/v1/orders",
             data={"page": page, "pageSize": page_size},
         )
-        return _parse_to_class(OrdersForUserResponse, res)
+        return _decode(self.observer, OrdersForUserResponse, res)
 
     def get_filled_orders_for_user(
         self, page: int, page_size: int
@@ -161,4 +721,40 @@ class OrderBookSDK:
             endpoint="api/v1/fills",
             data={"page": page, "pageSize": page_size},
         )
-        return _parse_to_class(OrdersForUserResponse, res)
+        return _decode(self.observer, OrdersForUserResponse, res)
+
+    def iter_orders_for_user(
+        self,
+        page_size: int = 100,
+        *,
+        prefetch: int = 2,
+        checkpoint: Optional[PageCheckpoint] = None,
+    ) -> OrderPageIterator:
+        """Stream all open orders, fetching `prefetch` pages ahead.
+
+        See `OrderPageIterator`.
+        """
+        return OrderPageIterator(
+            self.get_orders_for_user,
+            page_size=page_size,
+            prefetch=prefetch,
+            checkpoint=checkpoint,
+        )
+
+    def iter_filled_orders_for_user(
+        self,
+        page_size: int = 100,
+        *,
+        prefetch: int = 2,
+        checkpoint: Optional[PageCheckpoint] = None,
+    ) -> OrderPageIterator:
+        """Stream all filled orders, fetching `prefetch` pages ahead.
+
+        See `OrderPageIterator`.
+        """
+        return OrderPageIterator(
+            self.get_filled_orders_for_user,
+            page_size=page_size,
+            prefetch=prefetch,
+            checkpoint=checkpoint,
+        )
@@ -0,0 +1,353 @@
+from array import array
+from decimal import Decimal
+from itertools import accumulate
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from orbs_orderbook.utils import from_fixed, to_fixed
+
+# Prices are limited to 8 decimal places (see `OrderSigner._check_decimal_places`)
+PRICE_SCALE = 8
+# Compact sizes keep at least 8 decimal places, and more if a response has them
+COMPACT_SIZE_SCALE = 8
+
+_INT64_MAX = 2**63 - 1
+
+
+def _decimal_places(value: str) -> int:
+    if "e" in value or "E" in value:
+        return max(0, -Decimal(value).as_tuple().exponent)
+    return len(value.partition(".")[2])
+
+
+def _round_div(value: int, divisor: int) -> int:
+    """`value / divisor` rounded half to even."""
+    quotient, remainder = divmod(value, divisor)
+    if 2 * remainder > divisor or (2 * remainder == divisor and quotient % 2):
+        quotient += 1
+    return quotient
+
+
+def _rescale(values: Sequence[int], scale: int, target: int) -> Sequence[int]:
+    if target == scale:
+        return values
+    if target > scale:
+        factor = 10 ** (target - scale)
+        return [v * factor for v in values]
+    divisor = 10 ** (scale - target)
+    return [_round_div(v, divisor) for v in values]
+
+
+def _largest(values: Sequence[int]) -> int:
+    return max(map(abs, values), default=0)
+
+
+def _parse_fixed(
+    values: List[str], scale: Optional[int], *, min_scale: int, total: bool
+) -> Tuple[array, int]:
+    """`values` as a buffer of fixed-point integers, and the scale used.
+
+    A `scale` of None keeps every decimal place of `values`, and at least
+    `min_scale`, unless the largest value (with `total`, their sum) wouldn't
+    fit a signed 64-bit integer; then values are rounded (half to even) to the
+    most decimal places that fit.
+    """
+    if scale is not None:
+        return array("q", [to_fixed(v, scale) for v in values]), scale
+
+    measure = sum if total else _largest
+    scale = min_scale
+    try:
+        fixed = [to_fixed(v, scale) for v in values]
+    except ValueError:
+        # Only counted when needed: most responses fit `min_scale`
+        scale = max(map(_decimal_places, values))
+        fixed = [to_fixed(v, scale) for v in values]
+    bound = measure(fixed)
+    if bound > _INT64_MAX:
+        # Start from the fewest dropped digits that can fit, then drop one more
+        # if rounding up pushed the bound over again
+        dropped = len(str(bound // _INT64_MAX))
+        while True:
+            rounded = _rescale(fixed, scale, scale - dropped)
+            if measure(rounded) <= _INT64_MAX:
+                break
+            dropped += 1
+        fixed, scale = rounded, scale - dropped
+    return array("q", fixed), scale
+
+
+def _common_scale(a: memoryview, a_scale: int, b: memoryview, b_scale: int) -> int:
+    """The most decimal places at which the values of both `a` and `b` fit int64."""
+    scale = max(a_scale, b_scale)
+    for values, own_scale in ((a, a_scale), (b, b_scale)):
+        largest = _largest(values)
+        while largest * 10 ** (scale - own_scale) > _INT64_MAX:
+            scale -= 1
+    return scale
+
+
+class DepthLevels:
+    """One side of a market depth snapshot: prices and sizes as fixed-point
+    integers in two contiguous signed 64-bit buffers, best level first.
+
+    `prices` and `sizes` are memoryviews (format "q"), at `price_scale` and
+    `size_scale` decimal places. Slicing returns levels that share the same
+    buffers, and `numpy()` wraps them without copying. Indexing returns a
+    level as `Decimal`s.
+    """
+
+    __slots__ = ("prices", "sizes", "price_scale", "size_scale", "descending")
+
+    def __init__(
+        self,
+        prices: memoryview,
+        sizes: memoryview,
+        *,
+        price_scale: int,
+        size_scale: int,
+        descending: bool = False,
+    ) -> None:
+        """
+        Args:
+            prices: Fixed-point prices, best first.
+            sizes: Fixed-point sizes, one per price.
+            price_scale: Decimal places of `prices`.
+            size_scale: Decimal places of `sizes`.
+            descending (optional): Whether prices are in descending order (bids).
+        """
+        self.prices = prices
+        self.sizes = sizes
+        self.price_scale = price_scale
+        self.size_scale = size_scale
+        self.descending = descending
+
+    @classmethod
+    def from_levels(
+        cls,
+        levels: Iterable[Sequence[str]],
+        *,
+        price_scale: Optional[int] = None,
+        size_scale: Optional[int] = None,
+        descending: bool = False,
+    ) -> "DepthLevels":
+        """Parse [price, size] string levels, as returned by the API.
+
+        Args:
+            levels: [price, size] pairs of decimal strings.
+            price_scale (optional): Decimal places to keep prices at. By default,
+                `PRICE_SCALE`, or the most decimal places of any price if more.
+            size_scale (optional): Decimal places to keep sizes at. By default,
+                `COMPACT_SIZE_SCALE`, or the most decimal places of any size if
+                more. If the total size wouldn't fit a signed 64-bit integer at
+                that scale, sizes are rounded to the most decimal places that
+                fit, so `cumulative_sizes` can't overflow either. Prices are
+                rounded the same way if one of them wouldn't fit.
+            descending (optional): Whether prices are in descending order (bids).
+
+        Raises:
+            ValueError: If a value has more decimal places than a given scale.
+            OverflowError: If a value doesn't fit a signed 64-bit integer at a
+                given scale.
+        """
+        if not isinstance(levels, list):
+            levels = list(levels)
+        prices, price_scale = _parse_fixed(
+            [p for p, _ in levels], price_scale, min_scale=PRICE_SCALE, total=False
+        )
+        sizes, size_scale = _parse_fixed(
+            [s for _, s in levels], size_scale, min_scale=COMPACT_SIZE_SCALE, total=True
+        )
+        return cls(
+            memoryview(prices),
+            memoryview(sizes),
+            price_scale=price_scale,
+            size_scale=size_scale,
+            descending=descending,
+        )
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._with(self.prices[index], self.sizes[index])
+        return (
+            from_fixed(self.prices[index], self.price_scale),
+            from_fixed(self.sizes[index], self.size_scale),
+        )
+
+    def __iter__(self) -> Iterator[Tuple[Decimal, Decimal]]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, DepthLevels):
+            return NotImplemented
+        return (
+            self.prices == other.prices
+            and self.sizes == other.sizes
+            and self.price_scale == other.price_scale
+            and self.size_scale == other.size_scale
+        )
+
+    def __repr__(self) -> str:
+        return f"DepthLevels({self.to_lists()!r})"
+
+    def cumulative_sizes(self) -> memoryview:
+        """Total size from the best level down to each level, in `size_scale`."""
+        return memoryview(array("q", accumulate(self.sizes)))
+
+    def numpy(self) -> Tuple[Any, Any]:
+        """`prices` and `sizes` as int64 NumPy arrays, without copying.
+
+        Requires NumPy (`pip install numpy`).
+        """
+        if numpy is None:
+            raise ImportError("DepthLevels.numpy() requires numpy")
+        return numpy.asarray(self.prices), numpy.asarray(self.sizes)
+
+    def to_lists(self) -> List[List[str]]:
+        """[price, size] string levels, as returned by the API."""
+        return [[f"{price:f}", f"{size:f}"] for price, size in self]
+
+    def diff(self, previous: "DepthLevels") -> "DepthLevels":
+        """Levels whose size changed since `previous`, with the change in size.
+
+        Levels only in `previous` have a negative change of their whole size,
+        new levels a positive change of theirs. Both must be the same side.
+        Levels at different scales are compared at the most decimal places
+        both fit at, which is also the scale of the result.
+        """
+        if previous.descending != self.descending:
+            raise ValueError("can only compare levels of the same side")
+
+        price_scale = _common_scale(
+            self.prices, self.price_scale, previous.prices, previous.price_scale
+        )
+        size_scale = _common_scale(
+            self.sizes, self.size_scale, previous.sizes, previous.size_scale
+        )
+        new_prices = _rescale(self.prices, self.price_scale, price_scale)
+        new_sizes = _rescale(self.sizes, self.size_scale, size_scale)
+        old_prices = _rescale(previous.prices, previous.price_scale, price_scale)
+        old_sizes = _rescale(previous.sizes, previous.size_scale, size_scale)
+        sign = -1 if self.descending else 1
+        prices, deltas = array("q"), array("q")
+        i = j = 0
+        while i < len(new_prices) or j < len(old_prices):
+            if j == len(old_prices) or (
+                i < len(new_prices) and sign * new_prices[i] < sign * old_prices[j]
+            ):
+                price, delta = new_prices[i], new_sizes[i]
+                i += 1
+            elif i == len(new_prices) or sign * old_prices[j] < sign * new_prices[i]:
+                price, delta = old_prices[j], -old_sizes[j]
+                j += 1
+            else:
+                price, delta = new_prices[i], new_sizes[i] - old_sizes[j]
+                i += 1
+                j += 1
+            if delta:
+                prices.append(price)
+                deltas.append(delta)
+        return DepthLevels(
+            memoryview(prices),
+            memoryview(deltas),
+            price_scale=price_scale,
+            size_scale=size_scale,
+            descending=self.descending,
+        )
+
+    def _with(self, prices: memoryview, sizes: memoryview) -> "DepthLevels":
+        return DepthLevels(
+            prices,
+            sizes,
+            price_scale=self.price_scale,
+            size_scale=self.size_scale,
+            descending=self.descending,
+        )
+
+
+class CompactMarketDepth:
+    """Market depth snapshot with both sides as `DepthLevels`.
+
+    A compact alternative to `MarketDepthData`, whose levels are a list of
+    two strings each: a snapshot of n levels takes two int64 buffers instead
+    of 3n Python objects.
+
+    Usage:
+        depth = client.get_market_depth_compact("MATIC-USDC", 1000)
+        depth.asks[:10].cumulative_sizes()
+        changes = depth.diff(previous)
+    """
+
+    __slots__ = ("symbol", "time", "asks", "bids")
+
+    def __init__(
+        self,
+        *,
+        symbol: str,
+        time: Optional[int],
+        asks: DepthLevels,
+        bids: DepthLevels,
+    ) -> None:
+        self.symbol = symbol
+        self.time = time
+        self.asks = asks
+        self.bids = bids
+
+    @classmethod
+    def from_response(
+        cls,
+        data: Dict[str, Any],
+        *,
+        price_scale: Optional[int] = None,
+        size_scale: Optional[int] = None,
+    ) -> "CompactMarketDepth":
+        """Build from the `data` object of a market depth response.
+
+        Args:
+            data: Response JSON's "data", with "symbol", "time", "asks" and "bids".
+            price_scale (optional): Decimal places prices are kept at. By default,
+                chosen per side as in `DepthLevels.from_levels`.
+            size_scale (optional): Decimal places sizes are kept at. By default,
+                chosen per side as in `DepthLevels.from_levels`.
+        """
+        scales = {"price_scale": price_scale, "size_scale": size_scale}
+        return cls(
+            symbol=data["symbol"],
+            time=data.get("time"),
+            asks=DepthLevels.from_levels(data["asks"], **scales),
+            bids=DepthLevels.from_levels(data["bids"], descending=True, **scales),
+        )
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, CompactMarketDepth):
+            return NotImplemented
+        return (self.symbol, self.time, self.asks, self.bids) == (
+            other.symbol,
+            other.time,
+            other.asks,
+            other.bids,
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"CompactMarketDepth(symbol={self.symbol!r}, time={self.time!r}, "
+            f"asks={len(self.asks)} levels, bids={len(self.bids)} levels)"
+        )
+
+    def diff(self, previous: "CompactMarketDepth") -> Dict[str, DepthLevels]:
+        """Levels of each side ("asks", "bids") whose size changed since `previous`.
+
+        See `DepthLevels.diff`.
+        """
+        return {
+            "asks": self.asks.diff(previous.asks),
+            "bids": self.bids.diff(previous.bids),
+        }
@@ -0,0 +1,203 @@
+from typing import Any, Callable, Dict, List, Tuple
+
+from eth_account.messages import SignableMessage
+from eth_utils import keccak
+from hexbytes import HexBytes
+
+_EIP712_DOMAIN_FIELDS = [
+    {"name": "name", "type": "string"},
+    {"name": "version", "type": "string"},
+    {"name": "chainId", "type": "uint256"},
+    {"name": "verifyingContract", "type": "address"},
+    {"name": "salt", "type": "bytes32"},
+]
+
+_ZERO_WORD = b"\x00" * 32
+
+FieldEncoder = Callable[[Any], bytes]
+
+
+class TypedDataSchema:
+    """EIP-712 domain and message types, compiled once.
+
+    The domain separator and every type hash are computed up front, so
+    encoding a message only hashes its values. The output is identical to
+    `eth_account.messages.encode_typed_data` for the same inputs.
+
+    Usage:
+        schema = TypedDataSchema(
+            primary_type="Mail", domain_data=domain, message_types=types
+        )
+        signable_message = schema.encode(message_data)
+    """
+
+    def __init__(
+        self,
+        *,
+        primary_type: str,
+        domain_data: Dict[str, Any],
+        message_types: Dict[str, List[Dict[str, str]]],
+    ) -> None:
+        self.primary_type = primary_type
+        self.domain_data = domain_data
+        self.message_types = message_types
+
+        domain_types = {
+            "EIP712Domain": [
+                field for field in _EIP712_DOMAIN_FIELDS if field["name"] in domain_data
+            ]
+        }
+        self.domain_separator = _CompiledTypes(domain_types).hash_struct(
+            "EIP712Domain", domain_data
+        )
+
+        self._types = _CompiledTypes(
+            {k: v for k, v in message_types.items() if k != "EIP712Domain"}
+        )
+        self.type_hashes = self._types.type_hashes
+
+    def hash_struct(self, message_data: Dict[str, Any]) -> bytes:
+        """Return the EIP-712 `hashStruct` of a message of the primary type."""
+        return self._types.hash_struct(self.primary_type, message_data)
+
+    def encode(self, message_data: Dict[str, Any]) -> SignableMessage:
+        """Encode a message of the primary type, ready for signing."""
+        return SignableMessage(
+            HexBytes(b"\x01"),
+            self.domain_separator,
+            self._types.hash_struct(self.primary_type, message_data),
+        )
+
+
+class _CompiledTypes:
+    def __init__(self, types: Dict[str, List[Dict[str, str]]]) -> None:
+        self.types = types
+        self.type_hashes = {
+            type_: keccak(text=_encode_type(type_, types)) for type_ in types
+        }
+        self._fields: Dict[str, List[Tuple[str, FieldEncoder]]] = {
+            type_: [(f["name"], self._field_encoder(f["type"])) for f in fields]
+            for type_, fields in types.items()
+        }
+
+    def hash_struct(self, type_: str, data: Dict[str, Any]) -> bytes:
+        encoded = [self.type_hashes[type_]]
+        for name, encode_field in self._fields[type_]:
+            encoded.append(encode_field(data.get(name)))
+        return keccak(b"".join(encoded))
+
+    def _field_encoder(self, type_: str) -> FieldEncoder:
+        if type_.endswith("]"):
+            encode_item = self._field_encoder(type_[: type_.rindex("[")])
+
+            def encode_array(value: Any) -> bytes:
+                if not isinstance(value, list):
+                    raise ValueError(
+                        f"Invalid value for type `{type_}`: expected array, got {value!r}"
+                    )
+                return keccak(b"".join(encode_item(item) for item in value))
+
+            return encode_array
+
+        if type_ in self.types:
+
+            def encode_struct(value: Any) -> bytes:
+                if value is None:
+                    return _ZERO_WORD
+                return self.hash_struct(type_, value)
+
+            return encode_struct
+
+        if type_ == "address":
+            return _encode_address
+        if type_ == "bool":
+            return _encode_bool
+        if type_ == "string":
+            return _encode_string
+        if type_ == "bytes":
+            return _encode_bytes
+        if type_.startswith("bytes"):
+            return _encode_fixed_bytes
+        if type_.startswith("uint"):
+            return _int_encoder(type_, bits=int(type_[4:] or 256), signed=False)
+        if type_.startswith("int"):
+            return _int_encoder(type_, bits=int(type_[3:] or 256), signed=True)
+
+        raise ValueError(f"No definition of type `{type_}`")
+
+
+def _encode_type(primary_type: str, types: Dict[str, List[Dict[str, str]]]) -> str:
+    deps = set()
+    pending = [primary_type]
+    while pending:
+        for field in types[pending.pop()]:
+            dep = field["type"].split("[", 1)[0]
+            if dep in types and dep != primary_type and dep not in deps:
+                deps.add(dep)
+                pending.append(dep)
+
+    return "".join(
+        f"{type_}({','.join(f['type'] + ' ' + f['name'] for f in types[type_])})"
+        for type_ in [primary_type] + sorted(deps)
+    )
+
+
+def _to_bytes(value: Any) -> bytes:
+    if isinstance(value, bytes):
+        return value
+    if isinstance(value, str):
+        if value[:2] in ("0x", "0X"):
+            digits = value[2:]
+            return bytes.fromhex("0" * (len(digits) % 2) + digits)
+        return value.encode()
+    return value.to_bytes((value.bit_length() + 7) // 8 or 1, "big")
+
+
+def _encode_address(value: Any) -> bytes:
+    if value is None:
+        raise ValueError("Missing value for field of type `address`")
+    address = _to_bytes(value)
+    if len(address) != 20:
+        raise ValueError(f"Invalid address: {value!r}")
+    return b"\x00" * 12 + address
+
+
+def _encode_bool(value: Any) -> bytes:
+    if value is None:
+        raise ValueError("Missing value for field of type `bool`")
+    return _ZERO_WORD[:31] + (b"\x01" if value else b"\x00")
+
+
+def _encode_string(value: Any) -> bytes:
+    if value is None:
+        return _ZERO_WORD
+    if isinstance(value, int):
+        return keccak(_to_bytes(value))
+    return keccak(value.encode())
+
+
+def _encode_bytes(value: Any) -> bytes:
+    if value is None:
+        return _ZERO_WORD
+    return keccak(_to_bytes(value))
+
+
+def _encode_fixed_bytes(value: Any) -> bytes:
+    if value is None:
+        raise ValueError("Missing value for field of fixed-size bytes type")
+    return _to_bytes(value).ljust(32, b"\x00")
+
+
+def _int_encoder(type_: str, *, bits: int, signed: bool) -> FieldEncoder:
+    low, high = (-(2 ** (bits - 1)), 2 ** (bits - 1)) if signed else (0, 2**bits)
+
+    def encode_int(value: Any) -> bytes:
+        if value is None:
+            raise ValueError(f"Missing value for field of type `{type_}`")
+        if isinstance(value, str):
+            value = int(value, 16) if value[:2] in ("0x", "0X") else int(value)
+        if not low <= value < high:
+            raise ValueError(f"Value {value} out of range for type `{type_}`")
+        return value.to_bytes(32, "big", signed=signed)
+
+    return encode_int
@@ -29,3 +29,7 @@ class ErrInvalidSide(Error):
 
 class ErrDecimalPlaces(Error):
     """Raised when the provided value has too many decimal places."""
+
+
+class ErrStream(Error):
+    """Raised when the market data stream reports an error."""
@@ -0,0 +1,275 @@
+import json
+import mmap
+import os
+import threading
+from bisect import bisect_left, bisect_right, insort
+from decimal import Decimal
+from itertools import accumulate
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from orbs_orderbook.client import OrderBookSDK
+from orbs_orderbook.order_book import PRICE_SCALE, SIZE_SCALE
+from orbs_orderbook.types import OrderResponse, _parse_to_class
+from orbs_orderbook.utils import from_fixed, json_loads, to_fixed
+
+Amount = Union[Decimal, str, int]
+
+
+class _SymbolFills:
+    """Fill events of one symbol, sorted by time, as fixed-point deltas.
+
+    Each event is the change in filled size of one order. Running position and
+    quote totals are rebuilt lazily, once per change, for O(log n) queries.
+    """
+
+    def __init__(self) -> None:
+        # (timestamp, sequence, base delta, quote delta, order id)
+        self.events: List[Tuple[str, int, int, int, str]] = []
+        self._times: Optional[List[str]] = None
+        self._positions: Optional[List[int]] = None
+        self._quotes: Optional[List[int]] = None
+
+    def add(self, event: Tuple[str, int, int, int, str]) -> None:
+        insort(self.events, event)
+        self._times = self._positions = self._quotes = None
+
+    def count(self, until: Optional[str]) -> int:
+        if until is None:
+            return len(self.events)
+        if self._times is None:
+            self._times = [event[0] for event in self.events]
+        return bisect_right(self._times, until)
+
+    def totals(self, until: Optional[str]) -> Tuple[int, int]:
+        count = self.count(until)
+        if not count:
+            return 0, 0
+        if self._positions is None:
+            self._positions = list(accumulate(event[2] for event in self.events))
+            self._quotes = list(accumulate(event[3] for event in self.events))
+        return self._positions[count - 1], self._quotes[count - 1]
+
+
+class FillStore:
+    """Local append-only store of filled orders, keyed by order id.
+
+    Every record is appended to `path` as one JSON line and never rewritten;
+    the latest record of an order wins. On open, the file is memory-mapped and
+    replayed, so the store survives restarts. A partially written last line
+    (e.g. after a crash) is discarded.
+
+    Fills are indexed by symbol and record timestamp. Positions are net base
+    token amounts (buys positive), and quote totals are net quote token amounts
+    (sells positive).
+
+    Usage:
+        store = FillStore("fills.jsonl")
+        store.position("MATIC-USDC")
+        store.pnl("MATIC-USDC", mark_price="0.86")
+    """
+
+    def __init__(self, path: Optional[str] = None, *, fsync: bool = False) -> None:
+        """
+        Args:
+            path (optional): File to persist to. In-memory only when None.
+            fsync (optional): fsync the file after every append.
+        """
+        self.path = path
+        self.fsync = fsync
+        self._latest: Dict[str, OrderResponse] = {}
+        self._filled: Dict[str, int] = {}
+        self._symbols: Dict[str, _SymbolFills] = {}
+        self._sequence = 0
+        self._lock = threading.RLock()
+        self._file = None
+        if path is not None:
+            self._replay(path)
+            self._file = open(path, "ab")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self) -> "FillStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._latest)
+
+    def __contains__(self, order_id: object) -> bool:
+        return order_id in self._latest
+
+    def get(self, order_id: str) -> Optional[OrderResponse]:
+        """Latest record of an order, or None if it has no fills."""
+        return self._latest.get(order_id)
+
+    def is_seen(self, record: OrderResponse) -> bool:
+        """Whether `record` is already stored with the same filled size."""
+        return self._filled.get(record.order_id) == to_fixed(
+            record.filled_size, SIZE_SCALE
+        )
+
+    def append(self, records: Iterable[OrderResponse]) -> List[OrderResponse]:
+        """Store records, oldest first, skipping ones already seen.
+
+        Returns:
+            The records that were stored
+        """
+        with self._lock:
+            stored = [record for record in records if self._apply(record)]
+            if stored and self._file is not None:
+                self._file.write(
+                    b"".join(
+                        json.dumps(
+                            record.to_camelcase_dict(), separators=(",", ":")
+                        ).encode()
+                        + b"\n"
+                        for record in stored
+                    )
+                )
+                self._file.flush()
+                if self.fsync:
+                    os.fsync(self._file.fileno())
+            return stored
+
+    def symbols(self) -> List[str]:
+        return sorted(self._symbols)
+
+    def fills(
+        self,
+        symbol: str,
+        *,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> List[OrderResponse]:
+        """Latest records of orders of `symbol` filled in [since, until].
+
+        `since` and `until` are timestamps in the API's format, e.g.
+        "2023-11-01T10:00:00Z".
+        """
+        with self._lock:
+            fills = self._symbols.get(symbol)
+            if fills is None:
+                return []
+            start = bisect_left(fills.events, (since,)) if since is not None else 0
+            end = fills.count(until)
+            order_ids = dict.fromkeys(event[4] for event in fills.events[start:end])
+            return [self._latest[order_id] for order_id in order_ids]
+
+    def position(self, symbol: str, *, until: Optional[str] = None) -> Decimal:
+        """Net base token amount bought (negative if sold) up to `until`."""
+        return from_fixed(self._totals(symbol, until)[0], SIZE_SCALE)
+
+    def quote_total(self, symbol: str, *, until: Optional[str] = None) -> Decimal:
+        """Net quote token amount received (negative if spent) up to `until`."""
+        return from_fixed(self._totals(symbol, until)[1], PRICE_SCALE + SIZE_SCALE)
+
+    def pnl(
+        self, symbol: str, mark_price: Amount, *, until: Optional[str] = None
+    ) -> Decimal:
+        """Profit and loss in the quote token, with the position valued at `mark_price`."""
+        position, quote = self._totals(symbol, until)
+        value = position * to_fixed(str(mark_price), PRICE_SCALE) + quote
+        return from_fixed(value, PRICE_SCALE + SIZE_SCALE)
+
+    def _totals(self, symbol: str, until: Optional[str]) -> Tuple[int, int]:
+        with self._lock:
+            fills = self._symbols.get(symbol)
+            return fills.totals(until) if fills is not None else (0, 0)
+
+    def _apply(self, record: OrderResponse) -> bool:
+        filled = to_fixed(record.filled_size, SIZE_SCALE)
+        previous = self._filled.get(record.order_id)
+        if previous == filled:
+            return False
+
+        delta = filled - (previous or 0)
+        if record.side == "sell":
+            delta = -delta
+        self._sequence += 1
+        self._symbols.setdefault(record.symbol, _SymbolFills()).add(
+            (
+                record.timestamp or "",
+                self._sequence,
+                delta,
+                -delta * to_fixed(record.price, PRICE_SCALE),
+                record.order_id,
+            )
+        )
+        self._filled[record.order_id] = filled
+        self._latest[record.order_id] = record
+        return True
+
+    def _replay(self, path: str) -> None:
+        try:
+            size = os.path.getsize(path)
+        except FileNotFoundError:
+            return
+        if not size:
+            return
+
+        with open(path, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as data:
+            end = data.rfind(b"\n") + 1
+            start = 0
+            while start < end:
+                newline = data.find(b"\n", start, end)
+                self._apply(
+                    _parse_to_class(OrderResponse, json_loads(data[start:newline]))
+                )
+                start = newline + 1
+
+        if end < size:
+            # Drop a partially written record
+            with open(path, "r+b") as f:
+                f.truncate(end)
+
+
+class FillSync:
+    """Keeps a `FillStore` up to date with `get_filled_orders_for_user`.
+
+    Filled orders are listed newest first, so each `sync` fetches pages only
+    until it reaches a record already in the store. The cost of a pass is
+    proportional to the number of new fills, not the length of the history.
+
+    Usage:
+        with FillStore("fills.jsonl") as store:
+            new_fills = FillSync(client, store).sync()
+    """
+
+    def __init__(
+        self, sdk: OrderBookSDK, store: FillStore, *, page_size: int = 100
+    ) -> None:
+        self.sdk = sdk
+        self.store = store
+        self.page_size = page_size
+
+    def sync(self) -> List[OrderResponse]:
+        """Fetch and store fills newer than the ones already stored.
+
+        Returns:
+            The new fills, oldest first
+        """
+        new: List[OrderResponse] = []
+        page = 1
+        while True:
+            response = self.sdk.get_filled_orders_for_user(page, self.page_size)
+            reached_seen = False
+            for record in response.data:
+                if self.store.is_seen(record):
+                    reached_seen = True
+                    break
+                new.append(record)
+            if reached_seen or not response.data or page >= response.total_pages:
+                break
+            page += 1
+
+        # Records can shift to a later page while paging, so duplicates are
+        # dropped by the store.
+        return self.store.append(reversed(new))
@@ -0,0 +1,233 @@
+import threading
+from collections import Counter
+from typing import Any, Dict, Optional
+
+from orbs_orderbook.types import RequestAttempt, RequestEvent
+
+PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+class Observer:
+    """Receives instrumentation events from `OrderBookSDK`, `AsyncOrderBookSDK` and `OrderSigner`.
+
+    Subclass it and override the events you need; the default implementations
+    do nothing. Clients and signers without an observer skip instrumentation
+    entirely. Events are delivered synchronously on the thread (or event loop)
+    that made the request, so observers should be quick and thread-safe.
+    """
+
+    def on_request(self, event: RequestEvent) -> None:
+        """Called after every HTTP request, successful or not."""
+
+    def on_attempt(self, attempt: RequestAttempt) -> None:
+        """Called after every attempt made by a `RetryPolicy`."""
+
+    def on_decode(self, type_name: str, seconds: float) -> None:
+        """Called after a JSON response is decoded into a `type_name` instance."""
+
+    def on_sign(self, stage: str, seconds: float, count: int) -> None:
+        """Called after a signing stage ("construct", "encode", "sign" or "sign_orders") for `count` orders."""
+
+
+class Histogram:
+    """Log-linear histogram with bounded relative error, in the style of HdrHistogram.
+
+    Values are scaled by `scale` and rounded to integers (the default records
+    seconds with microsecond resolution). Integers below `2 * 10**significant_figures`
+    are counted exactly; above that, each power of two is split into the same
+    number of buckets, so every recorded value is within
+    `10**-significant_figures` of the value reported for it. Memory is
+    proportional to the number of distinct buckets used.
+    """
+
+    def __init__(self, *, scale: float = 1e6, significant_figures: int = 2) -> None:
+        self.scale = scale
+        self._sub_bucket_bits = (2 * 10**significant_figures - 1).bit_length()
+        self._sub_bucket_count = 1 << self._sub_bucket_bits
+        self._half = self._sub_bucket_count // 2
+        self._counts: Dict[int, int] = {}
+        self._count = 0
+        self._total = 0
+        self._min: Optional[int] = None
+        self._max: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def record(self, value: float) -> None:
+        scaled = max(0, round(value * self.scale))
+        index = self._index(scaled)
+        with self._lock:
+            self._counts[index] = self._counts.get(index, 0) + 1
+            self._count += 1
+            self._total += scaled
+            if self._min is None or scaled < self._min:
+                self._min = scaled
+            if self._max is None or scaled > self._max:
+                self._max = scaled
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """Value at or below which `percentile` % of the recorded values fall."""
+        with self._lock:
+            if not self._count:
+                return None
+            rank = max(1, -(-self._count * percentile // 100))
+            seen = 0
+            for index in sorted(self._counts):
+                seen += self._counts[index]
+                if seen >= rank:
+                    value = min(self._highest_equivalent(index), self._max)
+                    return value / self.scale
+        return self._max / self.scale
+
+    def merge(self, other: "Histogram") -> None:
+        """Add the values recorded by `other`, which must use the same settings."""
+        with other._lock:
+            counts = dict(other._counts)
+            count, total = other._count, other._total
+            low, high = other._min, other._max
+        with self._lock:
+            for index, n in counts.items():
+                self._counts[index] = self._counts.get(index, 0) + n
+            self._count += count
+            self._total += total
+            if low is not None:
+                self._min = low if self._min is None else min(self._min, low)
+                self._max = high if self._max is None else max(self._max, high)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+            self._count = self._total = 0
+            self._min = self._max = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Count, min, max, mean and `PERCENTILES` of the recorded values."""
+        with self._lock:
+            count, total, low, high = self._count, self._total, self._min, self._max
+        snapshot: Dict[str, Any] = {"count": count}
+        if not count:
+            return snapshot
+        snapshot["min"] = low / self.scale
+        snapshot["max"] = high / self.scale
+        snapshot["mean"] = total / count / self.scale
+        for p in PERCENTILES:
+            snapshot[f"p{p:g}"] = self.percentile(p)
+        return snapshot
+
+    def _index(self, value: int) -> int:
+        if value < self._sub_bucket_count:
+            return value
+        shift = value.bit_length() - self._sub_bucket_bits
+        return (shift + 1) * self._half + (value >> shift) - self._half
+
+    def _highest_equivalent(self, index: int) -> int:
+        if index < self._sub_bucket_count:
+            return index
+        shift = index // self._half - 1
+        sub_bucket = index - shift * self._half
+        return ((sub_bucket + 1) << shift) - 1
+
+
+def route(endpoint: str) -> str:
+    """Endpoint with ids and symbols replaced, e.g. "api/v1/order/{id}"."""
+    parts = endpoint.split("?", 1)[0].split("/")
+    return "/".join(
+        part if i < 3 or part == "client-order" else "{id}"
+        for i, part in enumerate(parts)
+    )
+
+
+class MetricsObserver(Observer):
+    """Observer that aggregates events into histograms and counters in memory.
+
+    Requests are grouped by method and `route`. Use `snapshot()` to export
+    the current metrics as a JSON-serializable dict.
+
+    Usage:
+        metrics = MetricsObserver()
+        client = OrderBookSDK(BASE_URL, API_KEY, observer=metrics)
+        ...
+        print(json.dumps(metrics.snapshot(reset=True)))
+    """
+
+    def __init__(self, *, significant_figures: int = 2) -> None:
+        self.significant_figures = significant_figures
+        self._histograms: Dict[str, Dict[str, Histogram]] = {}
+        self._status_codes: Dict[str, Counter] = {}
+        self._retries: Counter = Counter()
+        self._hedged: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def on_request(self, event: RequestEvent) -> None:
+        name = f"{event.method} {route(event.endpoint)}"
+        self._record("requests", name, event.latency)
+        if event.time_to_headers is not None:
+            self._record("time_to_headers", name, event.time_to_headers)
+        self._record("request_bytes", name, event.request_bytes, scale=1)
+        if event.response_bytes is not None:
+            self._record("response_bytes", name, event.response_bytes, scale=1)
+        status = event.status_code or type(event.error).__name__
+        with self._lock:
+            self._status_codes.setdefault(name, Counter())[str(status)] += 1
+
+    def on_attempt(self, attempt: RequestAttempt) -> None:
+        name = f"{attempt.method} {route(attempt.endpoint)}"
+        with self._lock:
+            if attempt.attempt > 1:
+                self._retries[name] += 1
+            if attempt.hedged:
+                self._hedged[name] += 1
+
+    def on_decode(self, type_name: str, seconds: float) -> None:
+        self._record("decode", type_name, seconds)
+
+    def on_sign(self, stage: str, seconds: float, count: int) -> None:
+        self._record("sign", stage, seconds / max(1, count))
+
+    def histogram(self, kind: str, name: str) -> Optional[Histogram]:
+        """Histogram of `kind` ("requests", "time_to_headers", "request_bytes",
+        "response_bytes", "decode" or "sign") for `name`, if anything was recorded."""
+        return self._histograms.get(kind, {}).get(name)
+
+    def snapshot(self, *, reset: bool = False) -> Dict[str, Any]:
+        """Current metrics as nested dicts of plain values.
+
+        Args:
+            reset (optional): Start counting from zero after taking the snapshot,
+                for per-interval exports.
+        """
+        with self._lock:
+            histograms = {
+                kind: dict(by_name) for kind, by_name in self._histograms.items()
+            }
+            snapshot: Dict[str, Any] = {
+                kind: {name: h.snapshot() for name, h in by_name.items()}
+                for kind, by_name in histograms.items()
+            }
+            snapshot["status_codes"] = {
+                name: dict(counts) for name, counts in self._status_codes.items()
+            }
+            snapshot["retries"] = dict(self._retries)
+            snapshot["hedged"] = dict(self._hedged)
+            if reset:
+                self._histograms = {}
+                self._status_codes = {}
+                self._retries = Counter()
+                self._hedged = Counter()
+        return snapshot
+
+    def _record(self, kind: str, name: str, value: float, scale: float = 1e6) -> None:
+        by_name = self._histograms.get(kind)
+        histogram = by_name.get(name) if by_name is not None else None
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(kind, {}).setdefault(
+                    name,
+                    Histogram(
+                        scale=scale, significant_figures=self.significant_figures
+                    ),
+                )
+        histogram.record(value)
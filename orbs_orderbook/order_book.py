@@ -0,0 +1,345 @@
+import logging
+import threading
+import time
+from bisect import bisect_left, insort
+from decimal import Decimal
+from itertools import accumulate
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from orbs_orderbook.client import OrderBookSDK
+from orbs_orderbook.depth import PRICE_SCALE
+from orbs_orderbook.utils import from_fixed, to_fixed
+
+Amount = Union[Decimal, str, int]
+
+SIZE_SCALE = 18
+
+logger = logging.getLogger(__name__)
+
+
+class _BookSide:
+    """Price levels of one side, best first, as fixed-point integers.
+
+    Levels are kept sorted by `key` (the price for asks, the negated price for
+    bids), so the best level is always at index 0. Cumulative sizes and
+    notionals are rebuilt lazily, once per change, for O(log n) queries.
+    """
+
+    def __init__(self, sign: int) -> None:
+        self.sign = sign
+        self.keys: List[int] = []
+        self.sizes: Dict[int, int] = {}
+        # Size strings as received, by key, to skip parsing unchanged levels
+        self.raw: Dict[int, str] = {}
+        # Parsed price strings. The same price may be written differently
+        # (e.g. "0.80" and "0.8"), so levels are identified by key only
+        self._price_keys: Dict[str, int] = {}
+        self._cum_sizes: Optional[List[int]] = None
+        self._cum_notionals: Optional[List[int]] = None
+
+    def apply(self, levels: Iterable[Sequence[str]]) -> int:
+        previous_keys, self._price_keys = self._price_keys, {}
+        current: Dict[int, str] = {}
+        for price, size in levels:
+            key = previous_keys.get(price)
+            if key is None:
+                key = self.sign * to_fixed(price, PRICE_SCALE)
+            self._price_keys[price] = key
+            current[key] = size
+
+        changed = 0
+        for key, size in current.items():
+            if self.raw.get(key) != size:
+                changed += self._set(key, size, to_fixed(size, SIZE_SCALE))
+
+        for key in self.raw.keys() - current.keys():
+            self._remove(key)
+            changed += 1
+
+        if changed:
+            self._cum_sizes = self._cum_notionals = None
+        return changed
+
+    def update(self, levels: Iterable[Sequence[str]]) -> int:
+        """Set the size of individual levels; a size of zero removes the level."""
+        changed = 0
+        for price, size in levels:
+            key = self._price_keys.get(price)
+            if key is None:
+                key = self._price_keys[price] = self.sign * to_fixed(price, PRICE_SCALE)
+            if self.raw.get(key) == size:
+                continue
+            size_fixed = to_fixed(size, SIZE_SCALE)
+            if size_fixed:
+                changed += self._set(key, size, size_fixed)
+            elif key in self.sizes:
+                self._remove(key)
+                del self._price_keys[price]
+                changed += 1
+
+        if changed:
+            self._cum_sizes = self._cum_notionals = None
+        return changed
+
+    def _set(self, key: int, size: str, size_fixed: int) -> int:
+        """Set a level's size. Returns 1 if the level changed, 0 otherwise."""
+        self.raw[key] = size
+        # The same size may be written differently, e.g. "40" and "40.0"
+        if self.sizes.get(key) == size_fixed:
+            return 0
+        if key not in self.sizes:
+            insort(self.keys, key)
+        self.sizes[key] = size_fixed
+        return 1
+
+    def _remove(self, key: int) -> None:
+        if key in self.sizes:
+            del self.keys[bisect_left(self.keys, key)]
+            del self.sizes[key]
+            del self.raw[key]
+
+    def best(self) -> Optional[Tuple[int, int]]:
+        if not self.keys:
+            return None
+        key = self.keys[0]
+        return self.sign * key, self.sizes[key]
+
+    def cumulative(self) -> Tuple[List[int], List[int]]:
+        if self._cum_sizes is None:
+            sizes = [self.sizes[k] for k in self.keys]
+            self._cum_sizes = list(accumulate(sizes))
+            self._cum_notionals = list(
+                accumulate(self.sign * k * s for k, s in zip(self.keys, sizes))
+            )
+        return self._cum_sizes, self._cum_notionals
+
+
+class LocalOrderBook:
+    """Local mirror of one symbol's order book.
+
+    Market depth snapshots are applied by diffing them against the current
+    levels, so only levels that changed are parsed. Prices and sizes are held
+    as fixed-point integers and converted to `Decimal` only in query results.
+
+    `side` arguments are the book side: "bids" or "asks".
+
+    Usage:
+        book = LocalOrderBook("MATIC-USDC")
+        book.apply_snapshot(asks=depth.asks, bids=depth.bids)
+        book.vwap("asks", "1000")  # average price to buy 1000 MATIC
+    """
+
+    def __init__(self, symbol: str) -> None:
+        self.symbol = symbol
+        self.time: Optional[int] = None
+        self._sides = {"asks": _BookSide(1), "bids": _BookSide(-1)}
+        self._lock = threading.RLock()
+
+    def apply_snapshot(
+        self,
+        *,
+        asks: Iterable[Sequence[str]],
+        bids: Iterable[Sequence[str]],
+        time: Optional[int] = None,
+    ) -> int:
+        """Replace the book with a market depth snapshot.
+
+        Args:
+            asks: [price, size] levels, as returned by `get_market_depth`.
+            bids: [price, size] levels, as returned by `get_market_depth`.
+            time (optional): Snapshot time.
+
+        Returns:
+            Number of levels added, removed or resized
+        """
+        with self._lock:
+            changed = self._sides["asks"].apply(asks) + self._sides["bids"].apply(bids)
+            self.time = time
+            return changed
+
+    def apply_update(
+        self,
+        *,
+        asks: Iterable[Sequence[str]] = (),
+        bids: Iterable[Sequence[str]] = (),
+        time: Optional[int] = None,
+    ) -> int:
+        """Change individual levels, e.g. from a market data stream update.
+
+        Args:
+            asks (optional): [price, size] levels to set. Size "0" removes the level.
+            bids (optional): [price, size] levels to set. Size "0" removes the level.
+            time (optional): Update time.
+
+        Returns:
+            Number of levels added, removed or resized
+        """
+        with self._lock:
+            changed = self._sides["asks"].update(asks) + self._sides["bids"].update(
+                bids
+            )
+            if time is not None:
+                self.time = time
+            return changed
+
+    def best_bid(self) -> Optional[Tuple[Decimal, Decimal]]:
+        """Highest bid as (price, size), or None if there are no bids."""
+        return self._best("bids")
+
+    def best_ask(self) -> Optional[Tuple[Decimal, Decimal]]:
+        """Lowest ask as (price, size), or None if there are no asks."""
+        return self._best("asks")
+
+    def mid(self) -> Optional[Decimal]:
+        with self._lock:
+            bid, ask = self._sides["bids"].best(), self._sides["asks"].best()
+        if bid is None or ask is None:
+            return None
+        return from_fixed(bid[0] + ask[0], PRICE_SCALE) / 2
+
+    def spread(self) -> Optional[Decimal]:
+        with self._lock:
+            bid, ask = self._sides["bids"].best(), self._sides["asks"].best()
+        if bid is None or ask is None:
+            return None
+        return from_fixed(ask[0] - bid[0], PRICE_SCALE)
+
+    def levels(self, side: str) -> List[Tuple[Decimal, Decimal]]:
+        """All levels of a side as (price, size), best first."""
+        with self._lock:
+            book_side = self._sides[side]
+            return [
+                (
+                    from_fixed(book_side.sign * k, PRICE_SCALE),
+                    from_fixed(book_side.sizes[k], SIZE_SCALE),
+                )
+                for k in book_side.keys
+            ]
+
+    def cumulative_size(self, side: str, levels: int) -> Decimal:
+        """Total size of the best `levels` levels of a side."""
+        with self._lock:
+            cum_sizes, _ = self._sides[side].cumulative()
+        if levels <= 0 or not cum_sizes:
+            return from_fixed(0, SIZE_SCALE)
+        return from_fixed(cum_sizes[min(levels, len(cum_sizes)) - 1], SIZE_SCALE)
+
+    def price_for_size(self, side: str, size: Amount) -> Optional[Decimal]:
+        """Worst price reached when taking `size` from a side.
+
+        Returns None if the side is not deep enough.
+        """
+        with self._lock:
+            book_side = self._sides[side]
+            cum_sizes, _ = book_side.cumulative()
+            index = bisect_left(cum_sizes, to_fixed(str(size), SIZE_SCALE))
+            if index == len(cum_sizes):
+                return None
+            return from_fixed(book_side.sign * book_side.keys[index], PRICE_SCALE)
+
+    def vwap(self, side: str, size: Amount) -> Optional[Decimal]:
+        """Volume-weighted average price of taking `size` from a side.
+
+        Returns None if `size` is not positive or the side is not deep enough.
+        """
+        size_fixed = to_fixed(str(size), SIZE_SCALE)
+        if size_fixed <= 0:
+            return None
+
+        with self._lock:
+            book_side = self._sides[side]
+            cum_sizes, cum_notionals = book_side.cumulative()
+            index = bisect_left(cum_sizes, size_fixed)
+            if index == len(cum_sizes):
+                return None
+
+            filled, notional = 0, 0
+            if index:
+                filled, notional = cum_sizes[index - 1], cum_notionals[index - 1]
+            price = book_side.sign * book_side.keys[index]
+            notional += price * (size_fixed - filled)
+
+        return from_fixed(notional, PRICE_SCALE) / size_fixed
+
+    def _best(self, side: str) -> Optional[Tuple[Decimal, Decimal]]:
+        with self._lock:
+            best = self._sides[side].best()
+        if best is None:
+            return None
+        return from_fixed(best[0], PRICE_SCALE), from_fixed(best[1], SIZE_SCALE)
+
+
+class OrderBookPoller:
+    """Keeps `LocalOrderBook`s up to date by polling `get_market_depth`.
+
+    Polls every symbol once per `interval` seconds on a background thread.
+    `on_update` is called with the book after every snapshot that changed it,
+    and `on_error` with any exception raised while polling. Without
+    `on_error`, errors on the background thread are logged to this module's
+    logger and polling carries on.
+
+    Usage:
+        poller = OrderBookPoller(client, ["MATIC-USDC"], interval=0.5).start()
+        poller.books["MATIC-USDC"].mid()
+        poller.stop()
+    """
+
+    def __init__(
+        self,
+        sdk: OrderBookSDK,
+        symbols: Sequence[str],
+        *,
+        interval: float = 1.0,
+        limit: int = 100,
+        on_update: Optional[Callable[[LocalOrderBook], None]] = None,
+        on_error: Optional[Callable[[Exception], None]] = None,
+    ) -> None:
+        self.sdk = sdk
+        self.interval = interval
+        self.limit = limit
+        self.on_update = on_update
+        self.on_error = on_error
+        self.books = {symbol: LocalOrderBook(symbol) for symbol in symbols}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "OrderBookPoller":
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="orderbook-poller", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def poll_once(self) -> None:
+        """Fetch and apply one snapshot for every symbol."""
+        for symbol, book in self.books.items():
+            try:
+                data = self.sdk.get_market_depth(symbol, self.limit).data
+                changed = book.apply_snapshot(
+                    asks=data.asks, bids=data.bids, time=data.time
+                )
+            except Exception as err:
+                if self.on_error is None:
+                    raise
+                self.on_error(err)
+                continue
+            if changed and self.on_update:
+                self.on_update(book)
+
+    def _run(self) -> None:
+        next_poll = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                self.poll_once()
+            except Exception:
+                # Only raised without `on_error`; keep polling
+                logger.exception("Polling market depth failed")
+            next_poll += self.interval
+            self._stop.wait(max(0.0, next_poll - time.monotonic()))
@@ -0,0 +1,194 @@
+import threading
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from orbs_orderbook.client import OrderBookSDK
+from orbs_orderbook.order_signer import OrderSigner
+from orbs_orderbook.presign import PresignedOrderPool, QuoteKey, quote_key
+from orbs_orderbook.types import (
+    CreateOrderInput,
+    OrderWithSignature,
+    Quote,
+    RequoteResult,
+)
+
+
+class OrderManager:
+    """Keeps the open orders of each symbol equal to a desired set of quotes.
+
+    `requote` diffs the desired quotes against the orders this manager placed
+    and is still tracking. Unchanged quotes are left alone, orders that are no
+    longer wanted are cancelled by client order id, and new quotes are signed
+    before any request is sent, then created in batches. A requote that
+    changes nothing sends no requests and signs nothing. With a
+    `PresignedOrderPool`, new quotes are taken from the pool when it has them
+    and only the rest are signed.
+
+    Orders that fill or are cancelled elsewhere stay tracked until a cancel
+    for them fails with 404 or `reconcile` is called.
+
+    Usage:
+        manager = OrderManager(client, signer)
+        manager.requote("MATIC-USDC", [Quote("buy", "0.85", "100"), Quote("sell", "0.87", "100")])
+    """
+
+    def __init__(
+        self,
+        sdk: OrderBookSDK,
+        signer: OrderSigner,
+        *,
+        order_ttl: timedelta = timedelta(days=1),
+        max_in_flight: int = 8,
+        pool: Optional[PresignedOrderPool] = None,
+    ) -> None:
+        """
+        Args:
+            sdk: Client to send requests with.
+            signer: Signer for new orders.
+            order_ttl (optional): How long signatures of new orders are valid for.
+            max_in_flight (optional): Maximum number of concurrent requests.
+            pool (optional): Pool to take pre-signed orders from.
+        """
+        self.sdk = sdk
+        self.signer = signer
+        self.order_ttl = order_ttl
+        self.max_in_flight = max_in_flight
+        self.pool = pool
+        self._orders: Dict[str, Dict[str, Quote]] = {}
+        self._lock = threading.Lock()
+
+    def orders(self, symbol: str) -> Dict[str, Quote]:
+        """Tracked open orders of `symbol`, by client order id."""
+        with self._lock:
+            return dict(self._orders.get(symbol, {}))
+
+    def requote(self, symbol: str, quotes: Iterable[Quote]) -> RequoteResult:
+        """Make the open orders of `symbol` match `quotes`.
+
+        Cancels are sent before creates, so the book never holds both the old
+        and the new quotes at once.
+
+        Returns:
+            Created orders, cancelled client order ids, the number of quotes left
+            in place, and the cancels and creates that failed
+
+        Raises:
+            Same as `OrderSigner.sign_orders`, before any request is sent.
+        """
+        to_cancel, to_create, unchanged = self._diff(symbol, quotes)
+        signed = self._sign(symbol, to_create)
+
+        cancelled, failed_cancels = self._cancel(symbol, to_cancel)
+
+        created, failed_creates = [], []
+        if signed:
+            res = self.sdk.create_orders_bulk(signed, max_in_flight=self.max_in_flight)
+            created, failed_creates = res.created, res.failed
+            failed_ids = {
+                o.order.client_order_id for chunk in res.failed for o in chunk.orders
+            }
+            with self._lock:
+                tracked = self._orders.setdefault(symbol, {})
+                for o in signed:
+                    if o.order.client_order_id not in failed_ids:
+                        tracked[o.order.client_order_id] = Quote(
+                            side=o.order.side, price=o.order.price, size=o.order.size
+                        )
+
+        return RequoteResult(
+            symbol=symbol,
+            created=created,
+            cancelled=cancelled,
+            unchanged=unchanged,
+            failed_cancels=failed_cancels,
+            failed_creates=failed_creates,
+        )
+
+    def reconcile(self, symbol: Optional[str] = None) -> List[str]:
+        """Stop tracking orders that are no longer open on the server.
+
+        Returns:
+            Client order ids that were dropped
+        """
+        with self.sdk.iter_orders_for_user() as open_orders:
+            open_ids = {o.client_order_id for o in open_orders if not o.cancelled}
+
+        dropped = []
+        with self._lock:
+            symbols = [symbol] if symbol is not None else list(self._orders)
+            for s in symbols:
+                tracked = self._orders.get(s, {})
+                for client_order_id in [i for i in tracked if i not in open_ids]:
+                    del tracked[client_order_id]
+                    dropped.append(client_order_id)
+        return dropped
+
+    def _diff(
+        self, symbol: str, quotes: Iterable[Quote]
+    ) -> Tuple[List[str], List[Quote], int]:
+        wanted = Counter()
+        new_quotes: Dict[QuoteKey, Quote] = {}
+        for quote in quotes:
+            key = quote_key(quote)
+            wanted[key] += 1
+            new_quotes.setdefault(key, quote)
+
+        to_cancel = []
+        unchanged = 0
+        with self._lock:
+            for client_order_id, quote in self._orders.get(symbol, {}).items():
+                key = quote_key(quote)
+                if wanted[key]:
+                    wanted[key] -= 1
+                    unchanged += 1
+                else:
+                    to_cancel.append(client_order_id)
+
+        to_create = [new_quotes[key] for key, n in wanted.items() for _ in range(n)]
+        return to_cancel, to_create, unchanged
+
+    def _sign(self, symbol: str, quotes: Sequence[Quote]) -> List[OrderWithSignature]:
+        if not quotes:
+            return []
+        if self.pool is not None:
+            taken = [self.pool.take(symbol, quote) for quote in quotes]
+            quotes = [q for q, order in zip(quotes, taken) if order is None]
+            presigned = [order for order in taken if order is not None]
+            if not quotes:
+                return presigned
+        else:
+            presigned = []
+
+        orders = [
+            CreateOrderInput(
+                price=quote.price,
+                size=quote.size,
+                symbol=symbol,
+                side=quote.side,
+                client_order_id=str(uuid.uuid4()),
+            )
+            for quote in quotes
+        ]
+        return presigned + self.signer.sign_orders(
+            orders, deadline=datetime.now() + self.order_ttl
+        )
+
+    def _cancel(
+        self, symbol: str, client_order_ids: Sequence[str]
+    ) -> Tuple[List[str], Dict[str, Exception]]:
+        if not client_order_ids:
+            return [], {}
+        res = self.sdk.cancel_orders(
+            client_ids=client_order_ids, max_in_flight=self.max_in_flight
+        )
+
+        # Orders that were not found are already filled or cancelled
+        failed = res.by_client_id.failed
+        cancelled = [i for i in client_order_ids if i not in failed]
+        with self._lock:
+            tracked = self._orders.get(symbol, {})
+            for client_order_id in cancelled:
+                tracked.pop(client_order_id, None)
+        return cancelled, failed
@@ -1,20 +1,27 @@
-import random
 import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from eth_account import Account
+from eth_keys import keys
 
 from orbs_orderbook.client import OrderBookSDK
-from orbs_orderbook.exceptions import (
-    ErrDecimalPlaces,
-    ErrInvalidSide,
-    ErrInvalidSymbolFormat,
-    ErrInvalidToken,
-)
+from orbs_orderbook.eip712 import TypedDataSchema
+from orbs_orderbook.exceptions import ErrDecimalPlaces
+from orbs_orderbook.instrumentation import Observer
+from orbs_orderbook.nonce import MonotonicNonceAllocator, NonceAllocator
 from orbs_orderbook.signer import Signer
-from orbs_orderbook.types import CreateOrderInput, EIP712Message, Token
+from orbs_orderbook.token_registry import TokenRegistry
+from orbs_orderbook.types import (
+    CreateOrderInput,
+    EIP712Message,
+    OrderWithSignature,
+    Token,
+)
 from orbs_orderbook.utils import convert_to_base_unit
 
 # 5 may 24
@@ -22,27 +29,60 @@ REACTOR_ADDRESS = os.environ.get(
     "REACTOR_ADDRESS", "0x4C4B950432189b3283A5111A6963ee318109695c"
 )
 
+# Below this many orders per worker, process start-up and IPC cost more than
+# they save, so `sign_orders` signs in-process instead
+MIN_ORDERS_PER_WORKER = 16
+
 
 class OrderSigner(Signer):
     __account: Account
+    __private_key: keys.PrivateKey
     __sdk: OrderBookSDK
 
-    def __init__(self, private_key: str, sdk: OrderBookSDK):
+    def __init__(
+        self,
+        private_key: str,
+        sdk: OrderBookSDK,
+        *,
+        observer: Optional[Observer] = None,
+        nonce_allocator: Optional[NonceAllocator] = None,
+    ):
         super().__init__()
 
         self.__account = Account.from_key(private_key)
+        self.__private_key = keys.PrivateKey(self.__account.key)
         self.__sdk = sdk
+        # Receives "construct", "encode", "sign" and "sign_orders" timings
+        self.observer = observer
+        # Default allocators each draw from their own random range, so signers
+        # for the same account (in this process or others) don't collide
+        self.nonce_allocator = nonce_allocator or MonotonicNonceAllocator()
+        self.__pool: Optional[ProcessPoolExecutor] = None
+        self.__pool_workers = 0
+        self.__pool_tokens: Optional[Dict[str, Any]] = None
+        self.__pool_lock = threading.Lock()
+        # (supported tokens dict, registry built from it), swapped as one
+        # reference so concurrent readers never see a mismatched pair
+        self.__registry: Tuple[Any, TokenRegistry] = (None, TokenRegistry())
+        # Domain and types never change, so their hashes are computed once here
+        self._schema = TypedDataSchema(
+            primary_type="RePermitWitnessTransferFrom",
+            domain_data=self._construct_domain_data(),
+            message_types=self._construct_message_types(),
+        )
 
     def prepare_and_sign_order(
         self,
         order: CreateOrderInput,
         deadline: Optional[datetime] = None,
+        nonce: Optional[int] = None,
     ) -> (str, dict):
         """Prepare EIP-712 message and sign it.
 
         Args:
             order: Order to sign.
             deadline (optional): How long the order signature is valid for.
+            nonce (optional): Order nonce. Taken from `nonce_allocator` when None.
 
         Returns:
             Tuple of signature and EIP712 message data (needed for signature validation)
@@ -55,12 +95,14 @@ class OrderSigner(Signer):
         if not deadline:
             deadline = datetime.now() + timedelta(days=1)
 
+        observer = self.observer
+        if observer is not None:
+            start = time.perf_counter()
+
         in_token, out_token = self.__get_token_details(
             symbol=order.symbol, side=order.side
         )
 
-        domain_data = self._construct_domain_data()
-        message_types = self._construct_message_types()
         message_data = self._construct_message_data(
             in_token=in_token,
             out_token=out_token,
@@ -69,24 +111,128 @@ class OrderSigner(Signer):
             side=order.side,
             signer_address=self.__account.address,
             deadline=deadline,
+            nonce=nonce,
         )
 
-        signable_message = self.encode_typed_data(
-            primary_type="RePermitWitnessTransferFrom",
-            domain_data=domain_data,
-            message_types=message_types,
-            message_data=message_data,
-        )
+        if observer is not None:
+            constructed = time.perf_counter()
+
+        signable_message = self._schema.encode(message_data)
+
+        if observer is not None:
+            encoded = time.perf_counter()
 
-        signature = self.sign_message(signable_message, self.__account.key)
+        signature = self.sign_message(signable_message, self.__private_key)
+
+        if observer is not None:
+            signed = time.perf_counter()
+            observer.on_sign("construct", constructed - start, 1)
+            observer.on_sign("encode", encoded - constructed, 1)
+            observer.on_sign("sign", signed - encoded, 1)
         eip_712_msg = EIP712Message(
-            domain_separator=domain_data,
-            message_types=message_types,
+            domain_separator=self._schema.domain_data,
+            message_types=self._schema.message_types,
             message_data=message_data,
         )
 
         return signature.signature.hex(), eip_712_msg
 
+    def sign_orders(
+        self,
+        orders: Sequence[CreateOrderInput],
+        deadline: Optional[datetime] = None,
+        workers: Optional[int] = None,
+    ) -> List[OrderWithSignature]:
+        """Validate and sign a batch of orders, in parallel worker processes.
+
+        Workers are started on first use, initialised once with the private key
+        and supported tokens, and reused by later calls until `close()`. Small
+        batches (fewer than `MIN_ORDERS_PER_WORKER` orders per worker) are
+        signed in-process.
+
+        Args:
+            orders: Orders to sign.
+            deadline (optional): How long the order signatures are valid for.
+            workers (optional): Number of worker processes. Defaults to the CPU count.
+
+        Returns:
+            Signed orders, in the same order as `orders`
+
+        Raises:
+            Same as `prepare_and_sign_order`, before any order is signed.
+        """
+        if not deadline:
+            deadline = datetime.now() + timedelta(days=1)
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if self.observer is not None:
+            start = time.perf_counter()
+            signed = self.__sign_orders(orders, deadline, workers)
+            self.observer.on_sign(
+                "sign_orders", time.perf_counter() - start, len(orders)
+            )
+            return signed
+        return self.__sign_orders(orders, deadline, workers)
+
+    def __sign_orders(
+        self,
+        orders: Sequence[CreateOrderInput],
+        deadline: datetime,
+        workers: int,
+    ) -> List[OrderWithSignature]:
+        for order in orders:
+            self.__get_token_details(symbol=order.symbol, side=order.side)
+            self._check_decimal_places(Decimal(order.price))
+
+        # Nonces are allocated here, not in the workers, so they never collide
+        nonces = self.nonce_allocator.allocate(len(orders))
+        workers = min(workers, len(orders) // MIN_ORDERS_PER_WORKER)
+        if workers <= 1:
+            return _sign_chunk(self, orders, deadline, nonces)
+
+        chunk_size = -(-len(orders) // (workers * 4))
+        starts = range(0, len(orders), chunk_size)
+        chunks = [orders[i : i + chunk_size] for i in starts]
+        chunk_nonces = [nonces[i : i + chunk_size] for i in starts]
+        deadlines = [deadline] * len(chunks)
+        # Submit while holding the lock, so another thread can't shut the pool
+        # down in between. Shutting down waits for submitted chunks.
+        with self.__pool_lock:
+            results = self.__get_pool(workers).map(
+                _sign_chunk_in_worker, chunks, deadlines, chunk_nonces
+            )
+        signed: List[OrderWithSignature] = []
+        for chunk in results:
+            signed.extend(chunk)
+        return signed
+
+    def close(self) -> None:
+        """Shut down the worker processes started by `sign_orders`."""
+        with self.__pool_lock:
+            self.__close_pool()
+
+    def __close_pool(self) -> None:
+        if self.__pool is not None:
+            self.__pool.shutdown()
+            self.__pool = None
+
+    def __get_pool(self, workers: int) -> ProcessPoolExecutor:
+        tokens = self.__token_registry().tokens
+        if self.__pool is not None and (
+            self.__pool_workers < workers or self.__pool_tokens is not tokens
+        ):
+            self.__close_pool()
+
+        if self.__pool is None:
+            self.__pool = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(self.__account.key, tokens),
+            )
+            self.__pool_workers = workers
+            self.__pool_tokens = tokens
+        return self.__pool
+
     def _construct_domain_data(self) -> Dict[str, str]:
         return {
             "name": "RePermit",
@@ -144,6 +290,7 @@ class OrderSigner(Signer):
         side: str,
         signer_address: str,
         deadline: datetime,
+        nonce: Optional[int] = None,
     ) -> Dict[str, Any]:
         price_dec = Decimal(price)
         size_dec = Decimal(size)
@@ -157,10 +304,85 @@ class OrderSigner(Signer):
         out_amount = self._calculate_out_amount(
             size=size_dec, price=price_dec, side=side, decimals=out_token.decimals
         )
-        nonce = str(random.randint(0, 2**32 - 1))
+        return self._build_message_data(
+            in_token=in_token,
+            out_token=out_token,
+            in_amount=in_amount,
+            out_amount=out_amount,
+            nonce=str(self.nonce_allocator.next() if nonce is None else nonce),
+            epoch_deadline=str(int(deadline.timestamp())),
+            signer_address=signer_address,
+        )
+
+    def construct_ladder_message_data(
+        self,
+        *,
+        symbol: str,
+        side: str,
+        prices: Sequence[str],
+        sizes: Sequence[str],
+        deadline: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        """Build EIP-712 message data for a ladder of orders on one symbol and side.
+
+        Produces the same payloads as signing each order individually, but
+        resolves tokens once and computes amounts with integer arithmetic.
+
+        Args:
+            symbol: Symbol of every order, e.g. "MATIC-USDC".
+            side: Side of every order, "buy" or "sell".
+            prices: Price of each order.
+            sizes: Size of each order.
+            deadline (optional): How long the order signatures are valid for.
+
+        Returns:
+            Message data for each order, in the order given
+
+        Raises:
+            - ErrInvalidSymbolFormat, ErrInvalidSide, ErrInvalidToken: As `prepare_and_sign_order`
+            - ErrDecimalPlaces: Raised when a price has more than 8 decimal places
+        """
+        if len(prices) != len(sizes):
+            raise ValueError("prices and sizes must have the same length")
+        if not deadline:
+            deadline = datetime.now() + timedelta(days=1)
+
+        in_token, out_token = self.__get_token_details(symbol=symbol, side=side)
+        in_amounts, out_amounts = self._calculate_ladder_amounts(
+            prices=prices,
+            sizes=sizes,
+            side=side,
+            in_decimals=in_token.decimals,
+            out_decimals=out_token.decimals,
+        )
 
         epoch_deadline = str(int(deadline.timestamp()))
+        signer_address = self.__account.address
+        nonces = self.nonce_allocator.allocate(len(in_amounts))
+        return [
+            self._build_message_data(
+                in_token=in_token,
+                out_token=out_token,
+                in_amount=in_amount,
+                out_amount=out_amount,
+                nonce=str(nonce),
+                epoch_deadline=epoch_deadline,
+                signer_address=signer_address,
+            )
+            for in_amount, out_amount, nonce in zip(in_amounts, out_amounts, nonces)
+        ]
 
+    def _build_message_data(
+        self,
+        *,
+        in_token: Token,
+        out_token: Token,
+        in_amount: int,
+        out_amount: int,
+        nonce: str,
+        epoch_deadline: str,
+        signer_address: str,
+    ) -> Dict[str, Any]:
         reactor = REACTOR_ADDRESS
         # reactor = "0x2Ee46d8d20020520d5266F3cAcc7c41e1AadD4C6"
         executor = "0x896D9b9Eee18F6C88C5575B78247834029375575"
@@ -193,33 +415,19 @@ class OrderSigner(Signer):
         }
 
     def __get_token_details(self, *, symbol: str, side: str) -> Tuple[Token, Token]:
-        if "-" not in symbol:
-            raise ErrInvalidSymbolFormat(
-                f"Invalid symbol format: {symbol}. Expected format 'TOKEN1-TOKEN2'."
-            )
-
-        if side not in ["buy", "sell"]:
-            raise ErrInvalidSide(f"Invalid side: {side}. Expected 'buy' or 'sell'.")
-
-        token_parts = symbol.upper().split("-")
-        if len(token_parts) != 2:
-            raise ErrInvalidSymbolFormat(
-                f"Invalid symbol format: {symbol}. Expected format 'TOKEN1-TOKEN2'."
-            )
-
-        in_token_symbol, out_token_symbol = (
-            token_parts if side == "sell" else token_parts[::-1]
-        )
-
-        in_token_dict = self.__sdk.supported_tokens.get(in_token_symbol)
-        if not in_token_dict:
-            raise ErrInvalidToken(f"Invalid 'in' token symbol: {in_token_symbol}.")
+        return self.__token_registry().resolve(symbol, side)
 
-        out_token_dict = self.__sdk.supported_tokens.get(out_token_symbol)
-        if not out_token_dict:
-            raise ErrInvalidToken(f"Invalid 'out' token symbol: {out_token_symbol}.")
+    def __token_registry(self) -> TokenRegistry:
+        tokens = self.__sdk.supported_tokens
+        if isinstance(tokens, TokenRegistry):
+            return tokens
 
-        return Token(**in_token_dict), Token(**out_token_dict)
+        # A plain dict of supported tokens: index it once, until it's replaced
+        source, registry = self.__registry
+        if tokens is not source:
+            registry = TokenRegistry(tokens)
+            self.__registry = (tokens, registry)
+        return registry
 
     def _calculate_in_amount(
         self, *, size: Decimal, price: Decimal, side: str, decimals: int
@@ -254,3 +462,135 @@ class OrderSigner(Signer):
         decimal_places = max(0, -decimal_tuple.exponent)
         if decimal_places > 8:
             raise ErrDecimalPlaces(f"Price has more than 8 decimal places: {price}")
+
+    def _calculate_ladder_amounts(
+        self,
+        *,
+        prices: Sequence[str],
+        sizes: Sequence[str],
+        side: str,
+        in_decimals: int,
+        out_decimals: int,
+    ) -> Tuple[List[int], List[int]]:
+        """Batch equivalent of `_calculate_in_amount` and `_calculate_out_amount`.
+
+        Amounts are computed on integer coefficients. Prices and sizes the fast
+        path can't represent exactly (exponents, signs, or amounts beyond the
+        28 significant digits of the default Decimal context, where the scalar
+        path rounds) go through the scalar path, so results always match it.
+        """
+        price_decimals, size_decimals = (
+            (in_decimals, out_decimals)
+            if side == "buy"
+            else (out_decimals, in_decimals)
+        )
+        # Largest coefficients for which the scalar path's Decimal arithmetic is exact
+        max_notional = 10 ** (_DECIMAL_PRECISION - price_decimals)
+        max_size = 10 ** (_DECIMAL_PRECISION - size_decimals)
+        parsed: Dict[str, Tuple[Optional[int], int]] = {}
+        price_amounts, size_amounts = [], []
+
+        for price, size in zip(prices, sizes):
+            price_coef, price_places = parsed.get(price) or _parse_plain_decimal(price)
+            size_coef, size_places = parsed.get(size) or parsed.setdefault(
+                size, _parse_plain_decimal(size)
+            )
+            if price_places > 8 or price_coef is None:
+                self._check_decimal_places(Decimal(price))
+
+            notional = (
+                price_coef * size_coef
+                if price_coef is not None and size_coef is not None
+                else None
+            )
+            if notional is None or notional >= max_notional or size_coef >= max_size:
+                price_amount, size_amount = self.__calculate_amounts_scalar(
+                    Decimal(price), Decimal(size), side, in_decimals, out_decimals
+                )
+            else:
+                price_amount = _shift(
+                    notional, price_decimals - price_places - size_places
+                )
+                size_amount = _shift(size_coef, size_decimals - size_places)
+
+            price_amounts.append(price_amount)
+            size_amounts.append(size_amount)
+
+        if side == "buy":
+            return price_amounts, size_amounts
+        return size_amounts, price_amounts
+
+    def __calculate_amounts_scalar(
+        self,
+        price: Decimal,
+        size: Decimal,
+        side: str,
+        in_decimals: int,
+        out_decimals: int,
+    ) -> Tuple[int, int]:
+        """Returns (price * size, size) amounts, in base units."""
+        in_amount = self._calculate_in_amount(
+            size=size, price=price, side=side, decimals=in_decimals
+        )
+        out_amount = self._calculate_out_amount(
+            size=size, price=price, side=side, decimals=out_decimals
+        )
+        return (in_amount, out_amount) if side == "buy" else (out_amount, in_amount)
+
+
+_DECIMAL_PRECISION = 28
+
+
+def _parse_plain_decimal(value: str) -> Tuple[Optional[int], int]:
+    """Split a plain decimal string ("123.45") into (coefficient, decimal places).
+
+    Returns (None, 0) for anything else (signs, exponents, whitespace).
+    """
+    whole, _, fraction = value.partition(".")
+    digits = whole + fraction
+    if not digits.isdigit() or not digits.isascii():
+        return None, 0
+    return int(digits), len(fraction)
+
+
+def _shift(value: int, places: int) -> int:
+    """Multiply by 10**places, truncating towards zero like int(Decimal)."""
+    if places >= 0:
+        return value * 10**places
+    return value // 10**-places
+
+
+class _TokenTable:
+    """Stands in for `OrderBookSDK` in worker processes."""
+
+    def __init__(self, supported_tokens: Dict[str, Any]) -> None:
+        self.supported_tokens = supported_tokens
+
+
+_worker_signer: Optional[OrderSigner] = None
+
+
+def _init_worker(private_key: bytes, supported_tokens: Dict[str, Any]) -> None:
+    global _worker_signer
+    _worker_signer = OrderSigner(private_key, _TokenTable(supported_tokens))
+
+
+def _sign_chunk(
+    signer: OrderSigner,
+    orders: Sequence[CreateOrderInput],
+    deadline: datetime,
+    nonces: Sequence[int],
+) -> List[OrderWithSignature]:
+    signed = []
+    for order, nonce in zip(orders, nonces):
+        signature, message = signer.prepare_and_sign_order(order, deadline, nonce)
+        signed.append(
+            OrderWithSignature(order=order, signature=signature, message=message)
+        )
+    return signed
+
+
+def _sign_chunk_in_worker(
+    orders: Sequence[CreateOrderInput], deadline: datetime, nonces: Sequence[int]
+) -> List[OrderWithSignature]:
+    return _sign_chunk(_worker_signer, orders, deadline, nonces)
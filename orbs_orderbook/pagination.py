@@ -0,0 +1,210 @@
+import asyncio
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Awaitable, Callable, Deque, List, Optional
+
+from orbs_orderbook.types import OrderResponse, OrdersForUserResponse, PageCheckpoint
+
+PageFetcher = Callable[[int, int], OrdersForUserResponse]
+AsyncPageFetcher = Callable[[int, int], Awaitable[OrdersForUserResponse]]
+
+
+class OrderPageIterator:
+    """Streams `OrderResponse` records from a paginated endpoint, one at a time.
+
+    While the current page is consumed, the next `prefetch` pages are fetched
+    concurrently. At most `prefetch + 1` pages are held in memory. Iteration
+    stops after the last page reported by the server (`total_pages`).
+
+    `checkpoint` is the position of the next record; pass it to a new iterator
+    to resume from there.
+
+    Usage:
+        with client.iter_filled_orders_for_user(page_size=100) as fills:
+            for fill in fills:
+                ...
+    """
+
+    def __init__(
+        self,
+        fetch_page: PageFetcher,
+        *,
+        page_size: int,
+        prefetch: int = 2,
+        checkpoint: Optional[PageCheckpoint] = None,
+    ) -> None:
+        self._fetch_page = fetch_page
+        self._page_size = page_size
+        self._prefetch = max(0, prefetch)
+        start = checkpoint or PageCheckpoint(page=1, index=0)
+        self._page = start.page
+        self._index = start.index
+        self._records: List[OrderResponse] = []
+        self._total_pages: Optional[int] = None
+        self._next_page = start.page
+        self._pending: Deque[Future] = deque()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._loaded = False
+
+    @property
+    def checkpoint(self) -> PageCheckpoint:
+        return PageCheckpoint(page=self._page, index=self._index)
+
+    def __iter__(self) -> "OrderPageIterator":
+        return self
+
+    def __next__(self) -> OrderResponse:
+        while not self._loaded or self._index >= len(self._records):
+            if self._loaded:
+                self._page += 1
+                self._index = 0
+            if self._total_pages is not None and self._page > self._total_pages:
+                self.close()
+                raise StopIteration
+            self._load_page()
+            if not self._records:
+                self.close()
+                raise StopIteration
+
+        record = self._records[self._index]
+        self._index += 1
+        return record
+
+    def __enter__(self) -> "OrderPageIterator":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Cancel outstanding prefetches."""
+        for future in self._pending:
+            future.cancel()
+        self._pending.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _load_page(self) -> None:
+        if self._pending:
+            response = self._pending.popleft().result()
+        else:
+            response = self._fetch_page(self._page, self._page_size)
+            self._next_page = self._page + 1
+
+        self._records = response.data
+        self._total_pages = response.total_pages
+        self._loaded = True
+        self._schedule_prefetch()
+
+    def _schedule_prefetch(self) -> None:
+        if not self._prefetch:
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._prefetch, thread_name_prefix="orderbook-pages"
+            )
+        while (
+            len(self._pending) < self._prefetch and self._next_page <= self._total_pages
+        ):
+            self._pending.append(
+                self._executor.submit(
+                    self._fetch_page, self._next_page, self._page_size
+                )
+            )
+            self._next_page += 1
+
+
+class AsyncOrderPageIterator:
+    """asyncio counterpart of `OrderPageIterator`.
+
+    Prefetches run as tasks; leave the `async with` block (or call `aclose`)
+    to cancel them when stopping before the last page.
+
+    Usage:
+        async with client.iter_filled_orders_for_user(page_size=100) as fills:
+            async for fill in fills:
+                ...
+    """
+
+    def __init__(
+        self,
+        fetch_page: AsyncPageFetcher,
+        *,
+        page_size: int,
+        prefetch: int = 2,
+        checkpoint: Optional[PageCheckpoint] = None,
+    ) -> None:
+        self._fetch_page = fetch_page
+        self._page_size = page_size
+        self._prefetch = max(0, prefetch)
+        start = checkpoint or PageCheckpoint(page=1, index=0)
+        self._page = start.page
+        self._index = start.index
+        self._records: List[OrderResponse] = []
+        self._total_pages: Optional[int] = None
+        self._next_page = start.page
+        self._pending: Deque[asyncio.Task] = deque()
+        self._loaded = False
+
+    @property
+    def checkpoint(self) -> PageCheckpoint:
+        return PageCheckpoint(page=self._page, index=self._index)
+
+    def __aiter__(self) -> "AsyncOrderPageIterator":
+        return self
+
+    async def __anext__(self) -> OrderResponse:
+        while not self._loaded or self._index >= len(self._records):
+            if self._loaded:
+                self._page += 1
+                self._index = 0
+            if self._total_pages is not None and self._page > self._total_pages:
+                self.close()
+                raise StopAsyncIteration
+            await self._load_page()
+            if not self._records:
+                self.close()
+                raise StopAsyncIteration
+
+        record = self._records[self._index]
+        self._index += 1
+        return record
+
+    async def __aenter__(self) -> "AsyncOrderPageIterator":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    def close(self) -> None:
+        """Cancel outstanding prefetches."""
+        for task in self._pending:
+            task.cancel()
+        self._pending.clear()
+
+    async def aclose(self) -> None:
+        """Cancel outstanding prefetches and wait for them to finish."""
+        pending = list(self._pending)
+        self.close()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _load_page(self) -> None:
+        if self._pending:
+            response = await self._pending.popleft()
+        else:
+            response = await self._fetch_page(self._page, self._page_size)
+            self._next_page = self._page + 1
+
+        self._records = response.data
+        self._total_pages = response.total_pages
+        self._loaded = True
+        while (
+            len(self._pending) < self._prefetch and self._next_page <= self._total_pages
+        ):
+            self._pending.append(
+                asyncio.ensure_future(
+                    self._fetch_page(self._next_page, self._page_size)
+                )
+            )
+            self._next_page += 1
@@ -0,0 +1,209 @@
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from orbs_orderbook.order_signer import OrderSigner
+from orbs_orderbook.types import CreateOrderInput, OrderWithSignature, Quote
+
+logger = logging.getLogger(__name__)
+
+QuoteKey = Tuple[str, Decimal, Decimal]
+
+
+def quote_key(quote: Quote) -> QuoteKey:
+    """Key identifying equivalent quotes: "0.80" and "0.8" are the same price."""
+    return quote.side, Decimal(quote.price).normalize(), Decimal(quote.size).normalize()
+
+
+class PresignedOrderPool:
+    """Keeps signed orders ready for a grid of expected quotes per symbol.
+
+    A background thread tops up every grid quote to `depth` signed orders.
+    `take` then returns one without any signing. Client order ids are not
+    part of the signed message, so they are filled in at take time.
+
+    Orders are signed to be valid for `order_ttl`, and are discarded once they
+    are within `expiry_margin` of their deadline. Nonces come from the
+    signer's `nonce_allocator`, so they are unique as long as every signer
+    for the account shares it.
+
+    Usage:
+        with PresignedOrderPool(signer) as pool:
+            pool.set_grid("MATIC-USDC", [Quote("buy", "0.85", "100"), ...])
+            ...
+            order = pool.take("MATIC-USDC", Quote("buy", "0.85", "100"))
+            if order is not None:
+                client.create_multiple_orders(CreateMultipleOrdersInput("MATIC-USDC", [order]))
+    """
+
+    def __init__(
+        self,
+        signer: OrderSigner,
+        *,
+        depth: int = 2,
+        order_ttl: timedelta = timedelta(hours=1),
+        expiry_margin: timedelta = timedelta(minutes=5),
+        interval: float = 1.0,
+        on_error: Optional[Callable[[Exception], None]] = None,
+    ) -> None:
+        """
+        Args:
+            signer: Signer to sign orders with.
+            depth (optional): Signed orders to keep ready per grid quote.
+            order_ttl (optional): How long signatures are valid for.
+            expiry_margin (optional): Orders closer than this to their deadline are
+                discarded rather than handed out.
+            interval (optional): Seconds between top-ups in the background.
+            on_error (optional): Called with any exception raised while signing in the
+                background. Without it, errors are logged to this module's logger.
+        """
+        self.signer = signer
+        self.depth = depth
+        self.order_ttl = order_ttl
+        self.expiry_margin = expiry_margin
+        self.interval = interval
+        self.on_error = on_error
+        self._grids: Dict[str, Dict[QuoteKey, Quote]] = {}
+        # (time after which it must not be handed out, order)
+        self._orders: Dict[
+            Tuple[str, QuoteKey], Deque[Tuple[float, OrderWithSignature]]
+        ] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "PresignedOrderPool":
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="orderbook-presign", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "PresignedOrderPool":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def set_grid(self, symbol: str, quotes: Iterable[Quote]) -> None:
+        """Replace the quotes to keep signed orders ready for, for `symbol`.
+
+        Signed orders for quotes that are no longer in the grid are discarded.
+        """
+        grid = {quote_key(quote): quote for quote in quotes}
+        with self._lock:
+            self._grids[symbol] = grid
+            for pool_key in [k for k in self._orders if k[0] == symbol]:
+                if pool_key[1] not in grid:
+                    del self._orders[pool_key]
+
+    def available(self, symbol: str, quote: Quote) -> int:
+        """Number of signed orders ready for `quote`."""
+        with self._lock:
+            orders = self._orders.get((symbol, quote_key(quote)))
+            if not orders:
+                return 0
+            self._discard_expired(orders, time.time())
+            return len(orders)
+
+    def take(
+        self, symbol: str, quote: Quote, client_order_id: Optional[str] = None
+    ) -> Optional[OrderWithSignature]:
+        """Remove and return a signed order for `quote`, or None if none is ready.
+
+        Args:
+            symbol: Symbol of the order.
+            quote: Side, price and size of the order.
+            client_order_id (optional): Client order id of the order. A random UUID
+                is used when None.
+        """
+        with self._lock:
+            orders = self._orders.get((symbol, quote_key(quote)))
+            if not orders:
+                return None
+            self._discard_expired(orders, time.time())
+            if not orders:
+                return None
+            _, signed = orders.popleft()
+
+        return OrderWithSignature(
+            order=CreateOrderInput(
+                price=signed.order.price,
+                size=signed.order.size,
+                symbol=symbol,
+                side=signed.order.side,
+                client_order_id=client_order_id or str(uuid.uuid4()),
+            ),
+            signature=signed.signature,
+            message=signed.message,
+        )
+
+    def fill_once(self) -> int:
+        """Top up every grid quote to `depth` signed orders.
+
+        Returns:
+            Number of orders signed
+        """
+        now = time.time()
+        wanted: List[Tuple[str, QuoteKey, Quote]] = []
+        with self._lock:
+            for symbol, grid in self._grids.items():
+                for key, quote in grid.items():
+                    orders = self._orders.setdefault((symbol, key), deque())
+                    self._discard_expired(orders, now)
+                    wanted.extend([(symbol, key, quote)] * (self.depth - len(orders)))
+        if not wanted:
+            return 0
+
+        deadline = datetime.now() + self.order_ttl
+        signed = self.signer.sign_orders(
+            [
+                CreateOrderInput(
+                    price=quote.price,
+                    size=quote.size,
+                    symbol=symbol,
+                    side=quote.side,
+                    client_order_id="",
+                )
+                for symbol, _, quote in wanted
+            ],
+            deadline=deadline,
+        )
+
+        usable_until = deadline.timestamp() - self.expiry_margin.total_seconds()
+        with self._lock:
+            for (symbol, key, _), order in zip(wanted, signed):
+                orders = self._orders.get((symbol, key))
+                if orders is not None and key in self._grids.get(symbol, {}):
+                    orders.append((usable_until, order))
+        return len(signed)
+
+    def _discard_expired(
+        self, orders: Deque[Tuple[float, OrderWithSignature]], now: float
+    ) -> None:
+        # Orders are appended in deadline order
+        while orders and orders[0][0] <= now:
+            orders.popleft()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.fill_once()
+            except Exception as err:
+                if self.on_error is None:
+                    logger.exception("Signing pre-signed orders failed")
+                else:
+                    self.on_error(err)
+            self._stop.wait(self.interval)
@@ -0,0 +1,243 @@
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Dict, Iterator, Optional
+
+from orbs_orderbook.exceptions import ErrApiRequest
+
+WRITE = "write"
+CANCEL = "cancel"
+MARKET_DATA = "market_data"
+ENDPOINT_CLASSES = (WRITE, CANCEL, MARKET_DATA)
+
+DEFAULT_RATES = {WRITE: 10.0, CANCEL: 20.0, MARKET_DATA: 20.0}
+THROTTLED_STATUS_CODES = (429, 503)
+
+
+def endpoint_class(method: str, endpoint: str) -> str:
+    """Endpoint class of a request: "cancel", "market_data" or "write"."""
+    if method == "DELETE":
+        return CANCEL
+    if method == "GET":
+        return MARKET_DATA
+    return WRITE
+
+
+class TokenBucket:
+    """Allows `rate` requests per second on average, in bursts of up to `burst_seconds` worth."""
+
+    def __init__(self, rate: float, *, burst_seconds: float = 1.0) -> None:
+        self.rate = rate
+        self.burst_seconds = burst_seconds
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    @property
+    def capacity(self) -> float:
+        return max(1.0, self.rate * self.burst_seconds)
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def wait_time(self, needed: float) -> float:
+        """Seconds until the bucket holds `needed` tokens."""
+        return max(0.0, (needed - self.tokens) / self.rate)
+
+
+class RequestScheduler:
+    """Client-side rate limiter shared by all requests of an SDK client.
+
+    Each endpoint class (order writes, cancels, market data) has its own token
+    bucket, and a global bucket caps their sum. Cancels have priority: while a
+    cancel is waiting no write is sent, and writes leave `cancel_reserve` of
+    the global bucket for cancels.
+
+    Rates adapt to server feedback (AIMD): a throttled response (429/503)
+    halves the rate of its class and of the global bucket, a response slower
+    than `latency_target` lowers them by 10%, and every other response raises
+    them by 1% of the configured rate, up to the configured rate. A class is
+    slowed down at most once per `cooldown` seconds, so a burst of throttled
+    responses to requests already in flight counts once.
+
+    Usage:
+        client = OrderBookSDK(BASE_URL, API_KEY, scheduler=RequestScheduler())
+    """
+
+    def __init__(
+        self,
+        rates: Optional[Dict[str, float]] = None,
+        *,
+        global_rate: Optional[float] = None,
+        burst_seconds: float = 1.0,
+        cancel_reserve: float = 0.2,
+        latency_target: Optional[float] = None,
+        min_rate: float = 0.5,
+        cooldown: float = 1.0,
+    ) -> None:
+        """
+        Args:
+            rates (optional): Maximum requests per second per endpoint class,
+                merged into `DEFAULT_RATES`.
+            global_rate (optional): Maximum requests per second in total. Defaults to
+                the sum of the write and cancel rates.
+            burst_seconds (optional): Bucket sizes, in seconds' worth of requests.
+            cancel_reserve (optional): Fraction of the global bucket only cancels can use.
+            latency_target (optional): Responses slower than this many seconds lower
+                the rate. Latency is ignored when None.
+            min_rate (optional): Rates never adapt below this many requests per second.
+            cooldown (optional): Minimum seconds between two rate decreases of a class.
+        """
+        self.max_rates = {**DEFAULT_RATES, **(rates or {})}
+        self.max_global_rate = global_rate or (
+            self.max_rates[WRITE] + self.max_rates[CANCEL]
+        )
+        self.cancel_reserve = cancel_reserve
+        self.latency_target = latency_target
+        self.min_rate = min_rate
+        self.cooldown = cooldown
+        self._buckets = {
+            name: TokenBucket(rate, burst_seconds=burst_seconds)
+            for name, rate in self.max_rates.items()
+        }
+        self._global = TokenBucket(self.max_global_rate, burst_seconds=burst_seconds)
+        self._last_decrease: Dict[str, float] = {}
+        self._cancels_waiting = 0
+        self._lock = threading.Lock()
+
+    @property
+    def rates(self) -> Dict[str, float]:
+        """Current requests per second per endpoint class, and in total ("global")."""
+        with self._lock:
+            rates = {name: bucket.rate for name, bucket in self._buckets.items()}
+            rates["global"] = self._global.rate
+            return rates
+
+    def try_acquire(self, name: str) -> float:
+        """Take a token for endpoint class `name` if one is available.
+
+        Returns:
+            0 if a token was taken, otherwise seconds to wait before trying again
+        """
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._buckets[name]
+            bucket.refill(now)
+            self._global.refill(now)
+
+            if name == CANCEL:
+                needed = 1.0
+            else:
+                capacity = self._global.capacity
+                needed = min(capacity, 1.0 + self.cancel_reserve * capacity)
+                if name == WRITE and self._cancels_waiting:
+                    return 1.0 / self._buckets[CANCEL].rate
+
+            wait = max(bucket.wait_time(1.0), self._global.wait_time(needed))
+            if wait > 0:
+                return wait
+            bucket.tokens -= 1
+            self._global.tokens -= 1
+            return 0.0
+
+    def acquire(self, name: str) -> None:
+        """Block until a request of endpoint class `name` may be sent."""
+        with self._waiting(name):
+            wait = self.try_acquire(name)
+            while wait:
+                time.sleep(wait)
+                wait = self.try_acquire(name)
+
+    async def acquire_async(self, name: str) -> None:
+        """Wait, without blocking the event loop, until a request of endpoint class `name` may be sent."""
+        with self._waiting(name):
+            wait = self.try_acquire(name)
+            while wait:
+                await asyncio.sleep(wait)
+                wait = self.try_acquire(name)
+
+    def record(
+        self, name: str, *, latency: float, status_code: Optional[int] = None
+    ) -> None:
+        """Adapt rates to the outcome of a request of endpoint class `name`.
+
+        Args:
+            name: Endpoint class.
+            latency: Seconds the request took.
+            status_code (optional): HTTP status code of a failed request.
+        """
+        with self._lock:
+            if status_code in THROTTLED_STATUS_CODES:
+                self._decrease(name, 0.5)
+            elif self.latency_target is not None and latency > self.latency_target:
+                self._decrease(name, 0.9)
+            elif status_code is None:
+                self._increase(name)
+
+    @contextmanager
+    def slot(self, method: str, endpoint: str) -> Iterator[None]:
+        """Wait for a token, then time the request in the block and record its outcome."""
+        name = endpoint_class(method, endpoint)
+        self.acquire(name)
+        with self._recording(name):
+            yield
+
+    @asynccontextmanager
+    async def async_slot(self, method: str, endpoint: str) -> AsyncIterator[None]:
+        """asyncio counterpart of `slot`."""
+        name = endpoint_class(method, endpoint)
+        await self.acquire_async(name)
+        with self._recording(name):
+            yield
+
+    @contextmanager
+    def _recording(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        except ErrApiRequest as err:
+            self.record(
+                name,
+                latency=time.perf_counter() - start,
+                status_code=err.status_code,
+            )
+            raise
+        self.record(name, latency=time.perf_counter() - start)
+
+    @contextmanager
+    def _waiting(self, name: str) -> Iterator[None]:
+        if name != CANCEL:
+            yield
+            return
+        with self._lock:
+            self._cancels_waiting += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._cancels_waiting -= 1
+
+    def _decrease(self, name: str, factor: float) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease.get(name, float("-inf")) < self.cooldown:
+            return
+        self._last_decrease[name] = now
+        for bucket in (self._buckets[name], self._global):
+            bucket.refill(now)
+            bucket.rate = max(self.min_rate, bucket.rate * factor)
+            bucket.tokens = min(bucket.tokens, bucket.capacity)
+
+    def _increase(self, name: str) -> None:
+        now = time.monotonic()
+        bucket = self._buckets[name]
+        bucket.refill(now)
+        bucket.rate = min(
+            self.max_rates[name], bucket.rate + 0.01 * self.max_rates[name]
+        )
+        self._global.refill(now)
+        self._global.rate = min(
+            self.max_global_rate, self._global.rate + 0.01 * self.max_global_rate
+        )
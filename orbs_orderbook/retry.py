@@ -0,0 +1,268 @@
+import asyncio
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures import wait
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+import aiohttp
+import requests
+
+from orbs_orderbook.exceptions import ErrApiRequest
+from orbs_orderbook.instrumentation import Observer
+from orbs_orderbook.types import RequestAttempt
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Errors raised before the request reached the server. Retrying them can't
+# create a duplicate order.
+_UNSENT_ERRORS = (requests.exceptions.ConnectTimeout, aiohttp.ClientConnectorError)
+_TRANSIENT_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    aiohttp.ClientConnectionError,
+    asyncio.TimeoutError,
+)
+
+
+class RetryPolicy:
+    """Retries failed requests with exponential backoff and jitter.
+
+    Connection errors, timeouts and `retry_status_codes` responses are retried,
+    up to `max_attempts` attempts in total. Reads and cancels are retried
+    as-is. Order writes are resubmitted only when the failed attempt can't
+    have created them: when it was throttled (429) or never connected, or when
+    a lookup by `client_order_id` finds that they don't exist. Writes without
+    a client order id are not retried after an ambiguous failure.
+
+    With `hedge_after`, a read that hasn't answered within that many seconds
+    is sent a second time, and the first response wins.
+
+    `on_attempt` is called with a `RequestAttempt` after every attempt.
+
+    Usage:
+        policy = RetryPolicy(max_attempts=4, hedge_after=0.2)
+        client = OrderBookSDK(BASE_URL, API_KEY, retry_policy=policy)
+    """
+
+    def __init__(
+        self,
+        *,
+        max_attempts: int = 3,
+        base_delay: float = 0.1,
+        max_delay: float = 2.0,
+        jitter: bool = True,
+        retry_status_codes: Tuple[int, ...] = RETRY_STATUS_CODES,
+        hedge_after: Optional[float] = None,
+        on_attempt: Optional[Callable[[RequestAttempt], None]] = None,
+    ) -> None:
+        """
+        Args:
+            max_attempts (optional): Attempts per request, including the first.
+            base_delay (optional): Delay before the first retry, in seconds. It doubles
+                with every retry.
+            max_delay (optional): Maximum delay between attempts, in seconds.
+            jitter (optional): Wait a random time between 0 and the delay ("full
+                jitter"), so that clients retrying together spread out.
+            retry_status_codes (optional): HTTP status codes to retry.
+            hedge_after (optional): Seconds after which a slow read is sent again.
+                Reads are not hedged when None.
+            on_attempt (optional): Called with a `RequestAttempt` after every attempt.
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.retry_status_codes = retry_status_codes
+        self.hedge_after = hedge_after
+        self.on_attempt = on_attempt
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def close(self) -> None:
+        """Stop the threads used for hedged reads."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    def delay(self, attempt: int) -> float:
+        """Seconds to wait after failed attempt number `attempt` (from 1)."""
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def is_retryable(self, err: Exception) -> bool:
+        if isinstance(err, ErrApiRequest):
+            return err.status_code in self.retry_status_codes
+        return isinstance(err, _TRANSIENT_ERRORS)
+
+    def is_ambiguous(self, err: Exception) -> bool:
+        """Whether a failed write may nevertheless have been applied."""
+        if isinstance(err, ErrApiRequest):
+            return err.status_code != 429
+        return not isinstance(err, _UNSENT_ERRORS)
+
+    def call(
+        self,
+        send: Callable[[], Any],
+        *,
+        method: str,
+        endpoint: str,
+        resolve: Optional[Callable[[], Any]] = None,
+        observer: Optional[Observer] = None,
+    ) -> Any:
+        """Send a request, retrying it according to the policy.
+
+        Args:
+            send: Sends one attempt and returns the response.
+            method: HTTP method, "POST" requests are treated as writes.
+            endpoint: Endpoint, for `on_attempt`.
+            resolve (optional): For writes, looks up the outcome of an ambiguous
+                attempt. Returns the response to use if the write was applied, or
+                None to resubmit.
+            observer (optional): Also receives every `RequestAttempt`.
+        """
+        attempt = 1
+        while True:
+            start = time.perf_counter()
+            hedged = False
+            try:
+                if method == "GET" and self.hedge_after is not None:
+                    result, hedged = self._hedged(send)
+                else:
+                    result = send()
+            except Exception as err:
+                self._report(method, endpoint, attempt, start, err, hedged, observer)
+                if attempt >= self.max_attempts or not self.is_retryable(err):
+                    raise
+                time.sleep(self.delay(attempt))
+                if method == "POST" and self.is_ambiguous(err):
+                    if resolve is None:
+                        raise
+                    resolved = resolve()
+                    if resolved is not None:
+                        return resolved
+                attempt += 1
+                continue
+
+            self._report(method, endpoint, attempt, start, None, hedged, observer)
+            return result
+
+    async def call_async(
+        self,
+        send: Callable[[], Awaitable[Any]],
+        *,
+        method: str,
+        endpoint: str,
+        resolve: Optional[Callable[[], Awaitable[Any]]] = None,
+        observer: Optional[Observer] = None,
+    ) -> Any:
+        """asyncio counterpart of `call`."""
+        attempt = 1
+        while True:
+            start = time.perf_counter()
+            hedged = False
+            try:
+                if method == "GET" and self.hedge_after is not None:
+                    result, hedged = await self._hedged_async(send)
+                else:
+                    result = await send()
+            except Exception as err:
+                self._report(method, endpoint, attempt, start, err, hedged, observer)
+                if attempt >= self.max_attempts or not self.is_retryable(err):
+                    raise
+                await asyncio.sleep(self.delay(attempt))
+                if method == "POST" and self.is_ambiguous(err):
+                    if resolve is None:
+                        raise
+                    resolved = await resolve()
+                    if resolved is not None:
+                        return resolved
+                attempt += 1
+                continue
+
+            self._report(method, endpoint, attempt, start, None, hedged, observer)
+            return result
+
+    def _hedged(self, send: Callable[[], Any]) -> Tuple[Any, bool]:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    thread_name_prefix="orderbook-hedge"
+                )
+            executor = self._executor
+        first = executor.submit(send)
+        try:
+            return first.result(timeout=self.hedge_after), False
+        except FutureTimeoutError:
+            pass
+
+        second = executor.submit(send)
+        done, pending = wait((first, second), return_when=FIRST_COMPLETED)
+        winner = _first_success((first, second), done)
+        if winner is None:
+            # The other attempt may still succeed; if both failed, raise the first
+            winner = pending.pop() if pending else first
+        return winner.result(), winner is second
+
+    async def _hedged_async(
+        self, send: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, bool]:
+        first = asyncio.ensure_future(send())
+        done, _ = await asyncio.wait((first,), timeout=self.hedge_after)
+        if done:
+            return first.result(), False
+
+        second = asyncio.ensure_future(send())
+        done, pending = await asyncio.wait(
+            (first, second), return_when=asyncio.FIRST_COMPLETED
+        )
+        winner = _first_success((first, second), done)
+        if winner is None:
+            if pending:
+                winner = pending.pop()
+                await asyncio.wait((winner,))
+            else:
+                winner = first
+        for task in pending:
+            task.cancel()
+        return winner.result(), winner is second
+
+    def _report(
+        self,
+        method: str,
+        endpoint: str,
+        attempt: int,
+        start: float,
+        error: Optional[Exception],
+        hedged: bool,
+        observer: Optional[Observer],
+    ) -> None:
+        if self.on_attempt is None and observer is None:
+            return
+        report = RequestAttempt(
+            method=method,
+            endpoint=endpoint,
+            attempt=attempt,
+            latency=time.perf_counter() - start,
+            error=error,
+            hedged=hedged,
+        )
+        if self.on_attempt is not None:
+            self.on_attempt(report)
+        if observer is not None:
+            observer.on_attempt(report)
+
+
+def _first_success(futures: Tuple[Any, ...], done: Any) -> Any:
+    """The first of `futures` that finished without an error, if any.
+
+    Both attempts of a hedged request can finish before the wait returns, so
+    the successful one is picked rather than whichever `done` yields first.
+    """
+    for future in futures:
+        if future in done and not future.cancelled() and future.exception() is None:
+            return future
+    return None
@@ -0,0 +1,413 @@
+"""Streaming market data over one persistent WebSocket connection.
+
+Protocol (JSON text frames). The client authenticates with the same
+`X-API-KEY` header as the HTTP API, then sends:
+
+    {"op": "subscribe", "channel": "depth", "symbol": "MATIC-USDC"}
+    {"op": "unsubscribe", "channel": "depth", "symbol": "MATIC-USDC"}
+    {"op": "subscribe", "channel": "orders"}
+
+The server acknowledges each subscription with the channel's current
+sequence number, then sends every update with the next one:
+
+    {"type": "subscribed", "channel": "depth", "symbol": "MATIC-USDC", "seq": 41}
+    {"type": "update", "channel": "depth", "symbol": "MATIC-USDC", "seq": 42,
+     "asks": [["0.87", "40"]], "bids": [["0.86", "0"]], "time": 1714521600000}
+    {"type": "update", "channel": "orders", "seq": 7, "order": {...}}
+    {"type": "error", "msg": "..."}
+
+Depth updates carry the new size of each changed level, "0" for removed
+levels. Order updates carry the order as returned by `get_order_by_id`, and
+are sent when orders of the API key's user are created, filled or cancelled.
+"""
+
+import asyncio
+import random
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Union,
+)
+
+from websockets.asyncio.client import ClientConnection, connect
+
+from orbs_orderbook.cache import MARKET_DEPTH
+from orbs_orderbook.async_client import AsyncOrderBookSDK
+from orbs_orderbook.client import OrderBookSDK
+from orbs_orderbook.exceptions import ErrStream
+from orbs_orderbook.order_book import LocalOrderBook
+from orbs_orderbook.types import MarketDepthResponse, OrderResponse, _parse_to_class
+from orbs_orderbook.utils import json_dumps, json_loads
+
+DEPTH = "depth"
+ORDERS = "orders"
+
+# Ends the async iterators when the stream is closed
+_CLOSED = object()
+
+
+class _DepthSubscription:
+    def __init__(self, symbol: str) -> None:
+        self.book = LocalOrderBook(symbol)
+        # Sequence number of the last update received
+        self.seq: Optional[int] = None
+        # Updates received while a snapshot is being fetched, None when in sync
+        self.pending: Optional[List[Dict[str, Any]]] = []
+        self.gap = False
+        self.resync: Optional[asyncio.Task] = None
+        self.synced = asyncio.Event()
+        self.listeners: List[asyncio.Queue] = []
+
+
+class MarketDataStream:
+    """Keeps `LocalOrderBook`s and order updates current from the market data stream.
+
+    One connection carries every subscription. Each depth subscription starts
+    from a `get_market_depth` snapshot, then applies updates as they arrive.
+    When a sequence number is skipped, or the connection drops and is
+    re-established, updates are buffered while a new snapshot is fetched, and
+    replayed on top of it. Reconnects back off exponentially, with jitter.
+
+    Updates are delivered to the `on_depth` and `on_order` callbacks, and to
+    the `depth_updates` and `order_updates` async iterators. Callbacks run on
+    the event loop, so they should be quick.
+
+    `sdk` provides the API key and the depth snapshots; an `OrderBookSDK` is
+    called on the default executor, an `AsyncOrderBookSDK` is awaited.
+
+    Usage:
+        async with MarketDataStream(client, STREAM_URL) as stream:
+            await stream.subscribe_depth("MATIC-USDC")
+            async for book in stream.depth_updates("MATIC-USDC"):
+                requote(book.mid())
+    """
+
+    def __init__(
+        self,
+        sdk: Union[OrderBookSDK, AsyncOrderBookSDK],
+        url: str,
+        *,
+        depth_limit: int = 100,
+        on_depth: Optional[Callable[[LocalOrderBook], None]] = None,
+        on_order: Optional[Callable[[OrderResponse], None]] = None,
+        on_gap: Optional[Callable[[str, Optional[str]], None]] = None,
+        on_error: Optional[Callable[[Exception], None]] = None,
+        reconnect_delay: float = 0.1,
+        max_reconnect_delay: float = 5.0,
+    ) -> None:
+        """
+        Args:
+            sdk: Client for the API key and depth snapshots.
+            url: Stream URL, e.g. "wss://.../api/v1/stream".
+            depth_limit (optional): Levels per side to fetch in snapshots.
+            on_depth (optional): Called with the book after every change.
+            on_order (optional): Called with every order update.
+            on_gap (optional): Called with the channel and symbol when updates were
+                missed, including while reconnecting. Depth books resync by
+                themselves; after an "orders" gap, open orders should be
+                reconciled (e.g. `OrderManager.reconcile`).
+            on_error (optional): Called with connection and snapshot errors, which
+                are otherwise retried silently, and with `ErrStream` for errors
+                reported by the server.
+            reconnect_delay (optional): Delay before the first reconnect, in seconds.
+                It doubles with every failed attempt.
+            max_reconnect_delay (optional): Maximum delay between reconnects.
+        """
+        self.sdk = sdk
+        self.url = url
+        self.depth_limit = depth_limit
+        self.on_depth = on_depth
+        self.on_order = on_order
+        self.on_gap = on_gap
+        self.on_error = on_error
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        # Number of connections made, including reconnects
+        self.connections = 0
+        self._depth: Dict[str, _DepthSubscription] = {}
+        self._orders = False
+        self._orders_seq: Optional[int] = None
+        # Order updates may have been missed while reconnecting
+        self._orders_missed = False
+        self._order_listeners: List[asyncio.Queue] = []
+        self._ws: Optional[ClientConnection] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def books(self) -> Dict[str, LocalOrderBook]:
+        """Books of the subscribed symbols."""
+        return {symbol: sub.book for symbol, sub in self._depth.items()}
+
+    async def start(self) -> "MarketDataStream":
+        """Connect in the background. Subscriptions can be made right away."""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+        return self
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for sub in self._depth.values():
+            if sub.resync is not None:
+                sub.resync.cancel()
+            for queue in sub.listeners:
+                _put_latest(queue, _CLOSED)
+        for queue in self._order_listeners:
+            queue.put_nowait(_CLOSED)
+
+    async def __aenter__(self) -> "MarketDataStream":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def subscribe_depth(self, symbol: str) -> LocalOrderBook:
+        """Subscribe to depth updates of `symbol` and return its book.
+
+        The book is empty until the first snapshot; see `wait_synced`.
+        """
+        sub = self._depth.get(symbol)
+        if sub is None:
+            sub = self._depth[symbol] = _DepthSubscription(symbol)
+            await self._send({"op": "subscribe", "channel": DEPTH, "symbol": symbol})
+        return sub.book
+
+    async def unsubscribe_depth(self, symbol: str) -> None:
+        sub = self._depth.pop(symbol, None)
+        if sub is None:
+            return
+        if sub.resync is not None:
+            sub.resync.cancel()
+        for queue in sub.listeners:
+            _put_latest(queue, _CLOSED)
+        await self._send({"op": "unsubscribe", "channel": DEPTH, "symbol": symbol})
+
+    async def subscribe_orders(self) -> None:
+        """Subscribe to updates of the user's orders."""
+        if not self._orders:
+            self._orders = True
+            await self._send({"op": "subscribe", "channel": ORDERS})
+
+    async def wait_synced(self, symbol: str) -> LocalOrderBook:
+        """Wait until the book of `symbol` has been brought up to date."""
+        sub = self._depth[symbol]
+        await sub.synced.wait()
+        return sub.book
+
+    async def depth_updates(self, symbol: str) -> AsyncIterator[LocalOrderBook]:
+        """Yield the book of `symbol` whenever it changes, until the stream is closed.
+
+        Changes that arrive while the consumer is busy are coalesced: the
+        next iteration yields the book once, with all of them applied.
+        """
+        sub = self._depth[symbol]
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        sub.listeners.append(queue)
+        try:
+            while True:
+                book = await queue.get()
+                if book is _CLOSED:
+                    return
+                yield book
+        finally:
+            if queue in sub.listeners:
+                sub.listeners.remove(queue)
+
+    async def order_updates(self) -> AsyncIterator[OrderResponse]:
+        """Yield every order update, until the stream is closed."""
+        queue: asyncio.Queue = asyncio.Queue()
+        self._order_listeners.append(queue)
+        try:
+            while True:
+                order = await queue.get()
+                if order is _CLOSED:
+                    return
+                yield order
+        finally:
+            self._order_listeners.remove(queue)
+
+    async def _send(self, message: Dict[str, Any]) -> None:
+        # Without a connection, subscriptions are sent once it is established
+        if self._ws is not None:
+            await self._ws.send(json_dumps(message).decode())
+
+    async def _run(self) -> None:
+        headers = {"X-API-KEY": self.sdk.headers["X-API-KEY"]}
+        failures = 0
+        while True:
+            try:
+                async with connect(self.url, additional_headers=headers) as ws:
+                    self._ws = ws
+                    self.connections += 1
+                    failures = 0
+                    await self._resubscribe()
+                    async for raw in ws:
+                        self._dispatch(json_loads(raw))
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                self._report(err)
+            finally:
+                self._ws = None
+                self._disconnected()
+            await asyncio.sleep(self._backoff(failures))
+            failures += 1
+
+    def _backoff(self, failures: int) -> float:
+        delay = min(self.max_reconnect_delay, self.reconnect_delay * 2**failures)
+        return random.uniform(0, delay)
+
+    async def _resubscribe(self) -> None:
+        for symbol in list(self._depth):
+            await self._send({"op": "subscribe", "channel": DEPTH, "symbol": symbol})
+        if self._orders:
+            await self._send({"op": "subscribe", "channel": ORDERS})
+
+    def _disconnected(self) -> None:
+        # Updates may be missed until the next connection's snapshot
+        for sub in self._depth.values():
+            if sub.resync is not None:
+                sub.resync.cancel()
+                sub.resync = None
+            sub.seq = None
+            sub.pending = []
+            sub.synced.clear()
+        if self._orders_seq is not None:
+            self._orders_missed = True
+        self._orders_seq = None
+
+    def _dispatch(self, message: Dict[str, Any]) -> None:
+        kind, channel = message.get("type"), message.get("channel")
+        if kind == "error":
+            self._report(ErrStream(message.get("msg")))
+        elif channel == DEPTH:
+            sub = self._depth.get(message["symbol"])
+            if sub is not None:
+                self._on_depth_message(sub, kind, message)
+        elif channel == ORDERS:
+            self._on_order_message(kind, message)
+
+    def _on_depth_message(
+        self, sub: _DepthSubscription, kind: str, message: Dict[str, Any]
+    ) -> None:
+        seq = message["seq"]
+        if kind == "subscribed":
+            sub.seq = seq
+            self._start_resync(sub)
+            return
+
+        if sub.seq is None:
+            # Update for a subscription that is not acknowledged yet
+            return
+        if seq != sub.seq + 1:
+            sub.gap = True
+            if sub.pending is None:
+                sub.pending = []
+            self._start_resync(sub)
+            if self.on_gap is not None:
+                self.on_gap(DEPTH, sub.book.symbol)
+        sub.seq = seq
+
+        if sub.pending is not None:
+            sub.pending.append(message)
+        elif sub.book.apply_update(
+            asks=message.get("asks", ()),
+            bids=message.get("bids", ()),
+            time=message.get("time"),
+        ):
+            self._notify_depth(sub)
+
+    def _on_order_message(self, kind: str, message: Dict[str, Any]) -> None:
+        seq = message["seq"]
+        if kind == "subscribed":
+            self._orders_seq = seq
+            if self._orders_missed:
+                self._orders_missed = False
+                if self.on_gap is not None:
+                    self.on_gap(ORDERS, None)
+            return
+        if self._orders_seq is not None and seq != self._orders_seq + 1:
+            if self.on_gap is not None:
+                self.on_gap(ORDERS, None)
+        self._orders_seq = seq
+
+        order = _parse_to_class(OrderResponse, message["order"])
+        if self.on_order is not None:
+            self.on_order(order)
+        for queue in self._order_listeners:
+            queue.put_nowait(order)
+
+    def _start_resync(self, sub: _DepthSubscription) -> None:
+        sub.synced.clear()
+        if sub.resync is None or sub.resync.done():
+            sub.resync = asyncio.ensure_future(self._resync(sub))
+
+    async def _resync(self, sub: _DepthSubscription) -> None:
+        failures = 0
+        while True:
+            sub.gap = False
+            try:
+                depth = await self._snapshot(sub.book.symbol)
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                self._report(err)
+                await asyncio.sleep(self._backoff(failures))
+                failures += 1
+                continue
+            if not sub.gap:
+                break
+            # Missed another update while fetching: the snapshot may not include it
+
+        data = depth.data
+        changed = sub.book.apply_snapshot(
+            asks=data.asks, bids=data.bids, time=data.time
+        )
+        # Levels are absolute sizes, so updates already in the snapshot can be
+        # applied again
+        for message in sub.pending or ():
+            changed += sub.book.apply_update(
+                asks=message.get("asks", ()),
+                bids=message.get("bids", ()),
+                time=message.get("time"),
+            )
+        sub.pending = None
+        sub.synced.set()
+        if changed:
+            self._notify_depth(sub)
+
+    async def _snapshot(self, symbol: str) -> MarketDepthResponse:
+        # A cached snapshot may predate updates that were missed
+        if self.sdk.cache is not None:
+            self.sdk.cache.invalidate(MARKET_DEPTH, symbol)
+        if isinstance(self.sdk, AsyncOrderBookSDK):
+            return await self.sdk.get_market_depth(symbol, self.depth_limit)
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self.sdk.get_market_depth, symbol, self.depth_limit
+        )
+
+    def _notify_depth(self, sub: _DepthSubscription) -> None:
+        if self.on_depth is not None:
+            self.on_depth(sub.book)
+        for queue in sub.listeners:
+            if not queue.full():
+                queue.put_nowait(sub.book)
+
+    def _report(self, err: Exception) -> None:
+        if self.on_error is not None:
+            self.on_error(err)
+
+
+def _put_latest(queue: asyncio.Queue, item: Any) -> None:
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(item)
@@ -0,0 +1,4 @@
+"""Offline stand-ins for the order book API, for tests and benchmarks."""
+
+from orbs_orderbook.testing.stub_server import StubOrderBookServer
+from orbs_orderbook.testing.stream_server import StubStreamServer
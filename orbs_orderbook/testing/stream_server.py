@@ -0,0 +1,212 @@
+"""In-process stand-in for the market data stream (see `orbs_orderbook.stream`)."""
+
+import asyncio
+import json
+import threading
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Optional, Sequence, Set, Tuple
+
+from websockets.asyncio.server import Server, ServerConnection, serve
+from websockets.exceptions import ConnectionClosed
+
+from orbs_orderbook.stream import DEPTH, ORDERS
+from orbs_orderbook.testing.stub_server import StubOrderBookServer
+
+Channel = Tuple[str, Optional[str]]
+
+
+class StubStreamServer:
+    """Serves the market data stream protocol from memory on a local port.
+
+    Updates are published explicitly with `publish_depth` and `publish_order`.
+    With `book_server`, depth updates are also applied to its `depth`, so
+    snapshots from `get_market_depth` agree with the stream. `drop=True`
+    publishes an update without sending it, to exercise gap recovery, and
+    `disconnect_all` drops every connection, to exercise reconnects.
+
+    The server runs its own event loop on a background thread, so it can be
+    used from synchronous tests as well as from asyncio.
+
+    Usage:
+        with StubOrderBookServer() as http, StubStreamServer(book_server=http) as ws:
+            client = OrderBookSDK(base_url=http.url, api_key="key")
+            stream = MarketDataStream(client, ws.url)
+            ...
+            ws.publish_depth("MATIC-USDC", asks=[["0.87", "40"]])
+    """
+
+    def __init__(
+        self,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        api_key: Optional[str] = None,
+        book_server: Optional[StubOrderBookServer] = None,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.api_key = api_key
+        self.book_server = book_server
+        self.connections_opened = 0
+        self.messages_sent = 0
+        self._clients: Dict[ServerConnection, Set[Channel]] = {}
+        self._seq: Dict[Channel, int] = {}
+        self._loop = asyncio.new_event_loop()
+        self._server: Optional[Server] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"ws://{host}:{port}"
+
+    def start(self) -> "StubStreamServer":
+        started = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(started,), name="stub-stream", daemon=True
+        )
+        self._thread.start()
+        started.wait()
+        if self._server is None:
+            raise RuntimeError("stream server failed to start")
+        return self
+
+    def stop(self) -> None:
+        self._call(self._shutdown())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self._loop.close()
+
+    def __enter__(self) -> "StubStreamServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def publish_depth(
+        self,
+        symbol: str,
+        *,
+        asks: Iterable[Sequence[str]] = (),
+        bids: Iterable[Sequence[str]] = (),
+        drop: bool = False,
+    ) -> int:
+        """Publish changed levels of `symbol`. Size "0" removes a level.
+
+        Args:
+            symbol: Symbol of the levels.
+            asks (optional): [price, size] ask levels.
+            bids (optional): [price, size] bid levels.
+            drop (optional): Use up a sequence number without sending the update.
+
+        Returns:
+            Sequence number of the update
+        """
+        asks, bids = [list(level) for level in asks], [list(level) for level in bids]
+        if self.book_server is not None:
+            self._apply_to_book_server(symbol, asks, bids)
+        return self._call(
+            self._publish(
+                (DEPTH, symbol),
+                {"asks": asks, "bids": bids, "time": int(self._loop.time() * 1000)},
+                drop,
+            )
+        )
+
+    def publish_order(self, order: Dict[str, Any], *, drop: bool = False) -> int:
+        """Publish an order update, `order` being the order's JSON as served by the API."""
+        return self._call(self._publish((ORDERS, None), {"order": order}, drop))
+
+    def disconnect_all(self) -> None:
+        """Drop every client connection, without a closing handshake."""
+        self._call(self._disconnect_all())
+
+    def _apply_to_book_server(
+        self, symbol: str, asks: Sequence[Sequence[str]], bids: Sequence[Sequence[str]]
+    ) -> None:
+        server = self.book_server
+        with server._lock:
+            book = server.depth.setdefault(symbol, {"asks": {}, "bids": {}})
+            for side, levels in (("asks", asks), ("bids", bids)):
+                for price, size in levels:
+                    if Decimal(size):
+                        book[side][price] = size
+                    else:
+                        book[side].pop(price, None)
+
+    def _call(self, coro) -> Any:
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def _run(self, started: threading.Event) -> None:
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._server = self._loop.run_until_complete(self._serve())
+        finally:
+            started.set()
+        self._loop.run_forever()
+
+    async def _serve(self) -> Server:
+        return await serve(self._handle, self.host, self.port)
+
+    async def _shutdown(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _disconnect_all(self) -> None:
+        for ws in list(self._clients):
+            ws.transport.abort()
+
+    async def _publish(
+        self, channel: Channel, payload: Dict[str, Any], drop: bool
+    ) -> int:
+        seq = self._seq[channel] = self._seq.get(channel, 0) + 1
+        if drop:
+            return seq
+        message = json.dumps({**self._header("update", channel), "seq": seq, **payload})
+        for ws, subscriptions in list(self._clients.items()):
+            if channel in subscriptions:
+                try:
+                    await ws.send(message)
+                    self.messages_sent += 1
+                except ConnectionClosed:
+                    pass
+        return seq
+
+    def _header(self, kind: str, channel: Channel) -> Dict[str, Any]:
+        header = {"type": kind, "channel": channel[0]}
+        if channel[1] is not None:
+            header["symbol"] = channel[1]
+        return header
+
+    async def _handle(self, ws: ServerConnection) -> None:
+        if self.api_key and ws.request.headers.get("X-API-KEY") != (
+            f"Bearer {self.api_key}"
+        ):
+            await ws.close(4001, "unauthorized")
+            return
+
+        self.connections_opened += 1
+        subscriptions = self._clients[ws] = set()
+        try:
+            async for raw in ws:
+                message = json.loads(raw)
+                op, channel = message.get("op"), message.get("channel")
+                key = (channel, message.get("symbol") if channel == DEPTH else None)
+                if op == "subscribe" and channel in (DEPTH, ORDERS):
+                    subscriptions.add(key)
+                    reply = {
+                        **self._header("subscribed", key),
+                        "seq": self._seq.get(key, 0),
+                    }
+                elif op == "unsubscribe":
+                    subscriptions.discard(key)
+                    continue
+                else:
+                    reply = {"type": "error", "msg": f"invalid message: {raw}"}
+                await ws.send(json.dumps(reply))
+        except ConnectionClosed:
+            pass
+        finally:
+            del self._clients[ws]
@@ -0,0 +1,373 @@
+"""In-process stub of the order book HTTP API."""
+
+import json
+import random
+import threading
+import time
+import uuid
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+STUB_TOKENS = {
+    "MATIC": {
+        "address": "0x0d500B1d8E8eF31E21C99d1Db9A6444d3ADf1270",
+        "decimals": 18,
+    },
+    "USDC": {
+        "address": "0x3c499c542cEF5E3811e1192ce70d8cC03d5c3359",
+        "decimals": 6,
+    },
+}
+
+STUB_SYMBOLS = ["MATIC-USDC"]
+
+# Server-side limit on orders per `api/v1/orders` request
+MAX_ORDERS_PER_BATCH = 10
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class StubOrderBookServer:
+    """Serves the `api/v1/*` endpoints from memory on a local port.
+
+    Connections are kept alive (HTTP/1.1), so the number of accepted
+    connections (`connections_opened`) shows whether a client reuses them.
+    With `rate_limit`, requests beyond that many per second (in bursts of up to
+    one second's worth) get a 429 response and are counted in
+    `requests_throttled`.
+
+    `add_fault` makes upcoming requests slow or fail, to exercise retries.
+    `add_fills` generates filled orders for `api/v1/fills`.
+
+    Usage:
+        with StubOrderBookServer(latency=0.001) as server:
+            client = OrderBookSDK(base_url=server.url, api_key="key")
+    """
+
+    def __init__(
+        self,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        api_key: Optional[str] = None,
+        rate_limit: Optional[float] = None,
+    ) -> None:
+        self.latency = latency
+        self.api_key = api_key
+        self.rate_limit = rate_limit
+        self.orders: Dict[str, Dict[str, Any]] = {}
+        # Filled orders served by `api/v1/fills`, newest first
+        self.fills: List[Dict[str, Any]] = []
+        # Levels served by `api/v1/orderbook/{symbol}`: {"asks": {price: size},
+        # "bids": {price: size}} by symbol. Other symbols get generated levels.
+        self.depth: Dict[str, Dict[str, Dict[str, str]]] = {}
+        self.connections_opened = 0
+        self.requests_served = 0
+        self.requests_throttled = 0
+        self._faults: List[Dict[str, Any]] = []
+        self._allowance = rate_limit or 0.0
+        self._allowance_updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._httpd = _HTTPServer((host, port), self._make_handler())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubOrderBookServer":
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="stub-orderbook", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "StubOrderBookServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def add_fault(
+        self,
+        *,
+        method: Optional[str] = None,
+        status: Optional[int] = None,
+        apply: bool = True,
+        delay: float = 0.0,
+        count: int = 1,
+        body: Optional[bytes] = None,
+    ) -> None:
+        """Make the next `count` requests (with `method`, if given) misbehave.
+
+        Args:
+            method (optional): Only affect requests with this HTTP method.
+            status (optional): Respond with this status code instead of the real response.
+            apply (optional): With `status`, still handle the request first, like a
+                server that fails after creating an order.
+            delay (optional): Extra seconds to wait before responding.
+            count (optional): Number of requests to affect.
+            body (optional): With `status`, respond with this body instead of JSON,
+                like a proxy's error page.
+        """
+        fault = {
+            "method": method,
+            "status": status,
+            "apply": apply,
+            "delay": delay,
+            "body": body,
+        }
+        with self._lock:
+            self._faults.extend(dict(fault) for _ in range(count))
+
+    def add_fills(
+        self, count: int, *, symbol: str = "MATIC-USDC", seed: int = 0
+    ) -> None:
+        """Add `count` generated fills of `symbol`, newer than the existing ones.
+
+        Prices, sizes and sides are random but reproducible for a given `seed`;
+        timestamps are one second apart.
+        """
+        rng = random.Random(seed)
+        start = time.time() - count
+        fills = []
+        for i in range(count):
+            size = rng.choice(("10", "25", "40", "100", "250"))
+            partial = rng.random() < 0.2
+            fills.append(
+                {
+                    "orderId": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+                    "clientOrderId": str(
+                        uuid.UUID(int=rng.getrandbits(128), version=4)
+                    ),
+                    "userId": "00000000-0000-0000-0000-000000000001",
+                    "price": f"{rng.uniform(0.8, 0.9):.4f}",
+                    "symbol": symbol,
+                    "size": size,
+                    "pendingSize": "0",
+                    "filledSize": str(int(size) // 2) if partial else size,
+                    "side": rng.choice(("buy", "sell")),
+                    "timestamp": time.strftime(
+                        "%Y-%m-%dT%H:%M:%SZ", time.gmtime(start + i)
+                    ),
+                    "cancelled": False,
+                }
+            )
+        with self._lock:
+            self.fills[:0] = fills[::-1]
+
+    def _take_fault(self, method: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            for i, fault in enumerate(self._faults):
+                if fault["method"] in (None, method):
+                    return self._faults.pop(i)
+        return None
+
+    def handle(
+        self, method: str, path: str, query: Dict[str, List[str]], body: Any
+    ) -> Tuple[int, Any]:
+        """Route a request to a handler. Returns (status code, JSON body)."""
+        parts = path.strip("/").split("/")[2:]  # drop "api/v1"
+
+        if method == "GET" and parts == ["supported-tokens"]:
+            return 200, {"tokens": STUB_TOKENS}
+        if method == "GET" and parts == ["symbols"]:
+            return 200, [{"symbol": s, "name": s} for s in STUB_SYMBOLS]
+        if method == "POST" and parts == ["order"]:
+            if body["symbol"] not in STUB_SYMBOLS:
+                return 400, {"msg": f"invalid symbol: {body['symbol']}"}
+            order = self._store_order(body)
+            return 201, {"orderId": order["orderId"]}
+        if method == "POST" and parts == ["orders"]:
+            if body["symbol"] not in STUB_SYMBOLS:
+                return 400, {"msg": f"invalid symbol: {body['symbol']}"}
+            if len(body["orders"]) > MAX_ORDERS_PER_BATCH:
+                return 400, {"msg": "too many orders"}
+            if any(o["symbol"] != body["symbol"] for o in body["orders"]):
+                return 400, {"msg": "orders must be for the same symbol"}
+            created = [self._store_order(o) for o in body["orders"]]
+            return 201, {
+                "created": created,
+                "msg": "orders created",
+                "status": 201,
+                "symbol": body["symbol"],
+            }
+        if parts[:1] == ["order"] and len(parts) in (2, 3):
+            order = self._find_order(parts)
+            if order is None:
+                return 404, {"msg": "order not found"}
+            if method == "GET":
+                return 200, order
+            if method == "DELETE":
+                order["cancelled"] = True
+                return 200, {"orderId": order["orderId"]}
+        if method == "DELETE" and parts == ["orders"]:
+            symbol = query.get("symbol", [None])[0]
+            cancelled = []
+            with self._lock:
+                for order in self.orders.values():
+                    if not order["cancelled"] and symbol in (None, order["symbol"]):
+                        order["cancelled"] = True
+                        cancelled.append(order["orderId"])
+            return 200, {"orders": cancelled}
+        if method == "GET" and parts[:1] == ["orderbook"] and len(parts) == 2:
+            return 200, self._market_depth(parts[1], (body or {}).get("limit", 20))
+        if method == "GET" and parts in (["orders"], ["fills"]):
+            return 200, self._page(
+                self._open_orders() if parts == ["orders"] else list(self.fills),
+                page=(body or {}).get("page", 1),
+                page_size=(body or {}).get("pageSize", 10),
+            )
+
+        return 404, {"msg": f"no route for {method} {path}"}
+
+    def _admit(self) -> bool:
+        if self.rate_limit is None:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._allowance = min(
+                self.rate_limit,
+                self._allowance + (now - self._allowance_updated) * self.rate_limit,
+            )
+            self._allowance_updated = now
+            if self._allowance < 1:
+                self.requests_throttled += 1
+                return False
+            self._allowance -= 1
+            return True
+
+    def _store_order(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        order = {
+            "orderId": str(uuid.uuid4()),
+            "clientOrderId": body.get("clientOrderId"),
+            "userId": "00000000-0000-0000-0000-000000000001",
+            "price": body["price"],
+            "symbol": body["symbol"],
+            "size": body["size"],
+            "pendingSize": "0",
+            "filledSize": "0",
+            "side": body["side"],
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "cancelled": False,
+        }
+        with self._lock:
+            self.orders[order["orderId"]] = order
+        return order
+
+    def _find_order(self, parts: List[str]) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if len(parts) == 2:
+                return self.orders.get(parts[1])
+            if parts[1] != "client-order":
+                return None
+            for order in self.orders.values():
+                if order["clientOrderId"] == parts[2]:
+                    return order
+        return None
+
+    def _open_orders(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [o for o in self.orders.values() if not o["cancelled"]]
+
+    def _market_depth(self, symbol: str, limit: int) -> Dict[str, Any]:
+        with self._lock:
+            levels = self.depth.get(symbol)
+            if levels is not None:
+                asks = sorted(levels["asks"].items(), key=lambda l: Decimal(l[0]))
+                bids = sorted(levels["bids"].items(), key=lambda l: -Decimal(l[0]))
+                asks = [list(level) for level in asks[:limit]]
+                bids = [list(level) for level in bids[:limit]]
+        if levels is None:
+            asks = [[f"{0.87 + i * 0.0001:.8f}", str(40 + i)] for i in range(limit)]
+            bids = [[f"{0.86 - i * 0.0001:.8f}", str(40 + i)] for i in range(limit)]
+        return {
+            "code": "OK",
+            "data": {
+                "asks": asks,
+                "bids": bids,
+                "symbol": symbol,
+                "time": int(time.time() * 1000),
+            },
+        }
+
+    def _page(
+        self, records: List[Dict[str, Any]], *, page: int, page_size: int
+    ) -> Dict[str, Any]:
+        start = (page - 1) * page_size
+        return {
+            "page": page,
+            "pageSize": page_size,
+            "total": len(records),
+            "totalPages": -(-len(records) // page_size),
+            "data": records[start : start + page_size],
+        }
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def setup(self) -> None:
+                super().setup()
+                with server._lock:
+                    server.connections_opened += 1
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+            def _dispatch(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                body = json.loads(raw) if raw else None
+
+                fault = server._take_fault(self.command) or {}
+                if server.latency or fault.get("delay"):
+                    time.sleep(server.latency + fault.get("delay", 0.0))
+
+                if server.api_key and self.headers.get("X-API-KEY") != (
+                    f"Bearer {server.api_key}"
+                ):
+                    status, payload = 401, {"msg": "unauthorized"}
+                elif not server._admit():
+                    status, payload = 429, {"msg": "too many requests"}
+                elif fault.get("status") and not fault["apply"]:
+                    status, payload = fault["status"], {"msg": "injected fault"}
+                else:
+                    url = urlsplit(self.path)
+                    status, payload = server.handle(
+                        self.command, url.path, parse_qs(url.query), body
+                    )
+                    if fault.get("status"):
+                        status, payload = fault["status"], {"msg": "injected fault"}
+
+                content_type = "application/json"
+                encoded = json.dumps(payload).encode()
+                if fault.get("status") and fault.get("body") is not None:
+                    content_type, encoded = "text/html", fault["body"]
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(encoded)))
+                self.end_headers()
+                self.wfile.write(encoded)
+                with server._lock:
+                    server.requests_served += 1
+
+            do_GET = do_POST = do_DELETE = _dispatch
+
+        return Handler
@@ -0,0 +1,163 @@
+import json
+import os
+import tempfile
+import time
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple
+
+from orbs_orderbook.exceptions import (
+    ErrInvalidSide,
+    ErrInvalidSymbolFormat,
+    ErrInvalidToken,
+)
+from orbs_orderbook.types import Token
+
+SIDES = ("buy", "sell")
+
+
+class TokenRegistry(Mapping):
+    """Supported tokens, with every symbol and side pre-resolved to (in, out) tokens.
+
+    Behaves like the `supported_tokens` dict returned by the API (token symbol
+    to a dict of token details), so it can be used anywhere that dict was.
+    Values are always plain dicts, whether they were given as dicts or as
+    `Token`s, fetched or loaded from a cache file. `update()`
+    swaps in a new table atomically, so readers never need a lock.
+
+    The `Token` records returned by `resolve` are shared between calls and
+    must not be modified.
+    """
+
+    def __init__(self, tokens: Optional[Mapping[str, Any]] = None) -> None:
+        self.update(tokens or {})
+
+    def update(self, tokens: Mapping[str, Any]) -> None:
+        """Replace the token table. `Token` values are stored as dicts."""
+        tokens = {symbol: _to_dict(details) for symbol, details in tokens.items()}
+        records = {symbol: _to_token(details) for symbol, details in tokens.items()}
+        pairs = {}
+        for base, base_token in records.items():
+            for quote, quote_token in records.items():
+                if base == quote:
+                    continue
+                symbol = f"{base}-{quote}"
+                pairs[(symbol, "sell")] = (base_token, quote_token)
+                pairs[(symbol, "buy")] = (quote_token, base_token)
+
+        # Single assignment, so concurrent readers see either the old or new table
+        self._table: Tuple[Dict[str, Any], Dict[Tuple[str, str], Tuple[Token, Token]]]
+        self._table = (tokens, pairs)
+
+    @property
+    def tokens(self) -> Dict[str, Any]:
+        """Current token table. A new dict is returned after every `update()`."""
+        return self._table[0]
+
+    def resolve(self, symbol: str, side: str) -> Tuple[Token, Token]:
+        """Return the (in, out) tokens of an order.
+
+        Raises:
+            - ErrInvalidSymbolFormat: Raised when symbol does not follow "TOKEN1-TOKEN2" format
+            - ErrInvalidSide: Raised when side is not "buy" or "sell"
+            - ErrInvalidToken: Raised when token is not supported
+        """
+        pair = self._table[1].get((symbol, side))
+        if pair is not None:
+            return pair
+        return self._resolve_slow(symbol, side)
+
+    def _resolve_slow(self, symbol: str, side: str) -> Tuple[Token, Token]:
+        if "-" not in symbol:
+            raise ErrInvalidSymbolFormat(
+                f"Invalid symbol format: {symbol}. Expected format 'TOKEN1-TOKEN2'."
+            )
+
+        if side not in SIDES:
+            raise ErrInvalidSide(f"Invalid side: {side}. Expected 'buy' or 'sell'.")
+
+        token_parts = symbol.upper().split("-")
+        if len(token_parts) != 2:
+            raise ErrInvalidSymbolFormat(
+                f"Invalid symbol format: {symbol}. Expected format 'TOKEN1-TOKEN2'."
+            )
+
+        pair = self._table[1].get((symbol.upper(), side))
+        if pair is not None:
+            return pair
+
+        in_token_symbol, out_token_symbol = (
+            token_parts if side == "sell" else token_parts[::-1]
+        )
+        tokens = self._table[0]
+        if in_token_symbol not in tokens:
+            raise ErrInvalidToken(f"Invalid 'in' token symbol: {in_token_symbol}.")
+        if out_token_symbol not in tokens:
+            raise ErrInvalidToken(f"Invalid 'out' token symbol: {out_token_symbol}.")
+        # Same token on both sides, e.g. "USDC-USDC"
+        token = _to_token(tokens[in_token_symbol])
+        return token, token
+
+    def __getitem__(self, symbol: str) -> Any:
+        return self._table[0][symbol]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._table[0])
+
+    def __len__(self) -> int:
+        return len(self._table[0])
+
+    def __repr__(self) -> str:
+        return f"TokenRegistry({self._table[0]!r})"
+
+    def save(self, path: str) -> None:
+        """Write the token table to a cache file, atomically."""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(
+                    {
+                        "fetchedAt": time.time(),
+                        "tokens": self._table[0],
+                    },
+                    f,
+                )
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> Tuple[Optional["TokenRegistry"], float]:
+        """Read a cache file written by `save`.
+
+        Returns:
+            The registry (None if the file is missing or unreadable) and its age in seconds
+        """
+        try:
+            with open(path) as f:
+                cached = json.load(f)
+            return cls(cached["tokens"]), time.time() - cached["fetchedAt"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None, float("inf")
+
+
+def default_cache_path(base_url: str) -> str:
+    """Per-API token cache file under the user's cache directory."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    name = "".join(c if c.isalnum() else "_" for c in base_url)
+    return os.path.join(cache_home, "orbs_orderbook", f"supportedTokens-{name}.json")
+
+
+def _to_token(details: Any) -> Token:
+    if isinstance(details, Token):
+        return details
+    return Token(address=details["address"], decimals=details["decimals"])
+
+
+def _to_dict(details: Any) -> Dict[str, Any]:
+    if isinstance(details, Token):
+        return details.to_camelcase_dict()
+    return dict(details)
@@ -1,6 +1,21 @@
-from typing import Any, Dict, List, Optional, TypedDict
-from dataclasses import dataclass, asdict
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    TypedDict,
+    Union,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
+from dataclasses import dataclass
+from functools import lru_cache
+import dataclasses
 import json
+import threading
 
 
 def _snake_to_camel(snake_str: str) -> str:
@@ -8,6 +23,7 @@ def _snake_to_camel(snake_str: str) -> str:
     return components[0] + "".join(x.capitalize() for x in components[1:])
 
 
+@lru_cache(maxsize=1024)
 def _camel_to_snake(camel_str: str) -> str:
     return "".join(["_" + i.lower() if i.isupper() else i for i in camel_str]).lstrip(
         "_"
@@ -15,19 +31,227 @@ def _camel_to_snake(camel_str: str) -> str:
 
 
 def _parse_to_class(cls, data: dict):
-    snake_case_data = {_camel_to_snake(k): v for k, v in data.items()}
-    return cls(**snake_case_data)
+    return _decoder_for(cls)(data)
+
+
+Decoder = Callable[[Any], Any]
+
+_decoders: Dict[Any, Optional[Decoder]] = {}
+# Decoders being compiled. They are only added to `_decoders` once the whole
+# compile is done, so threads reading `_decoders` without the lock never see
+# a placeholder for a type that is still being compiled.
+_compiling: Dict[Any, Optional[Decoder]] = {}
+_compile_lock = threading.Lock()
+
+
+def _decoder_for(tp: Any) -> Decoder:
+    try:
+        decoder = _decoders[tp]
+    except KeyError:
+        with _compile_lock:
+            try:
+                decoder = _compile_decoder(tp)
+                _decoders.update(_compiling)
+            finally:
+                _compiling.clear()
+    return decoder if decoder is not None else _identity
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _compile_decoder(tp: Any) -> Optional[Decoder]:
+    """Build (once per type) a function decoding API JSON into `tp`.
+
+    Returns None for types that need no decoding, so containers of them are
+    passed through as-is.
+    """
+    if tp in _decoders:
+        return _decoders[tp]
+    if tp in _compiling:
+        return _compiling[tp]
+
+    if dataclasses.is_dataclass(tp):
+        # Registered before compiling fields, in case a type refers to itself
+        _compiling[tp] = lambda data: decoder(data)
+        decoder = _compile_dataclass_decoder(tp)
+    else:
+        decoder = _compile_generic_decoder(tp)
+
+    _compiling[tp] = decoder
+    return decoder
+
+
+def _compile_generic_decoder(tp: Any) -> Optional[Decoder]:
+    origin, args = get_origin(tp), get_args(tp)
+
+    if origin is Union:
+        non_none = [a for a in args if a is not type(None)]
+        if len(non_none) != 1:
+            return None
+        item = _compile_decoder(non_none[0])
+        if item is None:
+            return None
+        return lambda value: None if value is None else item(value)
+
+    if origin in (list, List):
+        item = _compile_decoder(args[0]) if args else None
+        if item is None:
+            return None
+        return lambda value: [item(v) for v in value]
+
+    if origin in (dict, Dict):
+        item = _compile_decoder(args[1]) if args else None
+        if item is None:
+            return None
+        return lambda value: {k: item(v) for k, v in value.items()}
+
+    return None
+
+
+def _compile_dataclass_decoder(cls: Any) -> Decoder:
+    hints = get_type_hints(cls)
+    # API key -> (field name, value decoder)
+    keys: Dict[str, Tuple[str, Optional[Decoder]]] = {}
+    optional = []
+    for field in dataclasses.fields(cls):
+        tp = hints[field.name]
+        entry = (field.name, _compile_decoder(tp))
+        keys[_snake_to_camel(field.name)] = entry
+        keys[field.name] = entry
+        if get_origin(tp) is Union and type(None) in get_args(tp):
+            optional.append(field.name)
+
+    def decode(data: Dict[str, Any]) -> Any:
+        kwargs = dict.fromkeys(optional)
+        for key, value in data.items():
+            entry = keys.get(key)
+            if entry is None:
+                # Unexpected spelling of a known field, or a field this SDK doesn't know
+                entry = keys.get(_camel_to_snake(key))
+                if entry is None:
+                    continue
+            name, decode_value = entry
+            kwargs[name] = value if decode_value is None else decode_value(value)
+        return cls(**kwargs)
+
+    if all(decode_value is None for _, decode_value in keys.values()):
+        names = {key: name for key, (name, _) in keys.items()}
+
+        def decode_flat(data: Dict[str, Any]) -> Any:
+            try:
+                return cls(**{names[key]: value for key, value in data.items()})
+            except (KeyError, TypeError):
+                # Unknown or missing keys
+                return decode(data)
+
+        return decode_flat
+
+    return decode
+
+
+def _slotted(cls=None, *, extra_slots: Tuple[str, ...] = ()):
+    """Rebuild a dataclass with `__slots__`, so instances have no `__dict__`.
+
+    Equivalent to `@dataclass(slots=True)`, which needs Python 3.10.
+    `extra_slots` adds slots that are not fields, e.g. for cached values.
+    """
+    if cls is None:
+        return lambda cls: _slotted(cls, extra_slots=extra_slots)
+
+    inherited = {
+        name for base in cls.__mro__[1:] for name in getattr(base, "__slots__", ())
+    }
+    cls_dict = dict(cls.__dict__)
+    cls_dict["__slots__"] = (
+        tuple(f.name for f in dataclasses.fields(cls) if f.name not in inherited)
+        + extra_slots
+    )
+    for name in cls_dict["__slots__"]:
+        cls_dict.pop(name, None)
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+
+    slotted_cls = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+    slotted_cls.__qualname__ = cls.__qualname__
+    return slotted_cls
+
+
+Encoder = Callable[[Any], Any]
+
+_encoders: Dict[Any, Optional[Encoder]] = {}
+
+
+def _compile_encoder(tp: Any) -> Optional[Encoder]:
+    """Build (once per type) a function converting values of `tp` for `to_camelcase_dict`.
+
+    Returns None for types whose values are used as-is. Containers are only
+    rebuilt if they hold dataclasses, so plain data is never copied.
+    """
+    if tp in _encoders:
+        return _encoders[tp]
+
+    encoder: Optional[Encoder] = None
+    origin, args = get_origin(tp), get_args(tp)
+    if dataclasses.is_dataclass(tp):
+        encoder = _encode_base
+    elif origin is Union:
+        non_none = [a for a in args if a is not type(None)]
+        item = _compile_encoder(non_none[0]) if len(non_none) == 1 else None
+        if item is not None:
+            encoder = lambda value: None if value is None else item(value)
+    elif origin in (list, List) and args:
+        item = _compile_encoder(args[0])
+        if item is not None:
+            encoder = lambda value: [item(v) for v in value]
+    elif origin in (dict, Dict) and args:
+        item = _compile_encoder(args[1])
+        if item is not None:
+            encoder = lambda value: {k: item(v) for k, v in value.items()}
 
+    _encoders[tp] = encoder
+    return encoder
 
+
+def _encode_base(value: Any) -> Any:
+    return value.to_camelcase_dict() if isinstance(value, Base) else value
+
+
+_camelcase_fields: Dict[type, List[Tuple[str, str, Optional[Encoder]]]] = {}
+
+
+def _fields_for(cls: type) -> List[Tuple[str, str, Optional[Encoder]]]:
+    fields = _camelcase_fields.get(cls)
+    if fields is None:
+        hints = get_type_hints(cls)
+        fields = _camelcase_fields[cls] = [
+            (f.name, _snake_to_camel(f.name), _compile_encoder(hints[f.name]))
+            for f in dataclasses.fields(cls)
+        ]
+    return fields
+
+
+@_slotted
 @dataclass
 class Base:
     def to_camelcase_dict(self) -> dict:
-        return {_snake_to_camel(k): v for k, v in asdict(self).items()}
+        """Fields as a dict with camelCase keys, including nested dataclasses.
+
+        Lists and dicts of plain data (e.g. `EIP712Message.message_data`) are
+        shared with this instance, not copied.
+        """
+        result = {}
+        for name, key, encode in _fields_for(type(self)):
+            value = getattr(self, name)
+            result[key] = value if encode is None else encode(value)
+        return result
 
     def to_json(self) -> str:
         return json.dumps(self.to_camelcase_dict())
 
 
+@_slotted
 @dataclass
 class PaginationResponse:
     page: int
@@ -36,6 +260,16 @@ class PaginationResponse:
     total_pages: int
 
 
+@_slotted
+@dataclass
+class PageCheckpoint(Base):
+    """Position in a paginated listing: record `index` of page `page`."""
+
+    page: int
+    index: int
+
+
+@_slotted
 @dataclass
 class CreateOrderInput(Base):
     price: str
@@ -45,18 +279,46 @@ class CreateOrderInput(Base):
     client_order_id: str
 
 
+def _json_dumps(value: Any) -> bytes:
+    # Imported here: `orbs_orderbook.utils` imports `Base` from this module
+    from orbs_orderbook.utils import json_dumps
+
+    return json_dumps(value)
+
+
+@_slotted(extra_slots=("_data_json",))
 @dataclass
 class EIP712Message(Base):
     domain_separator: Dict[str, str]
     message_types: Dict[str, Any]
     message_data: Dict[str, Any]
 
+    def message_data_json(self) -> bytes:
+        """`message_data` encoded as JSON. Encoded on first use, then cached.
+
+        Signed message data must not be modified, so the cache never goes stale.
+        """
+        try:
+            return self._data_json
+        except AttributeError:
+            self._data_json = _json_dumps(self.message_data)
+            return self._data_json
+
 
+def _order_request_json(
+    order: "CreateOrderInput", signature: str, message: EIP712Message
+) -> bytes:
+    head = _json_dumps({**order.to_camelcase_dict(), "eip712Sig": signature})
+    return b"".join((head[:-1], b',"eip712Msg":', message.message_data_json(), b"}"))
+
+
+@_slotted
 @dataclass
 class CreateOrderResponse(Base):
     order_id: str
 
 
+@_slotted
 @dataclass
 class OrderResponse(Base):
     order_id: str
@@ -72,19 +334,36 @@ class OrderResponse(Base):
     cancelled: bool
 
 
+@_slotted(extra_slots=("_request_json",))
 @dataclass
 class OrderWithSignature(Base):
     order: CreateOrderInput
     signature: str
     message: EIP712Message
 
+    def request_json(self) -> bytes:
+        """The order as JSON, as sent in create order requests.
+
+        Encoded on first use and cached, so batches and retries reuse it. A
+        signed order must not be modified; make a new one instead.
+        """
+        try:
+            return self._request_json
+        except AttributeError:
+            self._request_json = _order_request_json(
+                self.order, self.signature, self.message
+            )
+            return self._request_json
+
 
+@_slotted
 @dataclass
 class CreateMultipleOrdersInput(Base):
     symbol: str
     orders: List[OrderWithSignature]
 
 
+@_slotted
 @dataclass
 class CreateMultipleOrdersResponse(Base):
     created: List[OrderResponse]
@@ -93,16 +372,113 @@ class CreateMultipleOrdersResponse(Base):
     symbol: str
 
 
+@_slotted
+@dataclass
+class FailedOrdersChunk(Base):
+    symbol: str
+    orders: List[OrderWithSignature]
+    error: Exception
+
+
+@_slotted
+@dataclass
+class BulkCreateOrdersResponse(Base):
+    created: List[OrderResponse]
+    failed: List[FailedOrdersChunk]
+
+
+@_slotted
+@dataclass
+class Quote(Base):
+    """A resting order to keep on the book, for `OrderManager.requote`."""
+
+    side: str
+    price: str
+    size: str
+
+
+@_slotted
+@dataclass
+class RequoteResult(Base):
+    symbol: str
+    created: List[OrderResponse]
+    cancelled: List[str]
+    unchanged: int
+    failed_cancels: Dict[str, Exception]
+    failed_creates: List[FailedOrdersChunk]
+
+
+@_slotted
+@dataclass
+class RequestAttempt(Base):
+    """One attempt at a request, as reported to `RetryPolicy.on_attempt`."""
+
+    method: str
+    endpoint: str
+    attempt: int
+    latency: float
+    error: Optional[Exception]
+    hedged: bool
+
+
+@_slotted
+@dataclass
+class RequestEvent(Base):
+    """One HTTP request, as reported to `Observer.on_request`.
+
+    `status_code`, `time_to_headers` and `response_bytes` are None when no
+    response was received.
+    """
+
+    method: str
+    endpoint: str
+    status_code: Optional[int]
+    latency: float
+    time_to_headers: Optional[float]
+    request_bytes: int
+    response_bytes: Optional[int]
+    error: Optional[Exception]
+
+
+@_slotted
 @dataclass
 class CancelOrderResponse(Base):
     order_id: str
 
 
+@_slotted
+@dataclass
+class CancelResults(Base):
+    """Outcome of cancelling orders by one kind of id, by id. `not_found`
+    orders were already filled or cancelled.
+    """
+
+    cancelled: Dict[str, CancelOrderResponse]
+    not_found: List[str]
+    failed: Dict[str, Exception]
+
+
+@_slotted
+@dataclass
+class BulkCancelOrdersResponse(Base):
+    """Outcome of `cancel_orders`: `by_id` for the orders cancelled by order id,
+    `by_client_id` for the ones cancelled by client order id.
+
+    A symbol-wide cancel leaves both empty, and `symbol_response` is the
+    response of `cancel_all_orders_by_symbol` as returned by the API.
+    """
+
+    by_id: CancelResults
+    by_client_id: CancelResults
+    symbol_response: Optional[Dict[str, Any]]
+
+
 class SymbolResponse(TypedDict):
     symbol: str
     name: str
 
 
+@_slotted
 @dataclass
 class MarketDepthData(Base):
     asks: List[List[str]]
@@ -111,23 +487,27 @@ class MarketDepthData(Base):
     time: int
 
 
+@_slotted
 @dataclass
 class MarketDepthResponse(Base):
     code: str
     data: MarketDepthData
 
 
+@_slotted
 @dataclass
 class OrdersForUserResponse(Base, PaginationResponse):
     data: List[OrderResponse]
 
 
+@_slotted
 @dataclass
 class Token(Base):
     address: str
     decimals: int
 
 
+@_slotted
 @dataclass
 class SupportedTokensResponse(Base):
     tokens: Dict[str, Token]
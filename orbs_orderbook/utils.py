@@ -1,7 +1,14 @@
+import json
 from decimal import Decimal
+from typing import Any, Union
 
 from web3 import Web3
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from orbs_orderbook.types import Base
 
 
@@ -21,6 +28,61 @@ def convert_to_base_unit(*, token_amount: Decimal, decimals: int):
     return int(token_amount * multiplier)
 
 
+def to_fixed(value: str, scale: int) -> int:
+    """
+    Parse a decimal string to a fixed-point integer, without going through Decimal.
+
+    :param value: Decimal string, e.g. "0.865".
+    :param scale: Number of decimal places in the result, e.g. 8 gives 86500000.
+    :return: `value * 10**scale` as an int.
+    :raises ValueError: If `value` has more than `scale` decimal places.
+    """
+    whole, _, fraction = value.partition(".")
+    if len(fraction) > scale or "e" in value or "E" in value:
+        exact = Decimal(value).scaleb(scale)
+        if exact != exact.to_integral_value():
+            raise ValueError(f"{value} has more than {scale} decimal places")
+        return int(exact)
+    return int(whole + fraction.ljust(scale, "0"))
+
+
+def from_fixed(value: int, scale: int) -> Decimal:
+    """
+    Convert a fixed-point integer produced by `to_fixed` back to a Decimal.
+    """
+    return Decimal(value).scaleb(-scale)
+
+
+def json_loads(data: Union[bytes, str]) -> Any:
+    """
+    Parse JSON, with orjson when it is installed (`pip install orjson`).
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(data: Any) -> bytes:
+    """
+    Serialize a request body to compact JSON, with orjson when it is installed.
+
+    Dataclasses from `orbs_orderbook.types` are serialized with camelCase keys.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                data,
+                default=dataclass_serializer,
+                option=orjson.OPT_PASSTHROUGH_DATACLASS,
+            )
+        except TypeError:
+            # e.g. integers wider than 64 bits, which the json module handles
+            pass
+    return json.dumps(
+        data, default=dataclass_serializer, separators=(",", ":")
+    ).encode()
+
+
 def dataclass_serializer(obj):
     if isinstance(obj, Base):
         return obj.to_camelcase_dict()
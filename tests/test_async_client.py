@@ -0,0 +1,133 @@
+import asyncio
+import time
+
+import pytest
+
+from orbs_orderbook import (
+    AsyncOrderBookSDK,
+    CreateOrderInput,
+    EIP712Message,
+    OrderWithSignature,
+)
+from orbs_orderbook.exceptions import ErrApiRequest, ErrUnauthorized
+from orbs_orderbook.testing import StubOrderBookServer
+
+
+def test_concurrent_requests_share_pool():
+    async def run(server):
+        async with AsyncOrderBookSDK(base_url=server.url, api_key="key") as client:
+            assert "USDC" in client.supported_tokens
+
+            start = time.perf_counter()
+            results = await asyncio.gather(
+                *(client.get_market_depth("MATIC-USDC", 5) for _ in range(30))
+            )
+            return results, time.perf_counter() - start
+
+    with StubOrderBookServer(api_key="key", latency=0.05) as server:
+        results, elapsed = asyncio.run(run(server))
+
+    assert [r.code for r in results] == ["OK"] * 30
+    # Sequentially these would take 30 * 50ms.
+    assert elapsed < 0.75
+    assert server.connections_opened <= 30
+
+
+def test_create_and_cancel_order():
+    order = CreateOrderInput(
+        price="0.865",
+        size="40",
+        symbol="MATIC-USDC",
+        side="buy",
+        client_order_id="550e8400-e29b-41d4-a716-446655440000",
+    )
+    message = EIP712Message(domain_separator={}, message_types={}, message_data={})
+
+    async def run(server):
+        async with AsyncOrderBookSDK(base_url=server.url, api_key="key") as client:
+            created = await client.create_order(
+                order_input=order, signature="0x", message=message
+            )
+            fetched = await client.get_order_by_client_id(order.client_order_id)
+            cancelled = await client.cancel_order_by_id(created.order_id)
+            return created, fetched, cancelled
+
+    with StubOrderBookServer(api_key="key") as server:
+        created, fetched, cancelled = asyncio.run(run(server))
+
+    assert fetched.order_id == created.order_id == cancelled.order_id
+    assert fetched.price == "0.865"
+
+
+def test_errors_are_mapped():
+    async def run(server, api_key):
+        async with AsyncOrderBookSDK(base_url=server.url, api_key=api_key) as client:
+            await client.get_order_by_id("missing")
+
+    with StubOrderBookServer(api_key="key") as server:
+        with pytest.raises(ErrApiRequest) as e:
+            asyncio.run(run(server, "key"))
+        assert e.value.status_code == 404
+
+        with pytest.raises(ErrUnauthorized):
+            asyncio.run(run(server, "wrong"))
+
+
+def test_create_orders_bulk():
+    orders = [
+        OrderWithSignature(
+            order=CreateOrderInput(
+                price="0.865",
+                size="40",
+                symbol="MATIC-USDC",
+                side="buy",
+                client_order_id=str(i),
+            ),
+            signature="0x",
+            message=EIP712Message(
+                domain_separator={}, message_types={}, message_data={}
+            ),
+        )
+        for i in range(45)
+    ]
+
+    async def run(server):
+        async with AsyncOrderBookSDK(base_url=server.url, api_key="key") as client:
+            return await client.create_orders_bulk(orders, max_in_flight=3)
+
+    with StubOrderBookServer(api_key="key") as server:
+        res = asyncio.run(run(server))
+
+    assert res.failed == []
+    assert len(res.created) == 45
+
+
+def test_cancel_orders():
+    async def run(server):
+        async with AsyncOrderBookSDK(base_url=server.url, api_key="key") as client:
+            created = await client.create_order(
+                order_input=CreateOrderInput(
+                    price="0.865",
+                    size="40",
+                    symbol="MATIC-USDC",
+                    side="buy",
+                    client_order_id="1",
+                ),
+                signature="0x",
+                message=EIP712Message(
+                    domain_separator={}, message_types={}, message_data={}
+                ),
+            )
+            by_id = await client.cancel_orders(
+                ids=[created.order_id, "missing"], max_in_flight=2
+            )
+            by_symbol = await client.cancel_orders(symbol="MATIC-USDC")
+            return created, by_id, by_symbol
+
+    with StubOrderBookServer(api_key="key") as server:
+        created, by_id, by_symbol = asyncio.run(run(server))
+
+    assert list(by_id.by_id.cancelled) == [created.order_id]
+    assert by_id.by_id.not_found == ["missing"]
+    assert by_symbol.by_id.cancelled == {}
+    assert by_symbol.symbol_response == {"orders": []}
@@ -0,0 +1,189 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from orbs_orderbook import AsyncOrderBookSDK, OrderBookSDK
+from orbs_orderbook.cache import ResponseCache
+from orbs_orderbook.exceptions import ErrApiRequest
+from orbs_orderbook.testing import StubOrderBookServer
+from orbs_orderbook.types import CreateOrderInput, EIP712Message
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_entries_expire_per_endpoint_ttl():
+    clock = Clock()
+    cache = ResponseCache({"market_depth": 0.1, "symbols": 60}, clock=clock)
+    fetches = []
+
+    def fetch(value):
+        return lambda: fetches.append(value) or value
+
+    assert cache.get(("market_depth", "MATIC-USDC", 5), fetch(1)) == 1
+    assert cache.get(("symbols",), fetch(2)) == 2
+    clock.now = 0.05
+    assert cache.get(("market_depth", "MATIC-USDC", 5), fetch(3)) == 1
+    clock.now = 0.2
+    assert cache.get(("market_depth", "MATIC-USDC", 5), fetch(4)) == 4
+    assert cache.get(("symbols",), fetch(5)) == 2
+
+    assert fetches == [1, 2, 4]
+    assert (cache.hits, cache.misses) == (2, 3)
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = ResponseCache({"order": 60}, max_entries=2)
+
+    cache.get(("order", "a"), lambda: "a")
+    cache.get(("order", "b"), lambda: "b")
+    cache.get(("order", "a"), lambda: "a2")
+    cache.get(("order", "c"), lambda: "c")
+
+    assert len(cache) == 2
+    assert cache.get(("order", "a"), lambda: "a3") == "a"
+    assert cache.get(("order", "b"), lambda: "b2") == "b2"
+
+
+def test_concurrent_requests_are_coalesced():
+    cache = ResponseCache()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(2)
+        return "depth"
+
+    with ThreadPoolExecutor(8) as executor:
+        futures = [
+            executor.submit(cache.get, ("market_depth", "MATIC-USDC", 5), fetch)
+            for _ in range(8)
+        ]
+        while cache.coalesced < 7:
+            time.sleep(0.001)
+        release.set()
+        results = [f.result() for f in futures]
+
+    assert results == ["depth"] * 8
+    assert len(calls) == 1
+
+
+def test_failures_are_shared_but_not_cached():
+    cache = ResponseCache()
+
+    async def run():
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ErrApiRequest(500, "boom")
+
+        key = ("order", "a")
+        results = await asyncio.gather(
+            cache.get_async(key, fail),
+            cache.get_async(key, fail),
+            return_exceptions=True,
+        )
+
+        async def ok():
+            return "order"
+
+        return results, await cache.get_async(key, ok)
+
+    results, value = asyncio.run(run())
+
+    assert [type(r) for r in results] == [ErrApiRequest, ErrApiRequest]
+    assert value == "order"
+    assert cache.misses == 2
+
+
+def test_invalidation_during_flight_is_not_cached():
+    cache = ResponseCache()
+    key = ("market_depth", "MATIC-USDC", 5)
+
+    def fetch():
+        assert cache.invalidate("market_depth", "MATIC-USDC") == 0
+        return "before write"
+
+    assert cache.get(key, fetch) == "before write"
+    assert cache.get(key, lambda: "after write") == "after write"
+    assert cache.get(key, lambda: "later") == "after write"
+
+
+def test_sdk_serves_repeated_reads_from_cache():
+    with StubOrderBookServer(api_key="key") as server:
+        with OrderBookSDK(
+            base_url=server.url, api_key="key", cache=ResponseCache()
+        ) as client:
+            served = server.requests_served
+            depths = [client.get_market_depth("MATIC-USDC", 5) for _ in range(10)]
+            client.get_market_depth("MATIC-USDC", 10)
+            client.get_symbols()
+            client.get_symbols()
+            client.get_supported_tokens()
+
+            assert depths[0] is depths[-1]
+            # The supported tokens were fetched on construction
+            assert server.requests_served - served == 3
+
+
+def test_writes_invalidate_related_reads(server_with_order):
+    server, order_id = server_with_order
+    cache = ResponseCache({"order": 60, "market_depth": 60})
+    with OrderBookSDK(base_url=server.url, api_key="key", cache=cache) as client:
+        assert not client.get_order_by_id(order_id).cancelled
+        client.get_market_depth("MATIC-USDC", 5)
+        client.get_market_depth("ETH-USDC", 5)
+
+        client.cancel_order_by_id(order_id)
+
+        # Only the supported tokens are left
+        assert len(cache) == 1
+        assert client.get_order_by_id(order_id).cancelled
+
+
+def test_async_sdk_coalesces_reads(server_with_order):
+    server, order_id = server_with_order
+    server.latency = 0.02
+
+    async def run():
+        async with AsyncOrderBookSDK(
+            base_url=server.url, api_key="key", cache=ResponseCache()
+        ) as client:
+            served = server.requests_served
+            orders = await asyncio.gather(
+                *(client.get_order_by_id(order_id) for _ in range(10))
+            )
+            return orders, server.requests_served - served
+
+    orders, sent = asyncio.run(run())
+
+    assert {o.order_id for o in orders} == {order_id}
+    assert sent == 1
+
+
+@pytest.fixture
+def server_with_order():
+    with StubOrderBookServer(api_key="key") as server:
+        with OrderBookSDK(base_url=server.url, api_key="key") as client:
+            res = client.create_order(
+                order_input=CreateOrderInput(
+                    price="0.86",
+                    size="40",
+                    symbol="MATIC-USDC",
+                    side="buy",
+                    client_order_id=None,
+                ),
+                signature="0x" + "ab" * 65,
+                message=EIP712Message(
+                    domain_separator={}, message_types={}, message_data={}
+                ),
+            )
+        yield server, res.order_id
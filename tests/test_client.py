@@ -0,0 +1,146 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from orbs_orderbook import (
+    CreateOrderInput,
+    EIP712Message,
+    OrderBookSDK,
+    OrderWithSignature,
+)
+from orbs_orderbook.exceptions import ErrApiRequest, ErrUnauthorized
+from orbs_orderbook.testing import StubOrderBookServer
+
+
+@pytest.fixture
+def server():
+    with StubOrderBookServer(api_key="key") as server:
+        yield server
+
+
+def test_requests_reuse_pooled_connection(server):
+    with OrderBookSDK(base_url=server.url, api_key="key") as client:
+        for _ in range(5):
+            client.get_symbols()
+
+    assert server.requests_served == 6
+    assert server.connections_opened == 1
+
+
+def test_pool_size_limits_connections(server):
+    with OrderBookSDK(
+        base_url=server.url, api_key="key", pool_maxsize=2, pool_block=True
+    ) as client:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda _: client.get_symbols(), range(32)))
+
+    assert server.connections_opened <= 2
+
+
+def test_errors_are_mapped(server):
+    with OrderBookSDK(base_url=server.url, api_key="key") as client:
+        with pytest.raises(ErrApiRequest) as e:
+            client.get_order_by_id("missing")
+        assert e.value.status_code == 404
+
+    with pytest.raises(ErrUnauthorized):
+        OrderBookSDK(base_url=server.url, api_key="wrong")
+
+
+def _signed_order(symbol, i):
+    return OrderWithSignature(
+        order=CreateOrderInput(
+            price=f"0.{8000 + i}",
+            size="10",
+            symbol=symbol,
+            side="buy",
+            client_order_id=f"{symbol}-{i}",
+        ),
+        signature="0x",
+        message=EIP712Message(domain_separator={}, message_types={}, message_data={}),
+    )
+
+
+def test_create_orders_bulk_chunks_by_symbol(server):
+    orders = [_signed_order("MATIC-USDC", i) for i in range(25)] + [
+        _signed_order("FOO-USDC", i) for i in range(3)
+    ]
+
+    with OrderBookSDK(base_url=server.url, api_key="key") as client:
+        res = client.create_orders_bulk(orders, max_in_flight=4)
+
+    assert sorted(o.client_order_id for o in res.created) == sorted(
+        o.order.client_order_id for o in orders[:25]
+    )
+    assert len(res.failed) == 1
+    assert res.failed[0].symbol == "FOO-USDC"
+    assert res.failed[0].orders == orders[25:]
+    assert res.failed[0].error.status_code == 400
+
+
+def test_cancel_orders_fans_out_and_aggregates(server):
+    orders = [_signed_order("MATIC-USDC", i) for i in range(6)]
+
+    with OrderBookSDK(base_url=server.url, api_key="key") as client:
+        created = client.create_orders_bulk(orders).created
+        server.latency = 0.05
+        server.add_fault(method="DELETE", status=500, apply=False)
+        res = client.cancel_orders(
+            ids=[o.order_id for o in created[:3]] + ["missing"],
+            client_ids=[o.client_order_id for o in created[3:]],
+            max_in_flight=8,
+        )
+
+    ids = [o.order_id for o in created[:3]] + ["missing"]
+    client_ids = [o.client_order_id for o in created[3:]]
+    by_id, by_client_id = res.by_id, res.by_client_id
+    assert sorted([*by_id.cancelled, *by_id.not_found, *by_id.failed]) == sorted(ids)
+    assert sorted(
+        [*by_client_id.cancelled, *by_client_id.not_found, *by_client_id.failed]
+    ) == sorted(client_ids)
+    # The fault hits whichever cancel arrives first
+    failed = [*by_id.failed.values(), *by_client_id.failed.values()]
+    assert [e.status_code for e in failed] == [500]
+    assert set(by_id.not_found) <= {"missing"}
+    assert not by_client_id.not_found
+    cancelled = [*by_id.cancelled.values(), *by_client_id.cancelled.values()]
+    assert all(server.orders[o.order_id]["cancelled"] for o in cancelled)
+    assert res.symbol_response is None
+    # Sent concurrently: 7 requests in about the latency of one
+    assert server.connections_opened > 1
+
+
+def test_cancel_orders_by_symbol_uses_one_request(server):
+    orders = [_signed_order("MATIC-USDC", i) for i in range(12)]
+
+    with OrderBookSDK(base_url=server.url, api_key="key") as client:
+        created = client.create_orders_bulk(orders).created
+        served = server.requests_served
+        res = client.cancel_orders(symbol="MATIC-USDC")
+
+        with pytest.raises(ValueError):
+            client.cancel_orders(ids=["1"], symbol="MATIC-USDC")
+
+    assert server.requests_served - served == 1
+    # Both chunks are created concurrently, so the server may store them in either order
+    assert sorted(res.symbol_response["orders"]) == sorted(o.order_id for o in created)
+    assert (res.by_id.cancelled, res.by_client_id.cancelled) == ({}, {})
+    assert all(o["cancelled"] for o in server.orders.values())
+
+
+def test_cancel_orders_keeps_ids_of_each_kind_apart(server):
+    orders = [_signed_order("MATIC-USDC", i) for i in range(2)]
+
+    with OrderBookSDK(base_url=server.url, api_key="key") as client:
+        created = client.create_orders_bulk(orders).created
+        order_id = created[0].order_id
+        served = server.requests_served
+        # A duplicated order id, and a client order id equal to an order id
+        res = client.cancel_orders(
+            ids=[order_id, order_id], client_ids=[created[1].client_order_id, order_id]
+        )
+
+    assert server.requests_served - served == 3
+    assert list(res.by_id.cancelled) == [order_id]
+    assert list(res.by_client_id.cancelled) == [created[1].client_order_id]
+    assert res.by_client_id.not_found == [order_id]
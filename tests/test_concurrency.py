@@ -0,0 +1,169 @@
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+from eth_account import Account
+from eth_account.messages import encode_typed_data
+
+from orbs_orderbook import CreateOrderInput, OrderBookSDK, OrderSigner
+from orbs_orderbook.retry import RetryPolicy
+from orbs_orderbook.testing import StubOrderBookServer
+from orbs_orderbook.testing.stub_server import STUB_TOKENS
+from orbs_orderbook.types import (
+    OrderResponse,
+    OrderWithSignature,
+    _decoders,
+    _parse_to_class,
+)
+
+PRIVATE_KEY = "0x" + "a" * 64
+THREADS = 16
+
+
+@pytest.fixture
+def server():
+    with StubOrderBookServer(api_key="key") as server:
+        yield server
+
+
+def _order(price="0.85", client_order_id=None):
+    return CreateOrderInput(
+        price=price,
+        size="100",
+        symbol="MATIC-USDC",
+        side="buy",
+        client_order_id=client_order_id or str(uuid.uuid4()),
+    )
+
+
+def _recover(signed):
+    signable = encode_typed_data(
+        signed.message.domain_separator,
+        signed.message.message_types,
+        signed.message.message_data,
+    )
+    return Account.recover_message(signable, signature=signed.signature)
+
+
+def _run_concurrently(fn, count=THREADS):
+    barrier = threading.Barrier(count)
+
+    def run(i):
+        barrier.wait()
+        return fn(i)
+
+    with ThreadPoolExecutor(max_workers=count) as executor:
+        return list(executor.map(run, range(count)))
+
+
+def test_shared_client_and_signer(server):
+    with OrderBookSDK(
+        base_url=server.url, api_key="key", pool_maxsize=THREADS
+    ) as client:
+        signer = OrderSigner(PRIVATE_KEY, client)
+
+        def trade(i):
+            order = _order(price=f"0.8{i % 10}", client_order_id=f"c{i}")
+            signature, message = signer.prepare_and_sign_order(order)
+            res = client.create_order(
+                order_input=order, signature=signature, message=message
+            )
+            fetched = client.get_order_by_client_id(f"c{i}")
+            assert fetched.order_id == res.order_id
+            assert fetched.price == order.price
+            client.cancel_order_by_id(res.order_id)
+            return OrderWithSignature(order=order, signature=signature, message=message)
+
+        signed = _run_concurrently(trade)
+
+    assert len({s.message.message_data["nonce"] for s in signed}) == THREADS
+    assert {_recover(s) for s in signed} == {Account.from_key(PRIVATE_KEY).address}
+    assert all(o["cancelled"] for o in server.orders.values())
+    assert len(server.orders) == THREADS
+    # Every thread has its own session, but they share one connection pool
+    assert server.connections_opened <= THREADS
+
+
+def test_connections_are_reused_across_threads(server):
+    with OrderBookSDK(
+        base_url=server.url, api_key="key", pool_maxsize=2, pool_block=True
+    ) as client:
+        _run_concurrently(lambda i: [client.get_symbols() for _ in range(5)])
+
+    assert server.connections_opened <= 2
+
+
+def test_concurrent_sign_orders(server):
+    with OrderBookSDK(base_url=server.url, api_key="key") as client:
+        signer = OrderSigner(PRIVATE_KEY, client)
+        try:
+            deadline = datetime.now() + timedelta(hours=1)
+            batches = _run_concurrently(
+                lambda i: signer.sign_orders(
+                    [_order() for _ in range(40)], deadline=deadline, workers=2
+                ),
+                count=3,
+            )
+        finally:
+            signer.close()
+
+    signed = [s for batch in batches for s in batch]
+    assert len({s.message.message_data["nonce"] for s in signed}) == len(signed)
+    for s in signed[::10]:
+        assert _recover(s) == Account.from_key(PRIVATE_KEY).address
+
+
+def test_signing_while_tokens_are_replaced(mocker):
+    client = mocker.Mock()
+    client.supported_tokens = STUB_TOKENS
+    signer = OrderSigner(PRIVATE_KEY, client)
+    stop = threading.Event()
+
+    def replace_tokens():
+        while not stop.is_set():
+            client.supported_tokens = dict(STUB_TOKENS)
+
+    replacer = threading.Thread(target=replace_tokens)
+    replacer.start()
+    try:
+        signed = _run_concurrently(
+            lambda i: [signer.prepare_and_sign_order(_order()) for _ in range(20)]
+        )
+    finally:
+        stop.set()
+        replacer.join()
+
+    nonces = {message.message_data["nonce"] for b in signed for _, message in b}
+    assert len(nonces) == THREADS * 20
+
+
+def test_concurrent_first_decode(mocker):
+    mocker.patch.dict(_decoders, clear=True)
+    data = {
+        "orderId": "1",
+        "clientOrderId": "c1",
+        "userId": "u",
+        "price": "0.85",
+        "symbol": "MATIC-USDC",
+        "size": "100",
+        "pendingSize": "0",
+        "filledSize": "0",
+        "side": "buy",
+        "timestamp": "2024-05-01T00:00:00Z",
+        "cancelled": False,
+    }
+
+    decoded = _run_concurrently(lambda i: _parse_to_class(OrderResponse, data))
+
+    assert all(d.order_id == "1" for d in decoded)
+
+
+def test_shared_retry_policy_hedges_from_many_threads(server):
+    policy = RetryPolicy(hedge_after=0.05)
+    with OrderBookSDK(base_url=server.url, api_key="key", retry_policy=policy) as c:
+        symbols = _run_concurrently(lambda i: c.get_symbols())
+    policy.close()
+
+    assert all(s == symbols[0] for s in symbols)
@@ -0,0 +1,164 @@
+import asyncio
+from decimal import Decimal
+
+import pytest
+
+from orbs_orderbook import AsyncOrderBookSDK, OrderBookSDK
+from orbs_orderbook.depth import CompactMarketDepth, DepthLevels
+from orbs_orderbook.testing import StubOrderBookServer
+
+DATA = {
+    "symbol": "MATIC-USDC",
+    "time": 1714521600000,
+    "asks": [["0.87", "40"], ["0.88", "50.5"], ["0.9", "10"]],
+    "bids": [["0.86", "30"], ["0.855", "20"]],
+}
+
+
+def test_levels_are_parsed_to_fixed_point():
+    depth = CompactMarketDepth.from_response(DATA)
+
+    assert depth.asks.prices.tolist() == [87000000, 88000000, 90000000]
+    assert depth.asks.sizes.tolist() == [4000000000, 5050000000, 1000000000]
+    assert depth.bids[0] == (Decimal("0.86"), Decimal("30"))
+    assert depth.asks.to_lists() == [
+        ["0.87000000", "40.00000000"],
+        ["0.88000000", "50.50000000"],
+        ["0.90000000", "10.00000000"],
+    ]
+    assert (depth.symbol, depth.time) == ("MATIC-USDC", 1714521600000)
+
+
+def test_values_that_dont_fit_a_given_scale_are_rejected():
+    with pytest.raises(ValueError):
+        DepthLevels.from_levels([["0.123456789", "1"]], price_scale=8)
+    with pytest.raises(OverflowError):
+        DepthLevels.from_levels([["1", "100000000000"]], size_scale=8)
+
+    levels = DepthLevels.from_levels([["1", "100000000000"]], size_scale=6)
+    assert levels[0] == (Decimal(1), Decimal(100000000000))
+
+
+def test_default_scales_keep_every_decimal_place():
+    levels = DepthLevels.from_levels(
+        [["0.123456789", "1"], ["0.2", "0.000000000000000001"]]
+    )
+
+    assert (levels.price_scale, levels.size_scale) == (9, 18)
+    assert list(levels) == [
+        (Decimal("0.123456789"), Decimal(1)),
+        (Decimal("0.2"), Decimal("1e-18")),
+    ]
+    assert levels.cumulative_sizes().tolist()[-1] == 10**18 + 1
+
+
+def test_default_scales_round_sizes_whose_total_doesnt_fit():
+    size = "12345.123456789012345678"
+    levels = DepthLevels.from_levels([["1", size], ["2", "100000000000"]])
+
+    assert levels.size_scale == 7
+    assert levels.sizes.tolist() == [123451234568, 1000000000000000000]
+    assert levels.cumulative_sizes().tolist()[-1] == 1000000123451234568
+
+    levels = DepthLevels.from_levels([["1", size]])
+    assert levels.size_scale == 14
+    assert levels[0][1] == Decimal(size).quantize(Decimal("1e-14"))
+
+
+def test_slices_share_buffers():
+    asks = CompactMarketDepth.from_response(DATA).asks
+
+    top = asks[:2]
+
+    assert len(top) == 2
+    assert top.prices.obj is asks.prices.obj
+    assert top.cumulative_sizes().tolist() == [4000000000, 9050000000]
+    assert asks.cumulative_sizes().tolist()[-1] == 10050000000
+
+
+def test_diff_against_previous_snapshot():
+    previous = CompactMarketDepth.from_response(DATA)
+    current = CompactMarketDepth.from_response(
+        {
+            **DATA,
+            "asks": [["0.87", "40"], ["0.89", "5"], ["0.9", "12"]],
+            "bids": [["0.865", "1"], ["0.86", "30"]],
+        }
+    )
+
+    changes = current.diff(previous)
+
+    assert list(changes["asks"]) == [
+        (Decimal("0.88"), Decimal("-50.5")),
+        (Decimal("0.89"), Decimal("5")),
+        (Decimal("0.9"), Decimal("2")),
+    ]
+    assert list(changes["bids"]) == [
+        (Decimal("0.865"), Decimal("1")),
+        (Decimal("0.855"), Decimal("-20")),
+    ]
+    assert current.diff(current) == {
+        "asks": current.asks[:0],
+        "bids": current.bids[:0],
+    }
+    with pytest.raises(ValueError):
+        current.asks.diff(previous.bids)
+
+
+def test_diff_across_scales():
+    previous = DepthLevels.from_levels([["0.87", "40"], ["0.88", "1"]])
+    current = DepthLevels.from_levels([["0.87", "40.000000001"], ["0.88", "1"]])
+
+    changes = current.diff(previous)
+
+    assert (changes.price_scale, changes.size_scale) == (8, 9)
+    assert list(changes) == [(Decimal("0.87"), Decimal("1e-9"))]
+    assert list(previous.diff(current)) == [(Decimal("0.87"), Decimal("-1e-9"))]
+
+
+def test_numpy_views():
+    numpy = pytest.importorskip("numpy")
+    asks = CompactMarketDepth.from_response(DATA).asks
+
+    prices, sizes = asks[1:].numpy()
+
+    assert prices.dtype == numpy.int64
+    assert prices.tolist() == [88000000, 90000000]
+    asks.sizes[2] = 0
+    assert sizes.tolist() == [5050000000, 0]
+
+
+def test_get_market_depth_compact():
+    with StubOrderBookServer(api_key="key") as server:
+        server.depth["MATIC-USDC"] = {
+            "asks": dict(DATA["asks"]),
+            "bids": dict(DATA["bids"]),
+        }
+        with OrderBookSDK(base_url=server.url, api_key="key") as client:
+            depth = client.get_market_depth_compact("MATIC-USDC", 2)
+            listed = client.get_market_depth("MATIC-USDC", 2).data
+
+        async def get_async():
+            async with AsyncOrderBookSDK(base_url=server.url, api_key="key") as client:
+                return await client.get_market_depth_compact("MATIC-USDC", 2)
+
+        fetched_async = asyncio.run(get_async())
+
+    assert (fetched_async.asks, fetched_async.bids) == (depth.asks, depth.bids)
+    assert [[f"{p:f}", f"{s:f}"] for p, s in depth.asks] == [
+        [f"{Decimal(p):.8f}", f"{Decimal(s):.8f}"] for p, s in listed.asks
+    ]
+    assert len(depth.bids) == 2
+
+
+def test_get_market_depth_compact_keeps_fine_sizes():
+    with StubOrderBookServer(api_key="key") as server:
+        server.depth["MATIC-USDC"] = {
+            "asks": {"0.87": "1.000000000000000001"},
+            "bids": {"0.86": "30"},
+        }
+        with OrderBookSDK(base_url=server.url, api_key="key") as client:
+            depth = client.get_market_depth_compact("MATIC-USDC", 5)
+
+    assert depth.asks[0] == (Decimal("0.87"), Decimal("1.000000000000000001"))
+    assert depth.bids.size_scale == 8
@@ -0,0 +1,91 @@
+from types import SimpleNamespace
+
+import pytest
+from eth_account import Account
+from eth_account.messages import encode_typed_data
+
+from orbs_orderbook import CreateOrderInput, OrderSigner
+from orbs_orderbook.eip712 import TypedDataSchema
+from orbs_orderbook.testing.stub_server import STUB_TOKENS
+
+PRIVATE_KEY = "0xaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa"
+
+
+@pytest.fixture
+def signer():
+    return OrderSigner(
+        private_key=PRIVATE_KEY, sdk=SimpleNamespace(supported_tokens=STUB_TOKENS)
+    )
+
+
+@pytest.mark.parametrize(
+    "price, size, side",
+    [
+        ("0.865", "40", "buy"),
+        ("0.87", "40", "sell"),
+        ("20000", "123734734873497834", "sell"),
+        ("0.00000001", "1", "buy"),
+    ],
+)
+def test_compiled_schema_matches_encode_typed_data(signer, price, size, side):
+    order = CreateOrderInput(
+        price=price, size=size, symbol="MATIC-USDC", side=side, client_order_id="1"
+    )
+    signature, message = signer.prepare_and_sign_order(order)
+
+    expected = encode_typed_data(
+        full_message={
+            "primaryType": "RePermitWitnessTransferFrom",
+            "domain": signer._construct_domain_data(),
+            "types": signer._construct_message_types(),
+            "message": message.message_data,
+        }
+    )
+
+    assert signer._schema.encode(message.message_data) == expected
+    assert Account.recover_message(expected, signature=signature) == (
+        Account.from_key(PRIVATE_KEY).address
+    )
+
+
+def test_generic_schema_matches_encode_typed_data():
+    domain = {
+        "name": "Ether Mail",
+        "version": "1",
+        "chainId": 1,
+        "verifyingContract": "0xCcCCccccCCCCcCCCCCCcCcCccCcCCCcCcccccccC",
+        "salt": b"decafbeef",
+    }
+    types = {
+        "Person": [
+            {"name": "name", "type": "string"},
+            {"name": "wallets", "type": "address[]"},
+            {"name": "active", "type": "bool"},
+        ],
+        "Mail": [
+            {"name": "from", "type": "Person"},
+            {"name": "to", "type": "Person[]"},
+            {"name": "contents", "type": "string"},
+            {"name": "attachment", "type": "bytes"},
+            {"name": "priority", "type": "int8"},
+        ],
+    }
+    message = {
+        "from": {
+            "name": "Cow",
+            "wallets": ["0xCD2a3d9F938E13CD947Ec05AbC7FE734Df8DD826"],
+            "active": True,
+        },
+        "to": [
+            {"name": "Bob", "wallets": [], "active": False},
+        ],
+        "contents": "Hello, Bob!",
+        "attachment": "0xdeadbeef",
+        "priority": -3,
+    }
+
+    schema = TypedDataSchema(
+        primary_type="Mail", domain_data=domain, message_types=types
+    )
+
+    assert schema.encode(message) == encode_typed_data(domain, types, message)
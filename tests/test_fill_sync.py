@@ -0,0 +1,123 @@
+from decimal import Decimal
+
+import pytest
+
+from orbs_orderbook import OrderBookSDK
+from orbs_orderbook.fill_sync import FillStore, FillSync
+from orbs_orderbook.testing import StubOrderBookServer
+from orbs_orderbook.types import OrderResponse, _parse_to_class
+
+
+def _fill(order_id, *, side="buy", price="0.85", filled="10", minute=0):
+    return {
+        "orderId": order_id,
+        "clientOrderId": None,
+        "userId": "00000000-0000-0000-0000-000000000001",
+        "price": price,
+        "symbol": "MATIC-USDC",
+        "size": "10",
+        "pendingSize": "0",
+        "filledSize": filled,
+        "side": side,
+        "timestamp": f"2023-11-01T10:{minute:02d}:00Z",
+        "cancelled": False,
+    }
+
+
+@pytest.fixture
+def server():
+    with StubOrderBookServer(api_key="key") as server:
+        yield server
+
+
+@pytest.fixture
+def client(server):
+    with OrderBookSDK(base_url=server.url, api_key="key") as client:
+        yield client
+
+
+def test_sync_fetches_only_new_pages(server, client, mocker):
+    server.fills = [_fill(f"order-{i}", minute=i % 60) for i in range(30)][::-1]
+    store = FillStore()
+    sync = FillSync(client, store, page_size=10)
+
+    assert len(sync.sync()) == 30
+
+    server.fills.insert(0, _fill("order-30", side="sell", price="0.9", minute=59))
+    fetch = mocker.spy(client, "get_filled_orders_for_user")
+    new = sync.sync()
+
+    assert [fill.order_id for fill in new] == ["order-30"]
+    assert fetch.call_count == 1
+    assert store.position("MATIC-USDC") == Decimal("290")
+
+
+def test_sync_generated_fills(server, client):
+    server.add_fills(250)
+    store = FillStore()
+    assert len(FillSync(client, store).sync()) == 250
+
+    server.add_fills(5, seed=1)
+    new = FillSync(client, store).sync()
+
+    assert len(new) == 5
+    assert new[0].timestamp >= store.fills("MATIC-USDC")[0].timestamp
+
+
+def test_partial_fill_updates_position(server, client):
+    server.fills = [_fill("order-1", filled="4")]
+    store = FillStore()
+    sync = FillSync(client, store)
+    sync.sync()
+
+    server.fills = [_fill("order-1", filled="10", minute=5)]
+    assert len(sync.sync()) == 1
+
+    assert len(store) == 1
+    assert store.get("order-1").filled_size == "10"
+    assert store.position("MATIC-USDC") == Decimal("10")
+    assert store.position("MATIC-USDC", until="2023-11-01T10:01:00Z") == Decimal("4")
+
+
+def test_position_and_pnl():
+    store = FillStore()
+    store.append(
+        _parse(f)
+        for f in [
+            _fill("a", side="buy", price="0.80", filled="100", minute=1),
+            _fill("b", side="sell", price="0.90", filled="40", minute=2),
+        ]
+    )
+
+    assert store.position("MATIC-USDC") == Decimal("60")
+    assert store.quote_total("MATIC-USDC") == Decimal("-44")
+    assert store.pnl("MATIC-USDC", "0.85") == Decimal("7")
+    assert store.position("OTHER-USDC") == 0
+    assert [
+        f.order_id for f in store.fills("MATIC-USDC", since="2023-11-01T10:02:00Z")
+    ] == ["b"]
+
+
+def test_store_survives_restart(tmp_path):
+    path = str(tmp_path / "fills.jsonl")
+    with FillStore(path) as store:
+        store.append([_parse(_fill("a", filled="3")), _parse(_fill("b", side="sell"))])
+        store.append([_parse(_fill("a", filled="5"))])
+
+    # A crash in the middle of a write leaves a partial record
+    with open(path, "ab") as f:
+        f.write(b'{"orderId": "c"')
+
+    with FillStore(path) as store:
+        assert len(store) == 2
+        assert store.get("a").filled_size == "5"
+        assert store.position("MATIC-USDC") == Decimal("-5")
+        assert store.is_seen(_parse(_fill("b", side="sell")))
+        store.append([_parse(_fill("c"))])
+
+    with FillStore(path) as store:
+        assert len(store) == 3
+
+
+def _parse(data):
+    return _parse_to_class(OrderResponse, data)
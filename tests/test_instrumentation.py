@@ -0,0 +1,98 @@
+import json
+import random
+
+import pytest
+
+from orbs_orderbook import CreateOrderInput, OrderBookSDK, OrderSigner
+from orbs_orderbook.exceptions import ErrApiRequest
+from orbs_orderbook.instrumentation import Histogram, MetricsObserver, route
+from orbs_orderbook.retry import RetryPolicy
+from orbs_orderbook.testing import StubOrderBookServer
+from orbs_orderbook.testing.stub_server import STUB_TOKENS
+
+
+def test_histogram_percentiles_within_precision():
+    values = [random.uniform(0.0001, 2.0) for _ in range(10_000)]
+    histogram = Histogram()
+    for value in values:
+        histogram.record(value)
+
+    values.sort()
+    for p in (50, 90, 99, 99.9):
+        exact = values[int(len(values) * p / 100) - 1]
+        assert histogram.percentile(p) == pytest.approx(exact, rel=0.01)
+    assert histogram.snapshot()["max"] == pytest.approx(values[-1], abs=1e-6)
+
+
+def test_histogram_merge_and_reset():
+    a, b = Histogram(scale=1), Histogram(scale=1)
+    for value in range(1, 101):
+        (a if value % 2 else b).record(value)
+
+    a.merge(b)
+
+    assert a.count == 100
+    assert a.snapshot()["p50"] == 50
+    assert a.snapshot()["mean"] == 50.5
+    a.reset()
+    assert a.snapshot() == {"count": 0}
+
+
+def test_route_hides_ids():
+    assert route("api/v1/order/123") == "api/v1/order/{id}"
+    assert route("api/v1/order/client-order/abc") == "api/v1/order/client-order/{id}"
+    assert route("api/v1/orders?symbol=MATIC-USDC") == "api/v1/orders"
+
+
+def test_metrics_observer_records_requests():
+    metrics = MetricsObserver()
+    with StubOrderBookServer(api_key="key") as server:
+        with OrderBookSDK(
+            base_url=server.url,
+            api_key="key",
+            observer=metrics,
+            retry_policy=RetryPolicy(base_delay=0.01),
+        ) as client:
+            client.get_market_depth("MATIC-USDC", 5)
+            server.add_fault(method="GET", status=503)
+            client.get_market_depth("MATIC-USDC", 5)
+            with pytest.raises(ErrApiRequest):
+                client.get_order_by_id("missing")
+
+    snapshot = metrics.snapshot(reset=True)
+
+    depth = "GET api/v1/orderbook/{id}"
+    assert snapshot["requests"][depth]["count"] == 3
+    assert snapshot["status_codes"][depth] == {"200": 2, "503": 1}
+    assert snapshot["status_codes"]["GET api/v1/order/{id}"] == {"404": 1}
+    assert snapshot["retries"] == {depth: 1}
+    assert snapshot["response_bytes"][depth]["min"] > 0
+    assert snapshot["decode"]["MarketDepthResponse"]["count"] == 2
+    json.dumps(snapshot)
+    assert "requests" not in metrics.snapshot()
+
+
+def test_signer_reports_stages(mocker):
+    client = mocker.Mock()
+    client.supported_tokens = STUB_TOKENS
+    metrics = MetricsObserver()
+    signer = OrderSigner(private_key="0x" + "a" * 64, sdk=client, observer=metrics)
+
+    signer.sign_orders(
+        [
+            CreateOrderInput(
+                price="0.86",
+                size="40",
+                symbol="MATIC-USDC",
+                side="sell",
+                client_order_id=None,
+            )
+            for _ in range(3)
+        ],
+        workers=1,
+    )
+
+    sign = metrics.snapshot()["sign"]
+    assert sign["sign"]["count"] == 3
+    assert sign["encode"]["count"] == 3
+    assert sign["sign_orders"]["count"] == 1
@@ -0,0 +1,106 @@
+import multiprocessing
+import threading
+
+import pytest
+
+from orbs_orderbook.nonce import (
+    FileNonceAllocator,
+    MonotonicNonceAllocator,
+    NonceAllocator,
+)
+
+
+def _allocate_concurrently(allocator, threads=8, per_thread=20_000):
+    results = [[] for _ in range(threads)]
+
+    def run(out):
+        for i in range(per_thread):
+            out.extend(allocator.allocate(1 + i % 3))
+
+    workers = [threading.Thread(target=run, args=(out,)) for out in results]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return [nonce for out in results for nonce in out]
+
+
+def test_allocators_must_implement_allocate():
+    class Incomplete(NonceAllocator):
+        pass
+
+    class Fixed(NonceAllocator):
+        def allocate(self, count=1):
+            return [7] * count
+
+    with pytest.raises(TypeError):
+        NonceAllocator()
+    with pytest.raises(TypeError):
+        Incomplete()
+    assert Fixed().next() == 7
+
+
+def test_monotonic_allocator_has_no_duplicates_across_threads():
+    nonces = _allocate_concurrently(MonotonicNonceAllocator())
+
+    assert len(nonces) == 8 * sum(1 + i % 3 for i in range(20_000))
+    assert len(set(nonces)) == len(nonces)
+
+
+def test_independent_allocators_dont_overlap():
+    first, second = MonotonicNonceAllocator(), MonotonicNonceAllocator()
+
+    nonces = set(first.allocate(100_000))
+    nonces.update(second.allocate(100_000))
+
+    assert len(nonces) == 200_000
+
+
+def test_large_batches_are_reserved_at_once():
+    allocator = MonotonicNonceAllocator(start=10)
+
+    batch = allocator.allocate(5_000_000)
+
+    assert (batch[0], len(batch)) == (10, 5_000_000)
+    assert allocator.next() == 5_000_010
+
+
+def test_file_allocator_never_reuses_nonces_after_restart(tmp_path):
+    path = str(tmp_path / "nonces")
+    first = FileNonceAllocator(path, block_size=100)
+    used = list(first.allocate(150)) + [first.next()]
+
+    restarted = FileNonceAllocator(path, block_size=100)
+
+    assert restarted.next() > max(used)
+    assert len(restarted.allocate(1_000)) == 1_000
+
+
+def test_file_allocator_has_no_duplicates_across_threads(tmp_path):
+    allocator = FileNonceAllocator(str(tmp_path / "nonces"), block_size=1_000)
+
+    nonces = _allocate_concurrently(allocator)
+
+    assert len(set(nonces)) == len(nonces)
+
+
+def _allocate_in_process(path, queue):
+    allocator = FileNonceAllocator(path, block_size=50)
+    queue.put([allocator.next() for _ in range(500)])
+
+
+def test_file_allocator_has_no_duplicates_across_processes(tmp_path):
+    path = str(tmp_path / "nonces")
+    queue = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=_allocate_in_process, args=(path, queue))
+        for _ in range(4)
+    ]
+    for process in processes:
+        process.start()
+    nonces = [nonce for _ in processes for nonce in queue.get(timeout=30)]
+    for process in processes:
+        process.join()
+
+    assert len(nonces) == 2_000
+    assert len(set(nonces)) == len(nonces)
@@ -0,0 +1,132 @@
+import time
+from decimal import Decimal
+
+import pytest
+
+from orbs_orderbook import OrderBookSDK
+from orbs_orderbook.order_book import LocalOrderBook, OrderBookPoller
+from orbs_orderbook.testing import StubOrderBookServer
+
+ASKS = [["0.87", "40"], ["0.8701", "10"], ["0.871", "25.5"]]
+BIDS = [["0.86", "30"], ["0.859", "15"], ["0.85", "100"]]
+
+
+@pytest.fixture
+def book():
+    book = LocalOrderBook("MATIC-USDC")
+    book.apply_snapshot(asks=ASKS, bids=BIDS, time=1)
+    return book
+
+
+def test_best_levels_mid_and_spread(book):
+    assert book.best_ask() == (Decimal("0.87"), Decimal("40"))
+    assert book.best_bid() == (Decimal("0.86"), Decimal("30"))
+    assert book.mid() == Decimal("0.865")
+    assert book.spread() == Decimal("0.01")
+
+
+def test_levels_are_sorted_best_first():
+    book = LocalOrderBook("MATIC-USDC")
+    book.apply_snapshot(asks=ASKS[::-1], bids=BIDS[::-1])
+
+    assert [p for p, _ in book.levels("asks")] == [Decimal(p) for p, _ in ASKS]
+    assert [p for p, _ in book.levels("bids")] == [Decimal(p) for p, _ in BIDS]
+
+
+def test_snapshot_diff(book):
+    changed = book.apply_snapshot(
+        asks=[["0.87", "40"], ["0.8701", "12"], ["0.872", "1"]],
+        bids=BIDS[1:],
+        time=2,
+    )
+
+    # 0.8701 resized, 0.872 added, 0.871 and 0.86 removed
+    assert changed == 4
+    assert book.levels("asks") == [
+        (Decimal("0.87"), Decimal("40")),
+        (Decimal("0.8701"), Decimal("12")),
+        (Decimal("0.872"), Decimal("1")),
+    ]
+    assert book.best_bid() == (Decimal("0.859"), Decimal("15"))
+    assert book.apply_snapshot(asks=[], bids=[]) == 5
+    assert book.mid() is None
+
+
+def test_incremental_update(book):
+    changed = book.apply_update(
+        asks=[["0.87", "0"], ["0.8705", "5"]],
+        bids=[["0.86", "31"], ["0.84", "0"]],
+        time=2,
+    )
+
+    # 0.87 removed, 0.8705 added, 0.86 resized; 0.84 was not in the book
+    assert changed == 3
+    assert book.best_ask() == (Decimal("0.8701"), Decimal("10"))
+    assert book.levels("asks")[1] == (Decimal("0.8705"), Decimal("5"))
+    assert book.best_bid() == (Decimal("0.86"), Decimal("31"))
+    assert book.cumulative_size("bids", 2) == Decimal("46")
+    assert book.time == 2
+
+    # A later snapshot diffs against the updated levels
+    assert book.apply_snapshot(asks=ASKS, bids=BIDS) == 3
+
+
+def test_prices_are_matched_by_value():
+    book = LocalOrderBook("MATIC-USDC")
+    book.apply_snapshot(asks=[["0.80", "5"]], bids=[])
+
+    assert book.apply_snapshot(asks=[["0.8", "7"]], bids=[]) == 1
+    assert book.levels("asks") == [(Decimal("0.8"), Decimal("7"))]
+    assert book.apply_snapshot(asks=[["0.800", "7.0"]], bids=[]) == 0
+
+    assert book.apply_update(asks=[["0.80", "0"]]) == 1
+    assert book.levels("asks") == []
+    assert book.apply_update(asks=[["0.8", "3"]]) == 1
+    assert book.levels("asks") == [(Decimal("0.8"), Decimal("3"))]
+
+
+@pytest.mark.parametrize("size", ["1", "40", "45", "60", "75.5"])
+def test_vwap_matches_decimal_walk(book, size):
+    remaining, notional = Decimal(size), Decimal(0)
+    for price, level_size in ASKS:
+        take = min(remaining, Decimal(level_size))
+        notional += take * Decimal(price)
+        remaining -= take
+
+    assert book.vwap("asks", size) == notional / Decimal(size)
+
+
+def test_depth_queries(book):
+    assert book.cumulative_size("bids", 2) == Decimal("45")
+    assert book.cumulative_size("bids", 10) == Decimal("145")
+    assert book.price_for_size("bids", "31") == Decimal("0.859")
+    assert book.price_for_size("bids", "146") is None
+    assert book.vwap("asks", "76") is None
+
+
+def test_poller_updates_books():
+    updated = []
+    with StubOrderBookServer() as server:
+        with OrderBookSDK(base_url=server.url, api_key="key") as client:
+            poller = OrderBookPoller(
+                client, ["MATIC-USDC"], limit=5, on_update=updated.append
+            )
+            poller.poll_once()
+
+    book = poller.books["MATIC-USDC"]
+    assert updated == [book]
+    assert len(book.levels("asks")) == len(book.levels("bids")) == 5
+    assert book.best_bid()[0] < book.best_ask()[0]
+
+
+def test_poller_logs_errors_without_on_error(caplog):
+    with StubOrderBookServer() as server:
+        with OrderBookSDK(base_url=server.url, api_key="key") as client:
+            server.add_fault(method="GET", status=500)
+            poller = OrderBookPoller(client, ["MATIC-USDC"], interval=0.01).start()
+            while not poller.books["MATIC-USDC"].levels("asks"):
+                time.sleep(0.01)
+            poller.stop()
+
+    assert "Polling market depth failed" in caplog.text
+    assert "HTTP Error 500" in caplog.text
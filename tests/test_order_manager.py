@@ -0,0 +1,89 @@
+import pytest
+
+from orbs_orderbook import OrderBookSDK, OrderSigner
+from orbs_orderbook.exceptions import ErrInvalidToken
+from orbs_orderbook.order_manager import OrderManager
+from orbs_orderbook.testing import StubOrderBookServer
+from orbs_orderbook.types import Quote
+
+PRIVATE_KEY = "0x" + "a" * 64
+
+
+@pytest.fixture
+def server():
+    with StubOrderBookServer(api_key="key") as server:
+        yield server
+
+
+@pytest.fixture
+def manager(server):
+    with OrderBookSDK(base_url=server.url, api_key="key") as client:
+        signer = OrderSigner(PRIVATE_KEY, client)
+        yield OrderManager(client, signer)
+        signer.close()
+
+
+def _ladder(*prices):
+    return [Quote(side="buy", price=p, size="100") for p in prices]
+
+
+def _open_prices(server):
+    return sorted(o["price"] for o in server.orders.values() if not o["cancelled"])
+
+
+def test_requote_sends_only_changes(server, manager):
+    res = manager.requote("MATIC-USDC", _ladder("0.81", "0.82", "0.83", "0.84"))
+    assert len(res.created) == 4 and res.cancelled == []
+
+    served = server.requests_served
+    res = manager.requote("MATIC-USDC", _ladder("0.810", "0.82", "0.83", "0.85"))
+
+    assert (len(res.created), len(res.cancelled), res.unchanged) == (1, 1, 3)
+    assert server.requests_served - served == 2
+    assert _open_prices(server) == ["0.81", "0.82", "0.83", "0.85"]
+    assert sorted(q.price for q in manager.orders("MATIC-USDC").values()) == [
+        "0.81",
+        "0.82",
+        "0.83",
+        "0.85",
+    ]
+
+
+def test_unchanged_quotes_send_nothing(server, manager, mocker):
+    manager.requote("MATIC-USDC", _ladder("0.81", "0.82"))
+    sign = mocker.spy(manager.signer, "sign_orders")
+    served = server.requests_served
+
+    res = manager.requote("MATIC-USDC", _ladder("0.82", "0.81"))
+
+    assert res.unchanged == 2
+    assert server.requests_served == served
+    sign.assert_not_called()
+
+
+def test_duplicate_quotes_are_kept_apart(server, manager):
+    manager.requote("MATIC-USDC", _ladder("0.81", "0.81"))
+    res = manager.requote("MATIC-USDC", _ladder("0.81"))
+
+    assert len(res.cancelled) == 1
+    assert _open_prices(server) == ["0.81"]
+
+
+def test_reconcile_drops_orders_closed_elsewhere(server, manager):
+    manager.requote("MATIC-USDC", _ladder("0.81", "0.82"))
+    client_order_id = next(iter(manager.orders("MATIC-USDC")))
+    manager.sdk.cancel_order_by_client_id(client_order_id)
+
+    assert manager.reconcile() == [client_order_id]
+    assert len(manager.orders("MATIC-USDC")) == 1
+
+
+def test_invalid_quotes_fail_before_any_request(server, manager):
+    manager.requote("MATIC-USDC", _ladder("0.81"))
+    served = server.requests_served
+
+    with pytest.raises(ErrInvalidToken):
+        manager.requote("FOO-USDC", _ladder("0.81"))
+
+    assert server.requests_served == served
+    assert manager.orders("FOO-USDC") == {}
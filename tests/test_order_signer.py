@@ -1,9 +1,13 @@
 import pytest
+from eth_account import Account
+from eth_account.messages import encode_typed_data
 
-from orbs_orderbook import OrderSigner
+from orbs_orderbook import CreateOrderInput, OrderSigner
 
-from orbs_orderbook.exceptions import ErrDecimalPlaces
+from orbs_orderbook.exceptions import ErrDecimalPlaces, ErrInvalidSide
+from orbs_orderbook.testing.stub_server import STUB_TOKENS
 
+from datetime import datetime
 from decimal import Decimal
 
 
@@ -115,3 +119,119 @@ def test_check_decimal_places(mocker, price, should_raise):
             signer._check_decimal_places(price=price)
         except ErrDecimalPlaces:
             pytest.fail("Unexpected ErrDecimalPlaces raised")
+
+
+def test_sign_orders_keeps_input_order(mocker):
+    client = mocker.Mock()
+    client.supported_tokens = STUB_TOKENS
+    signer_key = "0xaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa"
+    signer = OrderSigner(private_key=signer_key, sdk=client)
+    orders = [
+        CreateOrderInput(
+            price=f"0.{8000 + i}",
+            size="10",
+            symbol="MATIC-USDC",
+            side="buy" if i % 2 else "sell",
+            client_order_id=str(i),
+        )
+        for i in range(40)
+    ]
+
+    try:
+        signed = signer.sign_orders(orders, workers=2)
+    finally:
+        signer.close()
+
+    assert [s.order for s in signed] == orders
+    assert len({s.message.message_data["nonce"] for s in signed}) == len(orders)
+    for s in signed:
+        signable = encode_typed_data(
+            s.message.domain_separator,
+            s.message.message_types,
+            s.message.message_data,
+        )
+        assert Account.recover_message(signable, signature=s.signature) == (
+            Account.from_key(signer_key).address
+        )
+
+
+def test_sign_orders_validates_before_signing(mocker):
+    client = mocker.Mock()
+    client.supported_tokens = STUB_TOKENS
+    signer = OrderSigner(
+        private_key="0xaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa",
+        sdk=client,
+    )
+    spy = mocker.spy(signer, "prepare_and_sign_order")
+
+    with pytest.raises(ErrInvalidSide):
+        signer.sign_orders(
+            [
+                CreateOrderInput(
+                    price="1",
+                    size="1",
+                    symbol="MATIC-USDC",
+                    side="hold",
+                    client_order_id="1",
+                )
+            ]
+        )
+    assert spy.call_count == 0
+
+
+@pytest.mark.parametrize("side", ["buy", "sell"])
+def test_ladder_message_data_matches_scalar_path(mocker, side):
+    client = mocker.Mock()
+    client.supported_tokens = STUB_TOKENS
+    signer = OrderSigner(
+        private_key="0xaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa",
+        sdk=client,
+    )
+    prices = ["0.865", "0.86440911", "20000", "1", "0.00000001", "5.", "1E+2", "0"]
+    sizes = ["40", "50", "123734734873497834", "123734734873497834.123", "3.5"]
+    prices, sizes = zip(*[(p, s) for p in prices for s in sizes])
+    deadline = datetime(2024, 5, 1)
+
+    ladder = signer.construct_ladder_message_data(
+        symbol="MATIC-USDC", side=side, prices=prices, sizes=sizes, deadline=deadline
+    )
+
+    for price, size, message_data in zip(prices, sizes, ladder):
+        _, message = signer.prepare_and_sign_order(
+            CreateOrderInput(
+                price=price,
+                size=size,
+                symbol="MATIC-USDC",
+                side=side,
+                client_order_id="1",
+            ),
+            deadline=deadline,
+            nonce=int(message_data["nonce"]),
+        )
+        assert message_data == message.message_data, (price, size)
+
+
+def test_ladder_message_data_checks_decimal_places(mocker):
+    client = mocker.Mock()
+    client.supported_tokens = STUB_TOKENS
+    signer = OrderSigner(
+        private_key="0xaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa",
+        sdk=client,
+    )
+
+    with pytest.raises(ErrDecimalPlaces):
+        signer.construct_ladder_message_data(
+            symbol="MATIC-USDC",
+            side="buy",
+            prices=["0.86", "0.123456789"],
+            sizes=["1", "1"],
+        )
+
+
+def test_independent_signers_dont_reuse_nonces(mocker):
+    key = "0xaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa"
+    signers = [OrderSigner(private_key=key, sdk=mocker.Mock()) for _ in range(2)]
+
+    nonces = {n for s in signers for n in s.nonce_allocator.allocate(100_000)}
+
+    assert len(nonces) == 200_000
@@ -0,0 +1,94 @@
+import asyncio
+
+from orbs_orderbook import AsyncOrderBookSDK, OrderBookSDK, PageCheckpoint
+from orbs_orderbook.testing import StubOrderBookServer
+
+
+def _fills(count):
+    return [
+        {
+            "orderId": f"order-{i}",
+            "clientOrderId": None,
+            "userId": "00000000-0000-0000-0000-000000000001",
+            "price": "0.85",
+            "symbol": "MATIC-USDC",
+            "size": "10",
+            "pendingSize": "0",
+            "filledSize": "10",
+            "side": "buy",
+            "timestamp": "2023-11-01T10:00:00Z",
+            "cancelled": False,
+        }
+        for i in range(count)
+    ]
+
+
+def test_iter_filled_orders_streams_every_page():
+    with StubOrderBookServer(api_key="key") as server:
+        server.fills = _fills(25)
+        with OrderBookSDK(base_url=server.url, api_key="key") as client:
+            with client.iter_filled_orders_for_user(page_size=10) as fills:
+                ids = [fill.order_id for fill in fills]
+
+    assert ids == [f"order-{i}" for i in range(25)]
+
+
+def test_iter_filled_orders_resumes_from_checkpoint():
+    with StubOrderBookServer(api_key="key") as server:
+        server.fills = _fills(25)
+        with OrderBookSDK(base_url=server.url, api_key="key") as client:
+            fills = client.iter_filled_orders_for_user(page_size=10, prefetch=0)
+            first = [next(fills).order_id for _ in range(13)]
+            checkpoint = fills.checkpoint
+            fills.close()
+
+            resumed = client.iter_filled_orders_for_user(
+                page_size=10, checkpoint=checkpoint
+            )
+            rest = [fill.order_id for fill in resumed]
+
+    assert checkpoint == PageCheckpoint(page=2, index=3)
+    assert first + rest == [f"order-{i}" for i in range(25)]
+
+
+def test_iter_filled_orders_empty():
+    with StubOrderBookServer(api_key="key") as server:
+        with OrderBookSDK(base_url=server.url, api_key="key") as client:
+            assert list(client.iter_filled_orders_for_user()) == []
+
+
+def test_async_iter_filled_orders():
+    async def run(server):
+        async with AsyncOrderBookSDK(base_url=server.url, api_key="key") as client:
+            return [
+                fill.order_id
+                async for fill in client.iter_filled_orders_for_user(page_size=7)
+            ]
+
+    with StubOrderBookServer(api_key="key") as server:
+        server.fills = _fills(25)
+        ids = asyncio.run(run(server))
+
+    assert ids == [f"order-{i}" for i in range(25)]
+
+
+def test_async_iter_cancels_prefetches_on_early_exit():
+    async def run(server):
+        async with AsyncOrderBookSDK(base_url=server.url, api_key="key") as client:
+            async with client.iter_filled_orders_for_user(
+                page_size=5, prefetch=3
+            ) as fills:
+                async for fill in fills:
+                    break
+                pending = list(fills._pending)
+            assert len(pending) == 3
+            assert all(task.cancelled() for task in pending)
+            assert not fills._pending
+            return fill.order_id
+
+    with StubOrderBookServer(api_key="key") as server:
+        server.fills = _fills(25)
+        server.latency = 0.2
+        first = asyncio.run(run(server))
+
+    assert first == "order-0"
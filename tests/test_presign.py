@@ -0,0 +1,109 @@
+import time
+from datetime import timedelta
+
+import pytest
+
+from orbs_orderbook import OrderBookSDK, OrderSigner
+from orbs_orderbook.order_manager import OrderManager
+from orbs_orderbook.presign import PresignedOrderPool
+from orbs_orderbook.testing import StubOrderBookServer
+from orbs_orderbook.testing.stub_server import STUB_TOKENS
+from orbs_orderbook.types import CreateOrderInput, Quote
+
+GRID = [Quote(side="buy", price=f"0.8{i}", size="100") for i in range(5)]
+
+
+@pytest.fixture
+def signer(mocker):
+    client = mocker.Mock()
+    client.supported_tokens = STUB_TOKENS
+    return OrderSigner("0x" + "a" * 64, client)
+
+
+def test_take_returns_presigned_order_without_signing(signer, mocker):
+    pool = PresignedOrderPool(signer, depth=2)
+    pool.set_grid("MATIC-USDC", GRID)
+
+    assert pool.fill_once() == 10
+    assert pool.fill_once() == 0
+
+    sign = mocker.spy(signer, "sign_orders")
+    order = pool.take("MATIC-USDC", Quote(side="buy", price="0.80", size="100"), "c1")
+
+    sign.assert_not_called()
+    assert order.order.client_order_id == "c1"
+    assert order.order.price == "0.80"
+    assert order.signature
+    assert pool.available("MATIC-USDC", GRID[0]) == 1
+    assert pool.take("MATIC-USDC", Quote(side="sell", price="0.8", size="100")) is None
+
+
+def test_orders_near_deadline_are_not_handed_out(signer):
+    pool = PresignedOrderPool(
+        signer, order_ttl=timedelta(minutes=5), expiry_margin=timedelta(minutes=5)
+    )
+    pool.set_grid("MATIC-USDC", GRID[:1])
+    pool.fill_once()
+
+    assert pool.take("MATIC-USDC", GRID[0]) is None
+
+
+def test_pool_orders_have_distinct_nonces(signer):
+    pool = PresignedOrderPool(signer, depth=3)
+    pool.set_grid("MATIC-USDC", GRID)
+    pool.fill_once()
+    signer.sign_orders(
+        [CreateOrderInput("0.8", "1", "MATIC-USDC", "buy", "x")] * 5, workers=1
+    )
+    pool.set_grid("MATIC-USDC", GRID + [Quote("sell", "0.9", "1")])
+    pool.fill_once()
+
+    nonces = [
+        pool.take("MATIC-USDC", quote).message.message_data["nonce"]
+        for quote in GRID + [Quote("sell", "0.9", "1")]
+        for _ in range(3)
+    ]
+    assert len(set(nonces)) == 18
+
+
+def test_grid_changes_discard_orders(signer):
+    pool = PresignedOrderPool(signer)
+    pool.set_grid("MATIC-USDC", GRID)
+    pool.fill_once()
+
+    pool.set_grid("MATIC-USDC", GRID[:2])
+
+    assert pool.available("MATIC-USDC", GRID[2]) == 0
+    assert pool.available("MATIC-USDC", GRID[1]) == 2
+
+
+def test_background_errors_are_logged_without_on_error(signer, mocker, caplog):
+    mocker.patch.object(signer, "sign_orders", side_effect=ValueError("no key"))
+    pool = PresignedOrderPool(signer, interval=0.01)
+    pool.set_grid("MATIC-USDC", GRID)
+    with pool:
+        while "no key" not in caplog.text:
+            time.sleep(0.01)
+
+    assert "Signing pre-signed orders failed" in caplog.text
+
+
+def test_background_refill_feeds_order_manager(mocker):
+    with StubOrderBookServer(api_key="key") as server:
+        with OrderBookSDK(base_url=server.url, api_key="key") as client:
+            signer = OrderSigner("0x" + "a" * 64, client)
+            with PresignedOrderPool(signer, interval=0.01) as pool:
+                pool.set_grid("MATIC-USDC", GRID)
+                deadline = time.monotonic() + 5
+                while pool.available("MATIC-USDC", GRID[-1]) < 2:
+                    assert time.monotonic() < deadline
+                    time.sleep(0.01)
+                pool.stop()
+
+                sign = mocker.spy(signer, "sign_orders")
+                manager = OrderManager(client, signer, pool=pool)
+                res = manager.requote("MATIC-USDC", GRID)
+
+    sign.assert_not_called()
+    assert len(res.created) == 5
+    assert len(server.orders) == 5
@@ -0,0 +1,106 @@
+import threading
+import time
+
+import pytest
+
+from orbs_orderbook import OrderBookSDK
+from orbs_orderbook.exceptions import ErrApiRequest
+from orbs_orderbook.rate_limit import RequestScheduler, endpoint_class
+from orbs_orderbook.testing import StubOrderBookServer
+
+
+def test_endpoint_classes():
+    assert endpoint_class("POST", "api/v1/orders") == "write"
+    assert endpoint_class("DELETE", "api/v1/order/1") == "cancel"
+    assert endpoint_class("GET", "api/v1/orderbook/MATIC-USDC") == "market_data"
+
+
+def test_bucket_limits_burst():
+    scheduler = RequestScheduler({"market_data": 5}, global_rate=100)
+
+    assert [scheduler.try_acquire("market_data") for _ in range(5)] == [0.0] * 5
+    assert scheduler.try_acquire("market_data") == pytest.approx(0.2, abs=0.01)
+
+
+def test_cancels_use_reserved_headroom():
+    scheduler = RequestScheduler(
+        {"write": 100, "cancel": 100}, global_rate=10, cancel_reserve=0.3
+    )
+
+    writes = 0
+    while scheduler.try_acquire("write") == 0.0:
+        writes += 1
+
+    assert writes == 7
+    assert [scheduler.try_acquire("cancel") for _ in range(3)] == [0.0] * 3
+
+
+def test_waiting_cancel_blocks_writes():
+    scheduler = RequestScheduler({"cancel": 2}, global_rate=100)
+    scheduler.try_acquire("cancel")
+    scheduler.try_acquire("cancel")
+
+    cancel = threading.Thread(target=scheduler.acquire, args=("cancel",))
+    cancel.start()
+    time.sleep(0.05)
+    assert scheduler.try_acquire("write") > 0
+    cancel.join()
+    assert scheduler.try_acquire("write") == 0.0
+
+
+def test_throttling_halves_rate_once_per_cooldown():
+    scheduler = RequestScheduler({"write": 10}, global_rate=40)
+
+    scheduler.record("write", latency=0.01, status_code=429)
+    scheduler.record("write", latency=0.01, status_code=429)
+    assert scheduler.rates["write"] == 5
+    assert scheduler.rates["global"] == 20
+
+    for _ in range(10):
+        scheduler.record("write", latency=0.01)
+    assert scheduler.rates["write"] == pytest.approx(6)
+    for _ in range(100):
+        scheduler.record("write", latency=0.01)
+    assert scheduler.rates["write"] == 10
+
+
+def test_slow_responses_lower_rate():
+    scheduler = RequestScheduler({"market_data": 10}, latency_target=0.1)
+
+    scheduler.record("market_data", latency=0.5)
+
+    assert scheduler.rates["market_data"] == 9
+
+
+def test_scheduler_avoids_server_throttling():
+    with StubOrderBookServer(api_key="key", rate_limit=20) as server:
+        with OrderBookSDK(base_url=server.url, api_key="key") as client:
+            with pytest.raises(ErrApiRequest) as err:
+                for _ in range(40):
+                    client.get_market_depth("MATIC-USDC", 5)
+            assert err.value.status_code == 429
+
+        time.sleep(1)
+        scheduler = RequestScheduler({"market_data": 15})
+        with OrderBookSDK(
+            base_url=server.url, api_key="key", scheduler=scheduler
+        ) as client:
+            throttled = server.requests_throttled
+            for _ in range(30):
+                client.get_market_depth("MATIC-USDC", 5)
+
+    assert server.requests_throttled == throttled
+
+
+def test_non_json_throttling_is_recorded():
+    scheduler = RequestScheduler({"market_data": 10})
+    with StubOrderBookServer(api_key="key") as server:
+        with OrderBookSDK(
+            base_url=server.url, api_key="key", scheduler=scheduler
+        ) as client:
+            server.add_fault(method="GET", status=429, body=b"<html>slow down</html>")
+            with pytest.raises(ErrApiRequest) as err:
+                client.get_market_depth("MATIC-USDC", 5)
+
+    assert err.value.status_code == 429
+    assert scheduler.rates["market_data"] == 5
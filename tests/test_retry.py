@@ -0,0 +1,232 @@
+import asyncio
+import time
+from concurrent.futures import wait
+
+import pytest
+
+from orbs_orderbook import (
+    AsyncOrderBookSDK,
+    CreateMultipleOrdersInput,
+    CreateOrderInput,
+    EIP712Message,
+    OrderBookSDK,
+    OrderWithSignature,
+)
+from orbs_orderbook.exceptions import ErrApiRequest
+from orbs_orderbook.retry import RetryPolicy
+from orbs_orderbook.testing import StubOrderBookServer
+
+MESSAGE = EIP712Message(domain_separator={}, message_types={}, message_data={})
+
+
+def _order(client_order_id=None):
+    return CreateOrderInput(
+        price="0.85",
+        size="10",
+        symbol="MATIC-USDC",
+        side="buy",
+        client_order_id=client_order_id,
+    )
+
+
+@pytest.fixture
+def server():
+    with StubOrderBookServer(api_key="key") as server:
+        yield server
+
+
+@pytest.fixture
+def attempts():
+    return []
+
+
+@pytest.fixture
+def client(server, attempts):
+    policy = RetryPolicy(base_delay=0.01, on_attempt=attempts.append)
+    with OrderBookSDK(base_url=server.url, api_key="key", retry_policy=policy) as c:
+        attempts.clear()
+        yield c
+
+
+def test_ambiguous_write_is_resolved_by_client_id(server, client, attempts):
+    server.add_fault(method="POST", status=503)
+
+    res = client.create_order(
+        order_input=_order("cid-1"), signature="0x", message=MESSAGE
+    )
+
+    assert len(server.orders) == 1
+    assert res.order_id == next(iter(server.orders))
+    assert [(a.method, a.attempt) for a in attempts] == [
+        ("POST", 1),
+        ("GET", 1),
+    ]
+    assert attempts[0].error.status_code == 503
+
+
+def test_write_that_did_not_land_is_resubmitted(server, client, attempts):
+    server.add_fault(method="POST", status=503, apply=False)
+
+    client.create_order(order_input=_order("cid-1"), signature="0x", message=MESSAGE)
+
+    assert len(server.orders) == 1
+    assert [a.attempt for a in attempts if a.method == "POST"] == [1, 2]
+
+
+def test_ambiguous_write_without_client_id_is_not_retried(server, client):
+    server.add_fault(method="POST", status=503, apply=False)
+
+    with pytest.raises(ErrApiRequest):
+        client.create_order(order_input=_order(), signature="0x", message=MESSAGE)
+    assert not server.orders
+
+
+def test_throttled_write_is_retried_without_lookup(server, client, attempts):
+    server.add_fault(method="POST", status=429, apply=False)
+
+    client.create_order(order_input=_order(), signature="0x", message=MESSAGE)
+
+    assert len(server.orders) == 1
+    assert [a.method for a in attempts] == ["POST", "POST"]
+
+
+def test_ambiguous_batch_is_not_duplicated(server, client):
+    orders = [
+        OrderWithSignature(order=_order(f"cid-{i}"), signature="0x", message=MESSAGE)
+        for i in range(3)
+    ]
+    server.add_fault(method="POST", status=502)
+
+    res = client.create_multiple_orders(
+        CreateMultipleOrdersInput(symbol="MATIC-USDC", orders=orders)
+    )
+
+    assert len(server.orders) == 3
+    assert [o.client_order_id for o in res.created] == ["cid-0", "cid-1", "cid-2"]
+
+
+def test_client_errors_are_not_retried(server, client, attempts):
+    with pytest.raises(ErrApiRequest):
+        client.get_order_by_id("missing")
+    assert len(attempts) == 1
+
+
+def test_gives_up_after_max_attempts(server, client, attempts):
+    server.add_fault(method="GET", status=503, count=5)
+
+    with pytest.raises(ErrApiRequest):
+        client.get_market_depth("MATIC-USDC", 5)
+    assert [a.attempt for a in attempts] == [1, 2, 3]
+
+
+def test_non_json_error_responses_are_retried(server, client, attempts):
+    server.add_fault(method="GET", status=503, body=b"<html>Service Unavailable</html>")
+    server.add_fault(method="GET", status=429, body=b"")
+
+    client.get_market_depth("MATIC-USDC", 5)
+
+    assert [a.attempt for a in attempts] == [1, 2, 3]
+    assert [(a.error.status_code, a.error.message) for a in attempts[:2]] == [
+        (503, "<html>Service Unavailable</html>"),
+        (429, "Too Many Requests"),
+    ]
+
+
+def test_async_non_json_error_responses_are_retried(server):
+    async def run():
+        policy = RetryPolicy(base_delay=0.01, on_attempt=attempts.append)
+        async with AsyncOrderBookSDK(
+            base_url=server.url, api_key="key", retry_policy=policy
+        ) as client:
+            attempts.clear()
+            server.add_fault(method="GET", status=503, body=b"upstream down")
+            await client.get_market_depth("MATIC-USDC", 5)
+
+    attempts = []
+    asyncio.run(run())
+
+    assert [a.attempt for a in attempts] == [1, 2]
+    assert attempts[0].error.message == "upstream down"
+
+
+def test_slow_read_is_hedged(server, attempts):
+    policy = RetryPolicy(hedge_after=0.05, on_attempt=attempts.append)
+    with OrderBookSDK(base_url=server.url, api_key="key", retry_policy=policy) as c:
+        server.add_fault(method="GET", delay=1.0)
+        start = time.perf_counter()
+        c.get_market_depth("MATIC-USDC", 5)
+        elapsed = time.perf_counter() - start
+    policy.close()
+
+    assert elapsed < 0.5
+    assert attempts[-1].hedged
+
+
+def test_hedge_prefers_the_attempt_that_succeeded(mocker):
+    # Both attempts finish before the wait returns, so `done` holds both
+    mocker.patch(
+        "orbs_orderbook.retry.wait",
+        side_effect=lambda fs, return_when: wait(fs),
+    )
+    policy = RetryPolicy(hedge_after=0.01)
+    for _ in range(10):
+        calls = []
+
+        def send():
+            calls.append(None)
+            if len(calls) == 1:
+                time.sleep(0.05)
+                raise ErrApiRequest(503, "slow and failed")
+            return "ok"
+
+        assert policy._hedged(send) == ("ok", True)
+    policy.close()
+
+
+def test_async_hedge_prefers_the_attempt_that_succeeded():
+    async def run():
+        policy = RetryPolicy(hedge_after=0.01)
+        released = asyncio.Event()
+        calls = []
+
+        async def send():
+            calls.append(None)
+            if len(calls) == 1:
+                await released.wait()
+                raise ErrApiRequest(503, "slow and failed")
+            # Wakes the first attempt, so both finish before the wait returns
+            released.set()
+            return "ok"
+
+        return await policy._hedged_async(send)
+
+    for _ in range(10):
+        assert asyncio.run(run()) == ("ok", True)
+
+
+def test_backoff_is_exponential_and_capped():
+    policy = RetryPolicy(base_delay=0.1, max_delay=0.5, jitter=False)
+
+    assert [policy.delay(n) for n in (1, 2, 3, 4)] == [0.1, 0.2, 0.4, 0.5]
+    assert 0 <= RetryPolicy(base_delay=0.1).delay(2) <= 0.2
+
+
+def test_async_ambiguous_write_is_resolved(server):
+    async def run():
+        policy = RetryPolicy(base_delay=0.01, hedge_after=0.05)
+        async with AsyncOrderBookSDK(
+            base_url=server.url, api_key="key", retry_policy=policy
+        ) as client:
+            server.add_fault(method="POST", status=503)
+            res = await client.create_order(
+                order_input=_order("cid-1"), signature="0x", message=MESSAGE
+            )
+            server.add_fault(method="GET", delay=1.0)
+            start = time.perf_counter()
+            await client.get_order_by_id(res.order_id)
+            return time.perf_counter() - start
+
+    elapsed = asyncio.run(run())
+
+    assert len(server.orders) == 1
+    assert elapsed < 0.5
@@ -0,0 +1,184 @@
+import asyncio
+from decimal import Decimal
+
+import pytest
+
+from orbs_orderbook import AsyncOrderBookSDK, OrderBookSDK
+from orbs_orderbook.stream import DEPTH, ORDERS, MarketDataStream
+from orbs_orderbook.testing import StubOrderBookServer, StubStreamServer
+
+SYMBOL = "MATIC-USDC"
+
+ORDER = {
+    "orderId": "accfae6b-3a9e-4719-85f0-a34fbc16fb3b",
+    "clientOrderId": "650e8400-e29b-41d4-a716-446655440000",
+    "userId": "00000000-0000-0000-0000-000000000001",
+    "price": "0.865",
+    "symbol": SYMBOL,
+    "size": "40",
+    "pendingSize": "0",
+    "filledSize": "0",
+    "side": "buy",
+    "timestamp": "2024-05-01T00:00:00Z",
+    "cancelled": False,
+}
+
+
+@pytest.fixture
+def servers():
+    with StubOrderBookServer(api_key="key") as http:
+        http.depth[SYMBOL] = {
+            "asks": {"0.87": "40", "0.88": "50"},
+            "bids": {"0.86": "30"},
+        }
+        with StubStreamServer(api_key="key", book_server=http) as ws:
+            yield http, ws
+
+
+@pytest.fixture
+def client(servers):
+    with OrderBookSDK(base_url=servers[0].url, api_key="key") as client:
+        yield client
+
+
+async def _until(predicate, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.005)
+
+
+def _levels(book, side):
+    return [(f"{p.normalize():f}", f"{s.normalize():f}") for p, s in book.levels(side)]
+
+
+def test_snapshot_then_updates(servers, client):
+    _, ws = servers
+
+    async def run():
+        async with MarketDataStream(client, ws.url) as stream:
+            await stream.subscribe_depth(SYMBOL)
+            book = await asyncio.wait_for(stream.wait_synced(SYMBOL), 2)
+            assert book.best_ask() == (Decimal("0.87"), Decimal("40"))
+
+            updates = stream.depth_updates(SYMBOL)
+            ws.publish_depth(SYMBOL, asks=[["0.87", "0"]], bids=[["0.865", "10"]])
+            book = await asyncio.wait_for(updates.__anext__(), 2)
+            await updates.aclose()
+            return book
+
+    book = asyncio.run(run())
+
+    assert _levels(book, "asks") == [("0.88", "50")]
+    assert _levels(book, "bids") == [("0.865", "10"), ("0.86", "30")]
+
+
+def test_gap_resyncs_from_snapshot(servers, client, mocker):
+    _, ws = servers
+    gaps = []
+    snapshot = mocker.spy(client, "get_market_depth")
+
+    async def run():
+        async with MarketDataStream(
+            client, ws.url, on_gap=lambda *gap: gaps.append(gap)
+        ) as stream:
+            await stream.subscribe_depth(SYMBOL)
+            book = await asyncio.wait_for(stream.wait_synced(SYMBOL), 2)
+
+            ws.publish_depth(SYMBOL, bids=[["0.86", "0"]], drop=True)
+            ws.publish_depth(SYMBOL, asks=[["0.89", "5"]])
+            await _until(lambda: snapshot.call_count == 2)
+            await asyncio.wait_for(stream.wait_synced(SYMBOL), 2)
+            return book
+
+    book = asyncio.run(run())
+
+    assert gaps == [(DEPTH, SYMBOL)]
+    assert _levels(book, "asks") == [("0.87", "40"), ("0.88", "50"), ("0.89", "5")]
+    assert _levels(book, "bids") == []
+
+
+def test_reconnects_and_resubscribes(servers, client):
+    _, ws = servers
+    gaps = []
+
+    async def run():
+        async with MarketDataStream(
+            client, ws.url, reconnect_delay=0.01, on_gap=lambda *gap: gaps.append(gap)
+        ) as stream:
+            updates = stream.order_updates()
+            await stream.subscribe_depth(SYMBOL)
+            await stream.subscribe_depth("ETH-USDC")
+            await stream.subscribe_orders()
+            book = await asyncio.wait_for(stream.wait_synced(SYMBOL), 2)
+            await _until(lambda: stream._orders_seq is not None)
+            assert ws.connections_opened == 1
+
+            ws.disconnect_all()
+            await _until(lambda: stream.connections == 2)
+            await asyncio.wait_for(stream.wait_synced(SYMBOL), 2)
+            ws.publish_depth(SYMBOL, asks=[["0.865", "1"]])
+            await _until(lambda: book.best_ask()[0] == Decimal("0.865"))
+            await asyncio.wait_for(stream.wait_synced("ETH-USDC"), 2)
+            # Order updates may have been missed while disconnected
+            await _until(lambda: (ORDERS, None) in gaps)
+
+            ws.publish_order({**ORDER, "filledSize": "40"})
+            order = await asyncio.wait_for(updates.__anext__(), 2)
+            await updates.aclose()
+            return stream.connections, order
+
+    connections, order = asyncio.run(run())
+
+    assert connections == 2
+    assert ws.connections_opened == 2
+    assert order.filled_size == "40"
+    assert gaps.count((ORDERS, None)) == 1
+
+
+def test_order_updates(servers):
+    http, ws = servers
+    gaps = []
+
+    async def run():
+        async with AsyncOrderBookSDK(base_url=http.url, api_key="key") as client:
+            async with MarketDataStream(
+                client, ws.url, on_gap=lambda *gap: gaps.append(gap)
+            ) as stream:
+                updates = stream.order_updates()
+                await stream.subscribe_orders()
+                # Acknowledged
+                await _until(lambda: stream._orders_seq is not None)
+
+                ws.publish_order(ORDER)
+                first = await asyncio.wait_for(updates.__anext__(), 2)
+                ws.publish_order({**ORDER, "filledSize": "10"}, drop=True)
+                ws.publish_order({**ORDER, "filledSize": "40"})
+                second = await asyncio.wait_for(updates.__anext__(), 2)
+                await updates.aclose()
+                return first, second
+
+    first, second = asyncio.run(run())
+
+    assert (first.order_id, first.filled_size) == (ORDER["orderId"], "0")
+    assert second.filled_size == "40"
+    assert gaps == [(ORDERS, None)]
+
+
+def test_iterators_end_when_stream_closes(servers, client):
+    _, ws = servers
+
+    async def run():
+        stream = await MarketDataStream(client, ws.url).start()
+        await stream.subscribe_depth(SYMBOL)
+        await asyncio.wait_for(stream.wait_synced(SYMBOL), 2)
+
+        async def consume():
+            return [book async for book in stream.depth_updates(SYMBOL)]
+
+        consumer = asyncio.ensure_future(consume())
+        await asyncio.sleep(0.01)
+        await stream.close()
+        return await asyncio.wait_for(consumer, 2)
+
+    assert asyncio.run(run()) == []
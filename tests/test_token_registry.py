@@ -0,0 +1,114 @@
+import json
+import os
+import time
+
+import pytest
+
+from orbs_orderbook import OrderBookSDK, Token
+from orbs_orderbook.exceptions import (
+    ErrInvalidSide,
+    ErrInvalidSymbolFormat,
+    ErrInvalidToken,
+)
+from orbs_orderbook.testing import StubOrderBookServer
+from orbs_orderbook.testing.stub_server import STUB_TOKENS
+from orbs_orderbook.token_registry import TokenRegistry
+
+MATIC = Token(**STUB_TOKENS["MATIC"])
+USDC = Token(**STUB_TOKENS["USDC"])
+
+
+def test_resolve():
+    registry = TokenRegistry(STUB_TOKENS)
+
+    assert registry.resolve("MATIC-USDC", "sell") == (MATIC, USDC)
+    assert registry.resolve("MATIC-USDC", "buy") == (USDC, MATIC)
+    assert registry.resolve("matic-usdc", "buy") == (USDC, MATIC)
+    assert registry.resolve("MATIC-USDC", "buy") is registry.resolve(
+        "MATIC-USDC", "buy"
+    )
+    assert registry["USDC"] == STUB_TOKENS["USDC"]
+
+
+@pytest.mark.parametrize(
+    "symbol, side, error",
+    [
+        ("MATICUSDC", "buy", ErrInvalidSymbolFormat),
+        ("MATIC-USDC-ETH", "buy", ErrInvalidSymbolFormat),
+        ("MATIC-USDC", "hold", ErrInvalidSide),
+        ("MATIC-ETH", "sell", ErrInvalidToken),
+        ("ETH-USDC", "sell", ErrInvalidToken),
+    ],
+)
+def test_resolve_errors(symbol, side, error):
+    with pytest.raises(error):
+        TokenRegistry(STUB_TOKENS).resolve(symbol, side)
+
+
+def test_update_replaces_table():
+    registry = TokenRegistry(STUB_TOKENS)
+    registry.update({"USDC": USDC})
+
+    assert list(registry) == ["USDC"]
+    assert registry["USDC"] == STUB_TOKENS["USDC"]
+    with pytest.raises(ErrInvalidToken):
+        registry.resolve("MATIC-USDC", "buy")
+
+
+def test_fresh_cache_needs_no_request(tmp_path):
+    path = str(tmp_path / "tokens.json")
+
+    with StubOrderBookServer() as server:
+        with OrderBookSDK(base_url=server.url, api_key="key", token_cache_path=path):
+            pass
+        assert server.requests_served == 1
+
+        with OrderBookSDK(
+            base_url=server.url, api_key="key", token_cache_path=path
+        ) as client:
+            assert client.supported_tokens.resolve("MATIC-USDC", "sell") == (
+                MATIC,
+                USDC,
+            )
+            cached = dict(client.supported_tokens)
+        assert server.requests_served == 1
+
+        with OrderBookSDK(base_url=server.url, api_key="key") as client:
+            fetched = dict(client.supported_tokens)
+
+    # Values have the API's dict shape whether fetched or loaded from the cache
+    assert cached == fetched
+    assert fetched["MATIC"]["address"] == STUB_TOKENS["MATIC"]["address"]
+
+
+def test_stale_cache_is_refreshed_in_background(tmp_path):
+    path = str(tmp_path / "tokens.json")
+    with open(path, "w") as f:
+        json.dump({"fetchedAt": 0, "tokens": {"USDC": STUB_TOKENS["USDC"]}}, f)
+
+    with StubOrderBookServer(latency=0.2) as server:
+        with OrderBookSDK(
+            base_url=server.url, api_key="key", token_cache_path=path
+        ) as client:
+            # Served from the stale cache straight away
+            assert list(client.supported_tokens) == ["USDC"]
+
+            deadline = time.monotonic() + 5
+            while "MATIC" not in (TokenRegistry.load(path)[0] or {}):
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+
+            assert set(client.supported_tokens) == {"MATIC", "USDC"}
+
+    assert os.listdir(tmp_path) == ["tokens.json"]
+
+
+def test_failed_background_refresh_is_logged(caplog):
+    with StubOrderBookServer() as server:
+        with OrderBookSDK(base_url=server.url, api_key="key") as client:
+            server.add_fault(method="GET", status=503)
+            client.refresh_supported_tokens(background=True).join()
+
+            assert "MATIC" in client.supported_tokens
+
+    assert "Refreshing supported tokens failed" in caplog.text
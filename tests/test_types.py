@@ -0,0 +1,223 @@
+import copy
+import dataclasses
+import json
+import pickle
+
+import pytest
+
+from orbs_orderbook.client import _create_multiple_orders_body
+from orbs_orderbook.types import (
+    CreateMultipleOrdersInput,
+    CreateMultipleOrdersResponse,
+    CreateOrderInput,
+    EIP712Message,
+    MarketDepthData,
+    MarketDepthResponse,
+    OrderResponse,
+    OrdersForUserResponse,
+    OrderWithSignature,
+    PaginationResponse,
+    SupportedTokensResponse,
+    Token,
+    _parse_to_class,
+)
+from orbs_orderbook.utils import json_dumps
+
+ORDER = {
+    "orderId": "accfae6b-3a9e-4719-85f0-a34fbc16fb3b",
+    "clientOrderId": "650e8400-e29b-41d4-a716-446655440000",
+    "userId": "00000000-0000-0000-0000-000000000001",
+    "price": "0.865",
+    "symbol": "MATIC-USDC",
+    "size": "40",
+    "pendingSize": "0",
+    "filledSize": "40",
+    "side": "buy",
+    "timestamp": "2024-05-01T00:00:00Z",
+    "cancelled": False,
+}
+
+
+def test_nested_lists_are_decoded():
+    res = _parse_to_class(
+        OrdersForUserResponse,
+        {"page": 1, "pageSize": 2, "total": 2, "totalPages": 1, "data": [ORDER] * 2},
+    )
+
+    assert res.total_pages == 1
+    assert res.data == [_parse_to_class(OrderResponse, ORDER)] * 2
+    assert res.data[0].filled_size == "40"
+
+    created = _parse_to_class(
+        CreateMultipleOrdersResponse,
+        {"created": [ORDER], "msg": "ok", "status": 201, "symbol": "MATIC-USDC"},
+    )
+    assert isinstance(created.created[0], OrderResponse)
+
+
+def test_nested_objects_and_dicts_are_decoded():
+    depth = _parse_to_class(
+        MarketDepthResponse,
+        {
+            "code": "OK",
+            "data": {
+                "asks": [["0.87", "40"]],
+                "bids": [],
+                "symbol": "MATIC-USDC",
+                "time": 1,
+            },
+        },
+    )
+    assert depth.data == MarketDepthData(
+        asks=[["0.87", "40"]], bids=[], symbol="MATIC-USDC", time=1
+    )
+
+    tokens = _parse_to_class(
+        SupportedTokensResponse,
+        {"tokens": {"USDC": {"address": "0x01", "decimals": 6, "name": "USD Coin"}}},
+    )
+    assert tokens.tokens == {"USDC": Token(address="0x01", decimals=6)}
+
+
+def test_unknown_keys_are_ignored_and_missing_optionals_default_to_none():
+    order = {k: v for k, v in ORDER.items() if k not in ("userId", "timestamp")}
+    order["newField"] = 1
+    order["client_order_id"] = order.pop("clientOrderId")
+
+    res = _parse_to_class(OrderResponse, order)
+
+    assert res.user_id is None
+    assert res.timestamp is None
+    assert res.client_order_id == ORDER["clientOrderId"]
+
+
+def _signed_order(client_order_id="c1"):
+    return OrderWithSignature(
+        order=CreateOrderInput(
+            price="0.865",
+            size="40",
+            symbol="MATIC-USDC",
+            side="buy",
+            client_order_id=client_order_id,
+        ),
+        signature="0xabc",
+        message=EIP712Message(
+            domain_separator={},
+            message_types={},
+            message_data={"nonce": "1", "witness": {"outputs": [{"amount": "2"}]}},
+        ),
+    )
+
+
+def test_order_request_json_is_encoded_once():
+    order = _signed_order()
+
+    encoded = order.request_json()
+
+    assert order.request_json() is encoded
+    assert json.loads(encoded) == {
+        **order.order.to_camelcase_dict(),
+        "eip712Sig": "0xabc",
+        "eip712Msg": order.message.message_data,
+    }
+    assert pickle.loads(pickle.dumps(order)).request_json() == encoded
+
+
+def test_batch_body_is_joined_from_order_json():
+    orders = [_signed_order(f"c{i}") for i in range(3)]
+
+    body = _create_multiple_orders_body(
+        CreateMultipleOrdersInput(symbol="MATIC-USDC", orders=orders)
+    )
+
+    assert json.loads(body) == {
+        "symbol": "MATIC-USDC",
+        "orders": [json.loads(o.request_json()) for o in orders],
+    }
+
+
+def test_json_dumps():
+    order = _signed_order()
+    assert json.loads(json_dumps({"order": order.order, "amount": 2**80})) == {
+        "order": order.order.to_camelcase_dict(),
+        "amount": 2**80,
+    }
+
+
+def test_instances_have_slots_and_no_dict():
+    order = _signed_order()
+
+    assert not hasattr(order, "__dict__")
+    assert "_request_json" in OrderWithSignature.__slots__
+    with pytest.raises(AttributeError):
+        order.unknown = 1
+
+
+def test_slotted_instances_can_be_copied():
+    order = _signed_order()
+    order.request_json()
+
+    for copied in (pickle.loads(pickle.dumps(order)), copy.deepcopy(order)):
+        assert copied == order
+        assert copied.order is not order.order
+        assert copied.request_json() == order.request_json()
+
+    replaced = dataclasses.replace(order, signature="0xdef")
+    assert replaced.signature == "0xdef"
+    assert replaced.order is order.order
+
+
+def test_slotted_subclasses_inherit_fields():
+    res = _parse_to_class(
+        OrdersForUserResponse,
+        {"page": 2, "pageSize": 1, "total": 3, "totalPages": 3, "data": [ORDER]},
+    )
+
+    assert isinstance(res, PaginationResponse)
+    assert not hasattr(res, "__dict__")
+    assert OrdersForUserResponse.__slots__ == ("data",)
+    assert [f.name for f in dataclasses.fields(res)] == [
+        "page",
+        "page_size",
+        "total",
+        "total_pages",
+        "data",
+    ]
+    assert pickle.loads(pickle.dumps(res)) == res
+    assert res.to_camelcase_dict() == {
+        "page": 2,
+        "pageSize": 1,
+        "total": 3,
+        "totalPages": 3,
+        "data": [ORDER],
+    }
+
+
+def test_nested_dataclasses_are_encoded_to_camelcase():
+    order = _signed_order()
+
+    encoded = CreateMultipleOrdersInput(
+        symbol="MATIC-USDC", orders=[order]
+    ).to_camelcase_dict()
+
+    assert encoded == {
+        "symbol": "MATIC-USDC",
+        "orders": [
+            {
+                "order": {
+                    "price": "0.865",
+                    "size": "40",
+                    "symbol": "MATIC-USDC",
+                    "side": "buy",
+                    "clientOrderId": "c1",
+                },
+                "signature": "0xabc",
+                "message": {
+                    "domainSeparator": {},
+                    "messageTypes": {},
+                    "messageData": order.message.message_data,
+                },
+            }
+        ],
+    }
+    assert encoded["orders"][0]["message"]["messageData"] is order.message.message_data